@@ -0,0 +1,59 @@
+"""Measures the cold start import time of the application modules with python -X importtime
+
+Run from the repository root: python -m benchmarks.bench_import_time [--runs N] [--max-ms MS]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Generator only path first, the GUI imports the evaluator as well
+MODULES = ('src.password_generator', 'src.password_evaluator', 'src.password_generator_gui')
+# Heavy dependencies which must not be loaded before they are used
+LAZY_MODULES = ('zxcvbn', 'requests')
+
+
+def import_time(module: str) -> tuple:
+    """Imports the module in a fresh interpreter
+
+    Args:
+        module (str): module to import
+
+    Returns:
+        tuple: cumulative import time in milliseconds, lazy modules loaded by the import
+    """
+    check = f'import sys, {module}; print(",".join(name for name in {LAZY_MODULES!r} if name in sys.modules))'
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', check], capture_output=True, text=True, check=True)
+    # Lines are 'import time: self [us] | cumulative | imported package', the module itself is the last one
+    cumulative = 0
+    for line in process.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    return cumulative / 1000, process.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per module')
+    parser.add_argument('--max-ms', type=float, default=None, help='fail if the generator only path is slower')
+    arguments = parser.parse_args()
+
+    results = {}
+    for module in MODULES:
+        try:
+            runs = [import_time(module) for _ in range(arguments.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f'{module:<30} cannot be imported: {e.stderr.strip().splitlines()[-1]}')
+            continue
+        results[module] = statistics.median(milliseconds for milliseconds, _ in runs)
+        loaded = runs[0][1]
+        print(f'{module:<30} {results[module]:>8.1f} ms' + (f'  loads {loaded}' if loaded else ''))
+
+    generator_only = results.get(MODULES[0])
+    if arguments.max_ms is not None and generator_only is not None and generator_only > arguments.max_ms:
+        sys.exit(f'{MODULES[0]} import takes {generator_only:.1f} ms, budget is {arguments.max_ms} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Compares the single pass ScoringEngine with the four separate scans of the internal evaluation before it
+
+The separate scans are a frozen copy of the original PasswordEvaluator.evaluate_* methods, later changes of
+PasswordEvaluator (e.g. SequenceAnalyzer) do not move the baseline. The original sequence detector knows only
+code point runs, so the compared engine ignores keyboard rows, the default engine is timed as well
+
+Run from the repository root: python -m benchmarks.bench_scoring_engine
+"""
+import random
+import string
+import timeit
+from src.config import Config
+from src.scoring_engine import ScoringEngine
+from src.sequence_analyzer import SequenceAnalyzer
+
+PASSWORDS = 20000
+REPEAT = 5
+
+
+def _evaluate_length(password_length: int) -> int:
+    rating = Config.PASSWORD_LENGTH_RATING
+    if password_length >= rating['strong']:
+        return 4
+    elif password_length >= rating['moderate']:
+        return 3
+    elif password_length > rating['weak']:
+        return 2
+    else:
+        return 1
+
+
+def _evaluate_repetition(password: str) -> int:
+    length = len(password)
+    characters = {}
+    for char in password:
+        if char not in characters:
+            characters[char] = 1
+        else:
+            characters[char] += 1
+    max_repetitions = max(characters.values())
+    if max_repetitions >= length / 1.3:
+        return 1
+    if max_repetitions >= length / 1.6:
+        return 2
+    if max_repetitions >= length / 2:
+        return 3
+    else:
+        return 4
+
+
+def _evaluate_variety(password: str) -> int:
+    contains_lower = False
+    contains_upper = False
+    contains_digit = False
+    contains_special = False
+    for char in password:
+        if char in string.ascii_lowercase:
+            contains_lower = 1
+        elif char in string.ascii_uppercase:
+            contains_upper = 1
+        elif char in string.digits:
+            contains_digit = 1
+        elif char in string.punctuation:
+            contains_special = 1
+    return contains_lower + contains_upper + contains_digit + contains_special
+
+
+def _evaluate_sequence(password: str) -> int:
+    pwd_length = len(password)
+    sequences = 0
+    longest_sequence = 0
+    # Forward and reversed password, for descending sequences
+    for iteration in range(2):
+        previous_character = ''
+        sequence = ''
+        if iteration == 1:
+            password = password[::-1]
+        index = 2
+        for char in password:
+            if not previous_character:
+                previous_character = char
+                continue
+            if ord(char) - 1 == ord(previous_character):
+                if not sequence:
+                    sequence = previous_character
+                sequence += char
+                previous_character = char
+                if len(sequence) == Config.SEQUENCE_LENGTH:
+                    sequences += 1
+                if index == len(password):
+                    if len(sequence) > longest_sequence:
+                        longest_sequence = len(sequence)
+                index += 1
+            else:
+                previous_character = char
+                if len(sequence) > longest_sequence:
+                    longest_sequence = len(sequence)
+                sequence = ''
+                index += 1
+    if longest_sequence == pwd_length:
+        return 1
+    elif longest_sequence >= pwd_length / 2:
+        return 2
+    elif longest_sequence > pwd_length / 3:
+        return 3
+    else:
+        return 4
+
+
+def separate_scans(password: str) -> int:
+    """Internal evaluation computed by the four original evaluate_* scans, as it was done before ScoringEngine
+    """
+    weighted_sum = _evaluate_length(len(password)) * 6 + _evaluate_repetition(password) + _evaluate_variety(password) * 2 + _evaluate_sequence(password)
+    return ScoringEngine.total_score(weighted_sum)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    charset = string.ascii_letters + string.digits + string.punctuation
+    engine = ScoringEngine()
+    # Same criteria as the original scans
+    code_point_engine = ScoringEngine()
+    code_point_engine.sequence_analyzer = SequenceAnalyzer(steps=(1,), keyboard_rows=())
+    for length in (8, 16, 50):
+        passwords = [''.join(rng.choice(charset) for _ in range(length)) for _ in range(PASSWORDS)]
+        # Both ways must give the same scores
+        assert [separate_scans(password) for password in passwords] == [code_point_engine.score(password) for password in passwords]
+        separate = min(timeit.repeat(lambda: [separate_scans(password) for password in passwords], number=1, repeat=REPEAT))
+        fused = min(timeit.repeat(lambda: [code_point_engine.score(password) for password in passwords], number=1, repeat=REPEAT))
+        default = min(timeit.repeat(lambda: [engine.score(password) for password in passwords], number=1, repeat=REPEAT))
+        print(f'length {length:>2}: separate scans {PASSWORDS / separate:>9.0f}/s, single pass {PASSWORDS / fused:>9.0f}/s, speedup {separate / fused:.2f}x, '
+              f'with keyboard rows {PASSWORDS / default:>9.0f}/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""Benchmark suite of the generator, evaluator, breach check and file I/O
+
+Run from the repository root:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.2
+
+Results are stored as JSON, with a baseline the run fails if any case got slower than the tolerance allows
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import string
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.breach_cache import BreachRangeCache
+from src.dictionary_automaton import native_dictionary_available
+from src.file_handler import FileHandler
+from src.password_evaluator import PasswordEvaluator
+from src.password_generator import PasswordGenerator
+from src.random_source import SeededRandomSource
+
+LENGTHS = (4, 8, 16, 32, 50)
+# Every combination of digits, upper, lower and special characters with at least one type
+CHAR_TYPES = [flags for flags in itertools.product((False, True), repeat=4) if any(flags)]
+SAMPLE_PASSWORDS = 200
+
+
+def measure(function, number: int, repeat: int) -> dict:
+    """Times the function, the best of the repeats is used as it is the least disturbed by other processes
+
+    Args:
+        function (callable): benchmarked function without arguments
+        number (int): calls per repeat
+        repeat (int): number of repeats
+
+    Returns:
+        dict: seconds per call and calls per second
+    """
+    best = min(timeit.repeat(function, number=number, repeat=repeat)) / number
+    return {'seconds': best, 'ops_per_second': 1 / best if best else float('inf')}
+
+
+class Results(dict):
+    """Results by case, cases not matching the filter are skipped before they are timed
+    """
+    def __init__(self, case_filter: str = '') -> None:
+        """Initializes empty Results
+
+        Args:
+            case_filter (str, optional): text every run case contains, empty runs all cases. Defaults to ''.
+        """
+        super().__init__()
+        self.case_filter = case_filter
+
+    def selected(self, *cases: str) -> bool:
+        """Checks if any of the cases runs, e.g. before an expensive setup
+
+        Returns:
+            bool: True if any case contains the filter
+        """
+        return any(self.case_filter in case for case in cases)
+
+    def measure(self, case: str, function, number: int, repeat: int) -> None:
+        """Times the case by measure if it is selected
+
+        Args:
+            case (str): name of the case
+            function (callable): benchmarked function without arguments
+            number (int): calls per repeat
+            repeat (int): number of repeats
+        """
+        if self.selected(case):
+            self[case] = measure(function, number, repeat)
+
+
+def start_breach_api() -> ThreadingHTTPServer:
+    """Starts a local stand-in for the Have I been pwned? range API, every range contains 800 hashes like the real one
+
+    Returns:
+        ThreadingHTTPServer: running server, its url attribute is the range API url
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            prefix = self.path.rsplit('/', 1)[-1]
+            rng = random.Random(prefix)
+            body = '\r\n'.join(f'{rng.getrandbits(140):035X}:{rng.randint(1, 1000)}' for _ in range(800)).encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.url = f'http://127.0.0.1:{server.server_port}/range/'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_generator(results: Results, number: int, repeat: int) -> None:
+    generator = PasswordGenerator()
+    for length, (digits, upper, lower, special) in itertools.product(LENGTHS, CHAR_TYPES):
+        name = 'd' * digits + 'u' * upper + 'l' * lower + 's' * special
+        results.measure(f'generate_password[length={length},types={name}]', lambda: generator.generate_password(length, digits, upper, lower, special), number, repeat)
+    for length in LENGTHS:
+        results.measure(f'generate_batch[length={length},n=1000]', lambda: generator.generate_batch(1000, length, True, True, True, True), max(1, number // 100), repeat)
+    seeded_generator = PasswordGenerator(SeededRandomSource(0))
+    results.measure('generate_batch[length=16,n=1000,seeded]', lambda: seeded_generator.generate_batch(1000, 16, True, True, True, True), max(1, number // 100), repeat)
+
+
+def bench_evaluator(results: Results, passwords: list, number: int, repeat: int) -> None:
+    evaluator = PasswordEvaluator()
+    calls = max(1, number // len(passwords))
+    results.measure('evaluate_length', lambda: [evaluator.evaluate_length(len(password)) for password in passwords], calls, repeat)
+    results.measure('evaluate_repetition', lambda: [evaluator.evaluate_repetition(password) for password in passwords], calls, repeat)
+    results.measure('evaluate_variety', lambda: [evaluator.evaluate_variety(password) for password in passwords], calls, repeat)
+    results.measure('evaluate_sequence', lambda: [evaluator.evaluate_sequence(password) for password in passwords], calls, repeat)
+    results.measure('internal_password_evaluation', lambda: [evaluator.internal_password_evaluation(password, verbose=False) for password in passwords], calls, repeat)
+    results.measure('internal_password_evaluation_batch', lambda: evaluator.internal_password_evaluation_batch(passwords), calls, repeat)
+    # Per password loop of the batch path, the baseline of score_many
+    results.measure('scoring_engine_score_loop', lambda: [evaluator.scoring_engine.score(password) for password in passwords], calls, repeat)
+    if native_dictionary_available():
+        results.measure('native_password_evaluation', lambda: [evaluator.native_password_evaluation(password) for password in passwords], 1, repeat)
+    elif results.selected('native_password_evaluation'):
+        print('native_password_evaluation skipped, no dictionaries are configured', file=sys.stderr)
+    if not results.selected('external_password_evaluation'):
+        return
+    try:
+        evaluator.external_password_evaluation(passwords[0])
+    except ImportError:
+        print('external_password_evaluation skipped, zxcvbn is not installed', file=sys.stderr)
+        return
+    # Without the cache every call runs zxcvbn
+    evaluator.external_cache.max_size = 0
+    results.measure('external_password_evaluation', lambda: [evaluator.external_password_evaluation(password) for password in passwords], 1, repeat)
+
+
+def bench_breach(results: Results, passwords: list, repeat: int) -> None:
+    if not results.selected('is_breached[uncached]', 'is_breached_many[uncached]', 'is_breached[cached]'):
+        return
+    server = start_breach_api()
+    try:
+        evaluator = PasswordEvaluator(breach_cache=BreachRangeCache(memory_size=0))
+        evaluator.PASSWORD_BREACH_CHECK_API = server.url
+        try:
+            evaluator.is_breached(passwords[0])
+        except ImportError:
+            print('is_breached skipped, requests is not installed', file=sys.stderr)
+            return
+        # Cache holds nothing, every check is a round trip to the stub server
+        results.measure('is_breached[uncached]', lambda: [evaluator.is_breached(password) for password in passwords[:50]], 1, repeat)
+        results.measure('is_breached_many[uncached]', lambda: evaluator.is_breached_many(passwords[:50]), 1, repeat)
+        if not results.selected('is_breached[cached]'):
+            return
+        evaluator.breach_cache = BreachRangeCache()
+        evaluator.is_breached_many(passwords)
+        results.measure('is_breached[cached]', lambda: [evaluator.is_breached(password) for password in passwords], 1, repeat)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_file_handler(results: Results, passwords: list, repeat: int) -> None:
+    file_handler = FileHandler()
+    bulk = passwords * 500
+    with tempfile.TemporaryDirectory() as directory:
+        counter = itertools.count()
+        results.measure('save_to_file[2000 passwords]', lambda: [file_handler.save_to_file(f'{directory}/single{next(counter)}.txt', password) for password in passwords * 10], 1, repeat)
+        results.measure(f'save_passwords[{len(bulk)} passwords]', lambda: file_handler.save_passwords(f'{directory}/bulk{next(counter)}.txt', bulk), 1, repeat)
+        if not results.selected(f'read_chunks[{len(bulk)} passwords]'):
+            return
+        file_handler.save_passwords(f'{directory}/read.txt', bulk)
+        results.measure(f'read_chunks[{len(bulk)} passwords]', lambda: sum(len(lines) for lines, _ in file_handler.read_chunks(f'{directory}/read.txt')), 1, repeat)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Finds cases slower than the baseline by more than the tolerance
+
+    Args:
+        results (dict): current results
+        baseline (dict): baseline results
+        tolerance (float): allowed slowdown, 0.2 means 20 %
+
+    Returns:
+        list: (case, baseline seconds, current seconds) of every regression
+    """
+    regressions = []
+    for case, result in results.items():
+        if case in baseline and result['seconds'] > baseline[case]['seconds'] * (1 + tolerance):
+            regressions.append((case, baseline[case]['seconds'], result['seconds']))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='write the results into this JSON file')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown against the baseline (default: 0.2)')
+    parser.add_argument('--number', type=int, default=2000, help='calls per repeat of the fast cases (default: 2000)')
+    parser.add_argument('--repeat', type=int, default=3, help='repeats of every case (default: 3)')
+    parser.add_argument('--filter', default='', help='run only cases containing this text')
+    arguments = parser.parse_args()
+
+    # Fixed seed, so every run evaluates the same passwords
+    rng = random.Random(0)
+    charset = string.ascii_letters + string.digits + string.punctuation
+    passwords = [''.join(rng.choice(charset) for _ in range(rng.randint(4, 50))) for _ in range(SAMPLE_PASSWORDS)]
+
+    results = Results(arguments.filter)
+    bench_generator(results, arguments.number, arguments.repeat)
+    bench_evaluator(results, passwords, arguments.number, arguments.repeat)
+    bench_breach(results, passwords, arguments.repeat)
+    bench_file_handler(results, passwords, arguments.repeat)
+
+    for case, result in results.items():
+        print(f'{case:<55} {result["seconds"] * 1e6:>14.1f} us {result["ops_per_second"]:>14.1f}/s')
+
+    if arguments.output:
+        report = {
+            'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results,
+        }
+        with open(arguments.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, arguments.tolerance)
+        for case, before, after in regressions:
+            print(f'REGRESSION {case}: {before * 1e6:.1f} us -> {after * 1e6:.1f} us', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
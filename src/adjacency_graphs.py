@@ -0,0 +1,112 @@
+"""Keyboard adjacency graphs of the native evaluation, built from the layouts like the zxcvbn graphs
+
+Every key maps to its neighbours in a fixed direction order, None where there is no key.
+Neighbours are strings of the unshifted and shifted character, e.g. 'wW'
+"""
+QWERTY = r'''
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+'''
+
+DVORAK = r'''
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) [{ ]}
+    '" ,< .> pP yY fF gG cC rR lL /? =+ \|
+     aA oO eE uU iI dD hH tT nN sS -_
+      ;: qQ jJ kK xX bB mM wW vV zZ
+'''
+
+KEYPAD = r'''
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+'''
+
+MAC_KEYPAD = r'''
+  = / *
+7 8 9 -
+4 5 6 +
+1 2 3
+  0 .
+'''
+
+
+def slanted_adjacent_coordinates(x: int, y: int) -> list:
+    """Neighbours on a keyboard where every row is shifted half a key to the right
+
+    Args:
+        x (int): column
+        y (int): row
+
+    Returns:
+        list: (x, y) of the six neighbours
+    """
+    return [(x - 1, y), (x, y - 1), (x + 1, y - 1), (x + 1, y), (x, y + 1), (x - 1, y + 1)]
+
+
+def aligned_adjacent_coordinates(x: int, y: int) -> list:
+    """Neighbours on a keypad where the rows are aligned
+
+    Args:
+        x (int): column
+        y (int): row
+
+    Returns:
+        list: (x, y) of the eight neighbours
+    """
+    return [(x - 1, y), (x - 1, y - 1), (x, y - 1), (x + 1, y - 1), (x + 1, y), (x + 1, y + 1), (x, y + 1), (x - 1, y + 1)]
+
+
+def build_graph(layout: str, slanted: bool) -> dict:
+    """Builds the adjacency graph of the layout
+
+    Args:
+        layout (str): keys separated by spaces, one row per line
+        slanted (bool): True for keyboards, False for keypads
+
+    Returns:
+        dict: neighbours of every character
+    """
+    positions = {}
+    tokens = layout.split()
+    x_unit = len(tokens[0]) + 1
+    adjacent_coordinates = slanted_adjacent_coordinates if slanted else aligned_adjacent_coordinates
+    for y, line in enumerate(layout.split('\n')):
+        # Every row of a keyboard starts half a key more to the right
+        slant = y - 1 if slanted else 0
+        for token in line.split():
+            x = (line.index(token) - slant) // x_unit
+            positions[(x, y)] = token
+
+    graph = {}
+    for (x, y), token in positions.items():
+        for char in token:
+            graph[char] = [positions.get(coordinates) for coordinates in adjacent_coordinates(x, y)]
+    return graph
+
+
+def average_degree(graph: dict) -> float:
+    """Average number of neighbours of a key
+
+    Args:
+        graph (dict): adjacency graph
+
+    Returns:
+        float: average degree
+    """
+    return sum(len([neighbour for neighbour in neighbours if neighbour]) for neighbours in graph.values()) / len(graph)
+
+
+ADJACENCY_GRAPHS = {
+    'qwerty': build_graph(QWERTY, True),
+    'dvorak': build_graph(DVORAK, True),
+    'keypad': build_graph(KEYPAD, False),
+    'mac_keypad': build_graph(MAC_KEYPAD, False),
+}
+KEYBOARD_STARTING_POSITIONS = len(ADJACENCY_GRAPHS['qwerty'])
+KEYBOARD_AVERAGE_DEGREE = average_degree(ADJACENCY_GRAPHS['qwerty'])
+KEYPAD_STARTING_POSITIONS = len(ADJACENCY_GRAPHS['keypad'])
+KEYPAD_AVERAGE_DEGREE = average_degree(ADJACENCY_GRAPHS['keypad'])
@@ -0,0 +1,290 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Iterator, TextIO
+from src.config import Config
+from src.dictionary_automaton import require_native_dictionary
+from src.file_handler import FileHandler
+from src.metrics import metrics
+from src.parallel_engine import ParallelEngine
+from src.password_evaluator import PasswordEvaluator
+
+logger = logging.getLogger(__name__)
+
+_BREACHED_LITERALS = {None: 'null', True: 'true', False: 'false'}
+
+
+class AuditSummary():
+    """Aggregate histograms of an audit: score distribution, length distribution and breach rate
+    """
+    def __init__(self) -> None:
+        """Initializes an empty AuditSummary
+        """
+        self.passwords = 0
+        self.empty_lines = 0
+        self.scores = {}
+        self.lengths = {}
+        self.breached = 0
+        self.breach_checked = 0
+
+    @property
+    def breach_rate(self) -> float:
+        """Share of the checked passwords which are breached, None if nothing was checked
+        """
+        return self.breached / self.breach_checked if self.breach_checked else None
+
+    def add(self, length: int, score: int = None, breached: bool = None) -> None:
+        """Counts one audited password
+
+        Args:
+            length (int): password length
+            score (int, optional): evaluation score, None if not evaluated. Defaults to None.
+            breached (bool, optional): breach check result, None if not checked. Defaults to None.
+        """
+        self.passwords += 1
+        self.lengths[length] = self.lengths.get(length, 0) + 1
+        if score is not None:
+            self.scores[score] = self.scores.get(score, 0) + 1
+        if breached is not None:
+            self.breach_checked += 1
+            self.breached += breached
+
+    def to_dict(self) -> dict:
+        """Converts the summary into a JSON serializable dict, histograms are sorted by their keys
+
+        Returns:
+            dict: summary
+        """
+        return {
+            'passwords': self.passwords,
+            'empty_lines': self.empty_lines,
+            'scores': {str(score): self.scores[score] for score in sorted(self.scores)},
+            'lengths': {str(length): self.lengths[length] for length in sorted(self.lengths)},
+            'breached': self.breached,
+            'breach_checked': self.breach_checked,
+            'breach_rate': self.breach_rate,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AuditSummary':
+        """Restores a summary converted by to_dict
+
+        Args:
+            data (dict): summary
+
+        Returns:
+            AuditSummary: restored summary
+        """
+        summary = cls()
+        summary.passwords = data['passwords']
+        summary.empty_lines = data['empty_lines']
+        summary.scores = {int(score): count for score, count in data['scores'].items()}
+        summary.lengths = {int(length): count for length, count in data['lengths'].items()}
+        summary.breached = data['breached']
+        summary.breach_checked = data['breach_checked']
+        return summary
+
+
+class PasswordAuditor():
+    """Evaluates and breach checks every password of a file, streaming it chunk by chunk
+
+    The report has one JSON line per password with its line number, length, score and breach state,
+    the passwords themselves are not repeated. Progress is checkpointed into a JSON file replaced
+    atomically, an interrupted audit continues from the last checkpoint
+    """
+    EVALUATION_METHODS = ParallelEngine.EVALUATION_METHODS
+
+    def __init__(self, evaluation: str = 'internal', check_breach: bool = False, workers: int = 1, chunk_size: int = None, evaluator: PasswordEvaluator = None) -> None:
+        """Initializes PasswordAuditor
+
+        Args:
+            evaluation (str, optional): 'internal', 'external' or 'native' evaluation method, None to skip the evaluation. Defaults to 'internal'.
+            check_breach (bool, optional): If passwords are checked against Have I been pwned (or the configured offline index). Defaults to False.
+            workers (int, optional): worker processes of the evaluation, 1 evaluates in this process, 0 uses all cores. Defaults to 1.
+            chunk_size (int, optional): passwords read and evaluated at once. Defaults to Config.AUDIT_CHUNK_SIZE.
+            evaluator (PasswordEvaluator, optional): evaluator of this process, used for breach checks. Defaults to a new PasswordEvaluator.
+
+        Raises:
+            ValueError: if the evaluation method is unknown, native without dictionaries or nothing is to be audited
+        """
+        if evaluation is not None and evaluation not in self.EVALUATION_METHODS:
+            raise ValueError(f'Unknown evaluation method {evaluation}')
+        if evaluation == 'native':
+            require_native_dictionary()
+        if evaluation is None and not check_breach:
+            raise ValueError('Nothing to audit, choose an evaluation method or the breach check')
+        self.evaluation = evaluation
+        self.check_breach = check_breach
+        self.workers = workers
+        self.chunk_size = chunk_size or Config.AUDIT_CHUNK_SIZE
+        self.evaluator = evaluator or PasswordEvaluator()
+        self.file_handler = FileHandler()
+
+    def audit(self, file_path: str, report_path: str, checkpoint_path: str = None) -> AuditSummary:
+        """Audits the password file, continuing from the checkpoint if it exists
+
+        Args:
+            file_path (str): file with one password per line, as written by save_to_file
+            report_path (str): JSON lines report, overwritten by a new audit
+            checkpoint_path (str, optional): JSON checkpoint of the progress, None disables resuming. Defaults to None.
+
+        Raises:
+            ValueError: if the checkpoint belongs to another audit or the file changed
+            IOERROR: If reading or writing produces error
+
+        Returns:
+            AuditSummary: histograms of the whole file
+        """
+        checkpoint = self.load_checkpoint(checkpoint_path, file_path) if checkpoint_path else None
+        if checkpoint:
+            summary = AuditSummary.from_dict(checkpoint['summary'])
+            offset, line = checkpoint['offset'], checkpoint['line']
+            logger.info('Resuming the audit of %s at line %s', file_path, line)
+        else:
+            summary = AuditSummary()
+            offset, line = 0, 1
+
+        try:
+            report = open(report_path, 'r+' if checkpoint else 'w', encoding='utf-8', buffering=Config.FILE_BUFFER_SIZE)
+        except IOError as e:
+            raise IOError(f"Error saving file: {str(e)}")
+        with report:
+            if checkpoint:
+                # Lines written after the checkpoint are written again
+                report.truncate(checkpoint['report_size'])
+                report.seek(checkpoint['report_size'])
+            last_checkpoint = time.monotonic()
+            for lines, offset, results in self._audit_chunks(file_path, offset):
+                records = []
+                for text, result in zip(lines, results):
+                    if not text:
+                        summary.empty_lines += 1
+                    else:
+                        score, breached = result
+                        summary.add(len(text), score, breached)
+                        score_literal = 'null' if score is None else score
+                        # Same output as json.dumps of the record, which is several times slower for these flat values
+                        records.append(f'{{"line": {line}, "length": {len(text)}, "score": {score_literal}, "breached": {_BREACHED_LITERALS[breached]}}}')
+                    line += 1
+                if records:
+                    report.write('\n'.join(records) + '\n')
+                metrics.increment('passwords_audited', len(records))
+                if checkpoint_path and time.monotonic() - last_checkpoint >= Config.AUDIT_CHECKPOINT_INTERVAL:
+                    self.save_checkpoint(checkpoint_path, file_path, report, offset, line, summary)
+                    last_checkpoint = time.monotonic()
+            if checkpoint_path:
+                self.save_checkpoint(checkpoint_path, file_path, report, offset, line, summary)
+        return summary
+
+    def _audit_chunks(self, file_path: str, offset: int) -> Iterator[tuple]:
+        """Reads, evaluates and breach checks the file chunk by chunk
+
+        Args:
+            file_path (str): file with one password per line
+            offset (int): byte offset to start reading at
+
+        Yields:
+            tuple: lines of the chunk, byte offset after the chunk and (score, breached) of every line, None for empty lines
+        """
+        chunks = self.file_handler.read_chunks(file_path, self.chunk_size, offset)
+        if self.evaluation and self.workers != 1:
+            # Only the passwords go to the workers, the lines and offsets of the chunks in flight wait here
+            in_flight = deque()
+
+            def passwords() -> Iterator[list]:
+                for lines, end in chunks:
+                    in_flight.append((lines, end))
+                    yield [line for line in lines if line]
+
+            scored = ParallelEngine(workers=self.workers or None, chunk_size=self.chunk_size).evaluate_chunks(passwords(), self.evaluation)
+            # Results arrive in submission order
+            scored_chunks = (in_flight.popleft() + ([score for _, score in results],) for results in scored)
+        else:
+            scored_chunks = ((lines, end, self._score([line for line in lines if line])) for lines, end in chunks)
+
+        for lines, end, scores in scored_chunks:
+            passwords = [line for line in lines if line]
+            if self.check_breach and passwords:
+                breached = self.evaluator.is_breached_many(passwords)
+            else:
+                breached = [None] * len(passwords)
+            results = iter(zip(scores, breached))
+            yield lines, end, [next(results) if line else None for line in lines]
+
+    def _score(self, passwords: list) -> list:
+        """Scores the passwords in this process
+
+        Args:
+            passwords (list): non empty passwords
+
+        Returns:
+            list: scores, None when no evaluation is done
+        """
+        if self.evaluation == 'internal':
+            return list(self.evaluator.internal_password_evaluation_batch(passwords))
+        if self.evaluation == 'external':
+            return [int(self.evaluator.external_password_evaluation(password)) for password in passwords]
+        if self.evaluation == 'native':
+            return [self.evaluator.native_password_evaluation(password) for password in passwords]
+        return [None] * len(passwords)
+
+    def load_checkpoint(self, checkpoint_path: str, file_path: str) -> dict:
+        """Loads the checkpoint of an interrupted audit
+
+        Args:
+            checkpoint_path (str): JSON checkpoint
+            file_path (str): audited file
+
+        Raises:
+            ValueError: if the checkpoint belongs to another audit or the file changed since it was checkpointed
+
+        Returns:
+            dict: checkpoint, None if there is none yet
+        """
+        try:
+            with open(checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        if (checkpoint['file'], checkpoint['evaluation'], checkpoint['check_breach']) != (os.path.abspath(file_path), self.evaluation, self.check_breach):
+            raise ValueError(f'Checkpoint {checkpoint_path} belongs to another audit')
+        # Any rewrite changes the size or the modification time, resuming would continue mid-line or at wrong line numbers
+        stat = os.stat(file_path)
+        if (stat.st_size, stat.st_mtime_ns) != (checkpoint['file_size'], checkpoint['file_mtime_ns']):
+            raise ValueError(f'{file_path} changed since it was checkpointed')
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint_path: str, file_path: str, report: TextIO, offset: int, line: int, summary: AuditSummary) -> None:
+        """Flushes the report and replaces the checkpoint atomically, so an interruption leaves either the old or the new one
+
+        Args:
+            checkpoint_path (str): JSON checkpoint
+            file_path (str): audited file
+            report (TextIO): opened report
+            offset (int): byte offset of the next line to be audited
+            line (int): number of the next line
+            summary (AuditSummary): histograms up to the offset
+        """
+        report.flush()
+        os.fsync(report.fileno())
+        stat = os.stat(file_path)
+        checkpoint = {
+            'file': os.path.abspath(file_path),
+            'file_size': stat.st_size,
+            'file_mtime_ns': stat.st_mtime_ns,
+            'evaluation': self.evaluation,
+            'check_breach': self.check_breach,
+            'offset': offset,
+            'line': line,
+            'report_size': report.tell(),
+            'summary': summary.to_dict(),
+        }
+        temporary_path = checkpoint_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, checkpoint_path)
+
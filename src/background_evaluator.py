@@ -0,0 +1,140 @@
+import logging
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Outcome of one evaluation request, connection_error is True if the breach check could not be done,
+# error is the message of any other failure of the evaluation
+EvaluationResult = namedtuple('EvaluationResult', ['request_id', 'password', 'breached', 'score', 'connection_error', 'error'], defaults=[None])
+
+
+class BackgroundEvaluator():
+    """Runs password evaluations and breach checks on worker threads, so the GUI event loop never blocks
+
+    Only the result of the latest request is delivered, older requests are cancelled or their results dropped
+    """
+    def __init__(self, password_evaluator, workers: int = None) -> None:
+        """Initializes BackgroundEvaluator
+
+        Args:
+            password_evaluator (PasswordEvaluator): evaluator used by the worker threads
+            workers (int, optional): worker threads. Defaults to Config.BACKGROUND_EVALUATION_WORKERS.
+        """
+        self.password_evaluator = password_evaluator
+        self._executor = ThreadPoolExecutor(max_workers=workers or Config.BACKGROUND_EVALUATION_WORKERS, thread_name_prefix='evaluation')
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._latest_request = 0
+        self._latest_future = None
+
+    def submit(self, password: str, method: str = 'internal', check_breached: bool = False) -> int:
+        """Requests an evaluation, replacing any older request
+
+        Args:
+            password (str): password to be evaluated
+            method (str, optional): 'internal', 'external' or 'native' evaluation. Defaults to 'internal'.
+            check_breached (bool, optional): if the breach check runs first. Defaults to False.
+
+        Returns:
+            int: id of the request
+        """
+        with self._lock:
+            self._latest_request += 1
+            request_id = self._latest_request
+            # Older request which did not start yet is not needed anymore
+            if self._latest_future is not None:
+                self._latest_future.cancel()
+            self._latest_future = self._executor.submit(self._evaluate, request_id, password, method, check_breached)
+        return request_id
+
+    def cancel(self) -> None:
+        """Cancels the latest request, a running evaluation finishes but its result is dropped
+        """
+        with self._lock:
+            self._latest_request += 1
+            if self._latest_future is not None:
+                self._latest_future.cancel()
+                self._latest_future = None
+
+    def completed(self) -> list:
+        """Collects finished results, to be called from the GUI thread
+
+        Returns:
+            list: EvaluationResult of the latest request, empty if it is not finished yet
+        """
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_stale(result.request_id):
+                results.append(result)
+        return results
+
+    def is_stale(self, request_id: int) -> bool:
+        """Checks if a newer request was submitted
+
+        Args:
+            request_id (int): id of the request
+
+        Returns:
+            bool: True if the request was replaced
+        """
+        return request_id != self._latest_request
+
+    def shutdown(self) -> None:
+        """Cancels waiting requests and stops the worker threads
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evaluate(self, request_id: int, password: str, method: str, check_breached: bool) -> None:
+        """Evaluates the password on a worker thread, same steps as the GUI did synchronously
+
+        Args:
+            request_id (int): id of the request
+            password (str): password to be evaluated
+            method (str): 'internal', 'external' or 'native' evaluation
+            check_breached (bool): if the breach check runs first
+        """
+        # Skip the work if the request was replaced while waiting for a worker
+        if self.is_stale(request_id):
+            return
+        # Nobody reads the future, every failure is delivered as a result instead of being lost with it
+        try:
+            self._results.put(self._run_evaluation(request_id, password, method, check_breached))
+        except Exception as e:
+            logger.exception('Evaluation of request %s failed', request_id)
+            self._results.put(EvaluationResult(request_id, password, None, None, False, str(e) or type(e).__name__))
+
+    def _run_evaluation(self, request_id: int, password: str, method: str, check_breached: bool) -> EvaluationResult:
+        """Runs the breach check and the evaluation of one request
+
+        Args:
+            request_id (int): id of the request
+            password (str): password to be evaluated
+            method (str): 'internal', 'external' or 'native' evaluation
+            check_breached (bool): if the breach check runs first
+
+        Returns:
+            EvaluationResult: outcome of the request
+        """
+        breached = None
+        if check_breached:
+            try:
+                breached = self.password_evaluator.is_breached(password)
+            except ConnectionError:
+                return EvaluationResult(request_id, password, None, None, True)
+            if breached or self.is_stale(request_id):
+                return EvaluationResult(request_id, password, breached, None, False)
+        if method == 'internal':
+            score = self.password_evaluator.internal_password_evaluation(password)
+        elif method == 'native':
+            score = self.password_evaluator.native_password_evaluation(password)
+        else:
+            score = self.password_evaluator.external_password_evaluation(password)
+        return EvaluationResult(request_id, password, breached, score, False)
@@ -0,0 +1,142 @@
+import hashlib
+import math
+import mmap
+import struct
+from src.breach_index import iter_dump_digests
+from src.config import Config
+
+
+class BloomFilter():
+    """Memory-mapped Bloom filter of breached SHA-1 hashes, a negative answer means the hash is surely not breached
+
+    SHA-1 digests are already uniformly distributed, so bit positions are taken from the digest by double hashing
+    """
+    MAGIC = b'PWDBLOM1'
+    # magic, number of bits, number of hash functions, number of inserted hashes
+    HEADER = struct.Struct('<8sQIQ')
+
+    def __init__(self, filter_path: str) -> None:
+        """Opens a filter built by BloomFilter.build
+
+        Args:
+            filter_path (str): path of the filter file
+
+        Raises:
+            ValueError: if the file is not a Bloom filter
+        """
+        self.filter_path = filter_path
+        with open(filter_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < self.HEADER.size:
+            self.close()
+            raise ValueError('Invalid Bloom filter file')
+        magic, self.bits, self.hash_count, self.count = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC or len(self._mmap) != self.HEADER.size + (self.bits + 7) // 8:
+            self.close()
+            raise ValueError('Invalid Bloom filter file')
+
+    def __enter__(self) -> 'BloomFilter':
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        self.close()
+
+    def __contains__(self, digest: bytes) -> bool:
+        """Probes the bits of the SHA-1 digest
+
+        Args:
+            digest (bytes): 20-byte SHA-1 digest
+
+        Returns:
+            bool: False if the hash is surely not in the filter, True if it may be
+        """
+        for position in self.bit_positions(digest, self.bits, self.hash_count):
+            if not self._mmap[self.HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def may_contain_password(self, password: str) -> bool:
+        """Checks the password hash against the filter
+
+        Args:
+            password (str): password to check
+
+        Returns:
+            bool: False if the password is surely not breached
+        """
+        return hashlib.sha1(password.encode('utf-8')).digest() in self
+
+    def close(self) -> None:
+        """Closes the memory map
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @staticmethod
+    def bit_positions(digest: bytes, bits: int, hash_count: int) -> list:
+        """Bit positions of the digest, computed by double hashing from two 64-bit parts of the digest
+
+        Args:
+            digest (bytes): 20-byte SHA-1 digest
+            bits (int): size of the filter in bits
+            hash_count (int): number of hash functions
+
+        Returns:
+            list: bit positions to set or probe
+        """
+        first = int.from_bytes(digest[0:8], 'little')
+        # Odd step never degenerates into probing a single position
+        step = int.from_bytes(digest[8:16], 'little') | 1
+        return [(first + i * step) % bits for i in range(hash_count)]
+
+    @staticmethod
+    def size_for(count: int, false_positive_rate: float) -> tuple:
+        """Optimal filter size for the number of hashes and false positive rate
+
+        Args:
+            count (int): number of hashes to insert
+            false_positive_rate (float): wanted false positive rate, between 0 and 1
+
+        Raises:
+            ValueError: if the false positive rate is out of range
+
+        Returns:
+            tuple: number of bits, number of hash functions
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError('False positive rate must be between 0 and 1')
+        bits = max(8, math.ceil(-max(count, 1) * math.log(false_positive_rate) / math.log(2) ** 2))
+        hash_count = max(1, round(bits / max(count, 1) * math.log(2)))
+        return bits, hash_count
+
+    @classmethod
+    def build(cls, dump_path: str, filter_path: str, false_positive_rate: float = None) -> int:
+        """Builds the filter from a downloaded pwned passwords SHA-1 dump
+
+        The dump is read twice, first to size the filter, then to set the bits directly in the memory-mapped file
+
+        Args:
+            dump_path (str): path of the text dump
+            filter_path (str): path of the filter file to create
+            false_positive_rate (float, optional): wanted false positive rate. Defaults to Config.BREACH_BLOOM_FILTER_FALSE_POSITIVE_RATE.
+
+        Raises:
+            ValueError: if the dump contains an invalid line or the false positive rate is out of range
+
+        Returns:
+            int: number of inserted hashes
+        """
+        false_positive_rate = false_positive_rate or Config.BREACH_BLOOM_FILTER_FALSE_POSITIVE_RATE
+        count = sum(1 for _ in iter_dump_digests(dump_path))
+        bits, hash_count = cls.size_for(count, false_positive_rate)
+
+        with open(filter_path, 'w+b') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, bits, hash_count, count))
+            f.truncate(cls.HEADER.size + (bits + 7) // 8)
+            with mmap.mmap(f.fileno(), 0) as filter_bits:
+                for digest in iter_dump_digests(dump_path):
+                    for position in cls.bit_positions(digest, bits, hash_count):
+                        filter_bits[cls.HEADER.size + (position >> 3)] |= 1 << (position & 7)
+                filter_bits.flush()
+        return count
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from src.config import Config
+
+# Parsed hash suffixes of one range with the ETag and time of the download
+CachedRange = namedtuple('CachedRange', ['suffixes', 'etag', 'fetched_at'])
+
+
+class BreachRangeCache():
+    """Caches downloaded breach API ranges by hash prefix, in a bounded LRU in memory and optionally in sqlite on disk
+    """
+    def __init__(self, path: str = None, ttl: float = None, memory_size: int = None) -> None:
+        """Initializes BreachRangeCache
+
+        Args:
+            path (str, optional): sqlite file for the persistent cache, memory only when None. Defaults to Config.BREACH_CACHE_PATH.
+            ttl (float, optional): seconds a range is fresh. Defaults to Config.BREACH_CACHE_TTL.
+            memory_size (int, optional): ranges kept in memory. Defaults to Config.BREACH_CACHE_MEMORY_SIZE.
+        """
+        self.path = path or Config.BREACH_CACHE_PATH
+        self.ttl = ttl if ttl is not None else Config.BREACH_CACHE_TTL
+        self.memory_size = memory_size if memory_size is not None else Config.BREACH_CACHE_MEMORY_SIZE
+        self._memory = OrderedDict()
+        # Ranges may be requested from several threads at once
+        self._lock = threading.Lock()
+        self._connection = None
+        if self.path:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS ranges (prefix TEXT PRIMARY KEY, etag TEXT, fetched_at REAL, suffixes BLOB)')
+            self._connection.commit()
+
+    def get(self, prefix: str) -> CachedRange:
+        """Returns a fresh cached range
+
+        Args:
+            prefix (str): 5 hex characters hash prefix
+
+        Returns:
+            CachedRange: cached range, None if missing or older than the TTL
+        """
+        cached = self.get_stale(prefix)
+        if cached is None or self.is_expired(cached):
+            return None
+        return cached
+
+    def get_stale(self, prefix: str) -> CachedRange:
+        """Returns a cached range even if it is expired, its ETag can still revalidate it
+
+        Args:
+            prefix (str): 5 hex characters hash prefix
+
+        Returns:
+            CachedRange: cached range, None if missing
+        """
+        with self._lock:
+            cached = self._memory.get(prefix)
+            if cached is not None:
+                self._memory.move_to_end(prefix)
+                return cached
+            if self._connection is None:
+                return None
+            row = self._connection.execute('SELECT etag, fetched_at, suffixes FROM ranges WHERE prefix = ?', (prefix,)).fetchone()
+            if row is None:
+                return None
+            etag, fetched_at, suffixes = row
+            cached = CachedRange(frozenset(zlib.decompress(suffixes).decode('ascii').split('\n')), etag, fetched_at)
+            self._remember(prefix, cached)
+            return cached
+
+    def put(self, prefix: str, suffixes: frozenset, etag: str = None) -> CachedRange:
+        """Stores a downloaded range
+
+        Args:
+            prefix (str): 5 hex characters hash prefix
+            suffixes (frozenset): upper case hash suffixes of the range
+            etag (str, optional): ETag header of the response. Defaults to None.
+
+        Returns:
+            CachedRange: stored range
+        """
+        cached = CachedRange(frozenset(suffixes), etag, time.time())
+        with self._lock:
+            self._remember(prefix, cached)
+            if self._connection is not None:
+                self._connection.execute('INSERT OR REPLACE INTO ranges VALUES (?, ?, ?, ?)', (prefix, etag, cached.fetched_at, zlib.compress('\n'.join(cached.suffixes).encode('ascii'))))
+                self._connection.commit()
+        return cached
+
+    def refresh(self, prefix: str, cached: CachedRange) -> CachedRange:
+        """Marks a revalidated range (304 Not Modified) as fresh again
+
+        Args:
+            prefix (str): 5 hex characters hash prefix
+            cached (CachedRange): the revalidated range
+
+        Returns:
+            CachedRange: the range with a new download time
+        """
+        cached = cached._replace(fetched_at=time.time())
+        with self._lock:
+            self._remember(prefix, cached)
+            if self._connection is not None:
+                self._connection.execute('UPDATE ranges SET fetched_at = ? WHERE prefix = ?', (cached.fetched_at, prefix))
+                self._connection.commit()
+        return cached
+
+    def is_expired(self, cached: CachedRange) -> bool:
+        """Checks the age of the range against the TTL
+
+        Args:
+            cached (CachedRange): cached range
+
+        Returns:
+            bool: True if the range must be revalidated
+        """
+        return time.time() - cached.fetched_at > self.ttl
+
+    def evict_expired(self) -> int:
+        """Removes expired ranges from memory and disk
+
+        Returns:
+            int: number of ranges removed from disk
+        """
+        oldest = time.time() - self.ttl
+        with self._lock:
+            for prefix in [prefix for prefix, cached in self._memory.items() if cached.fetched_at < oldest]:
+                del self._memory[prefix]
+            if self._connection is None:
+                return 0
+            removed = self._connection.execute('DELETE FROM ranges WHERE fetched_at < ?', (oldest,)).rowcount
+            self._connection.commit()
+            return removed
+
+    def close(self) -> None:
+        """Closes the sqlite connection
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, prefix: str, cached: CachedRange) -> None:
+        """Puts the range into the memory LRU, dropping the least recently used ranges
+
+        Args:
+            prefix (str): 5 hex characters hash prefix
+            cached (CachedRange): range to remember
+        """
+        self._memory[prefix] = cached
+        self._memory.move_to_end(prefix)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
@@ -0,0 +1,247 @@
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from itertools import islice
+from typing import Iterator
+from src.config import Config
+
+
+def iter_dump_digests(dump_path: str) -> Iterator[bytes]:
+    """Reads a pwned passwords SHA-1 dump with one 'HASH:COUNT' line per hash
+
+    Args:
+        dump_path (str): path of the text dump
+
+    Raises:
+        ValueError: if the dump contains an invalid line
+
+    Yields:
+        bytes: 20-byte SHA-1 digest of every line
+    """
+    with open(dump_path, 'r', encoding='ascii', buffering=Config.FILE_BUFFER_SIZE) as dump:
+        for line in dump:
+            hash = line.split(':', 1)[0].strip()
+            if not hash:
+                continue
+            try:
+                digest = bytes.fromhex(hash)
+            except ValueError:
+                digest = b''
+            if len(digest) != BreachIndex.RECORD_SIZE:
+                raise ValueError(f'Invalid line in breach dump: {line.strip()}')
+            yield digest
+
+
+class BreachIndex():
+    """Offline breach lookup in a sorted, memory-mapped file of binary SHA-1 hashes
+
+    File layout: header, offset table with the first record of every hash prefix bucket, sorted 20-byte records
+    """
+    MAGIC = b'PWDBRIX1'
+    # magic, prefix bits, record count
+    HEADER = struct.Struct('<8sIQ')
+    RECORD_SIZE = 20
+
+    def __init__(self, index_path: str) -> None:
+        """Opens an index built by BreachIndex.build
+
+        Args:
+            index_path (str): path of the index file
+
+        Raises:
+            ValueError: if the file is not a breach index
+        """
+        self.index_path = index_path
+        with open(index_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < self.HEADER.size:
+            self.close()
+            raise ValueError('Invalid breach index file')
+        magic, self.prefix_bits, self.count = self.HEADER.unpack_from(self._mmap, 0)
+        self._records_offset = self.HEADER.size + ((1 << self.prefix_bits) + 1) * 8
+        if magic != self.MAGIC or len(self._mmap) != self._records_offset + self.count * self.RECORD_SIZE:
+            self.close()
+            raise ValueError('Invalid breach index file')
+        # Offset table is read in place, it is not copied into memory
+        self._offsets = memoryview(self._mmap)[self.HEADER.size:self._records_offset].cast('Q')
+
+    def __enter__(self) -> 'BreachIndex':
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, digest: bytes) -> bool:
+        """Binary search for the SHA-1 digest inside its prefix bucket
+
+        Args:
+            digest (bytes): 20-byte SHA-1 digest
+
+        Returns:
+            bool: True if the hash is in the index
+        """
+        bucket = int.from_bytes(digest[:3], 'big') >> (24 - self.prefix_bits)
+        low = self._offsets[bucket]
+        high = self._offsets[bucket + 1]
+        while low < high:
+            middle = (low + high) // 2
+            position = self._records_offset + middle * self.RECORD_SIZE
+            record = self._mmap[position:position + self.RECORD_SIZE]
+            if record < digest:
+                low = middle + 1
+            elif record > digest:
+                high = middle
+            else:
+                return True
+        return False
+
+    def contains_password(self, password: str) -> bool:
+        """Checks if the password hash is in the index
+
+        Args:
+            password (str): password to check
+
+        Returns:
+            bool: True if the password is breached
+        """
+        return hashlib.sha1(password.encode('utf-8')).digest() in self
+
+    def close(self) -> None:
+        """Closes the memory map
+        """
+        if getattr(self, '_offsets', None) is not None:
+            self._offsets.release()
+            self._offsets = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @classmethod
+    def build(cls, dump_path: str, index_path: str, prefix_bits: int = None) -> int:
+        """Builds the index from a downloaded pwned passwords SHA-1 dump
+
+        The dump has one 'HASH:COUNT' line per hash, unsorted dumps are sorted by an external merge sort.
+        Every record of a sorted chunk is a separate bytes object, the peak is about 70 bytes per record of
+        Config.BREACH_INDEX_SORT_CHUNK (70 MB by default). Runs are merged at most Config.BREACH_INDEX_MERGE_FAN_IN
+        at once, each with a read buffer of Config.FILE_BUFFER_SIZE
+
+        Args:
+            dump_path (str): path of the text dump
+            index_path (str): path of the index file to create
+            prefix_bits (int, optional): bits of the hash used for the offset table buckets. Defaults to Config.BREACH_INDEX_PREFIX_BITS.
+
+        Raises:
+            ValueError: if the dump contains an invalid line or prefix bits are out of range
+
+        Returns:
+            int: number of unique hashes in the index
+        """
+        prefix_bits = prefix_bits if prefix_bits is not None else Config.BREACH_INDEX_PREFIX_BITS
+        if not 1 <= prefix_bits <= 24:
+            raise ValueError('Prefix bits must be between 1 and 24')
+
+        bucket_counts = array('Q', bytes(((1 << prefix_bits) + 1) * 8))
+        records_offset = cls.HEADER.size + len(bucket_counts) * 8
+        count = 0
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(index_path))) as run_directory:
+            runs = cls._reduce_runs(cls._write_sorted_runs(dump_path, run_directory), run_directory)
+            with open(index_path, 'wb') as index:
+                # Records go after the offset table, which is only known once all records are counted
+                index.seek(records_offset)
+                previous = None
+                for digest in heapq.merge(*(cls._read_run(run) for run in runs)):
+                    if digest == previous:
+                        continue
+                    index.write(digest)
+                    bucket_counts[(int.from_bytes(digest[:3], 'big') >> (24 - prefix_bits)) + 1] += 1
+                    previous = digest
+                    count += 1
+
+                # Turn bucket counts into the index of the first record of every bucket
+                for bucket in range(1, len(bucket_counts)):
+                    bucket_counts[bucket] += bucket_counts[bucket - 1]
+                index.seek(0)
+                index.write(cls.HEADER.pack(cls.MAGIC, prefix_bits, count))
+                index.write(bucket_counts.tobytes())
+        return count
+
+    @classmethod
+    def _write_sorted_runs(cls, dump_path: str, run_directory: str) -> list:
+        """Splits the dump into sorted binary run files
+
+        Args:
+            dump_path (str): path of the text dump
+            run_directory (str): directory for the run files
+
+        Raises:
+            ValueError: if the dump contains an invalid line
+
+        Returns:
+            list: paths of the run files
+        """
+        runs = []
+        digests = iter_dump_digests(dump_path)
+        while True:
+            chunk = list(islice(digests, Config.BREACH_INDEX_SORT_CHUNK))
+            if not chunk:
+                return runs
+            chunk.sort()
+            run_path = os.path.join(run_directory, f'run{len(runs)}')
+            # Written record by record, joining them would copy the whole chunk
+            with open(run_path, 'wb', buffering=Config.FILE_BUFFER_SIZE) as run:
+                run.writelines(chunk)
+            runs.append(run_path)
+
+    @classmethod
+    def _reduce_runs(cls, runs: list, run_directory: str) -> list:
+        """Merges groups of runs until at most Config.BREACH_INDEX_MERGE_FAN_IN are left for the final merge
+
+        Args:
+            runs (list): paths of the run files, merged files are removed
+            run_directory (str): directory for the merged run files
+
+        Returns:
+            list: paths of the remaining run files
+        """
+        fan_in = max(2, Config.BREACH_INDEX_MERGE_FAN_IN)
+        level = 0
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                run_path = os.path.join(run_directory, f'merge{level}_{len(merged)}')
+                with open(run_path, 'wb', buffering=Config.FILE_BUFFER_SIZE) as run:
+                    run.writelines(heapq.merge(*(cls._read_run(path) for path in group)))
+                for path in group:
+                    os.remove(path)
+                merged.append(run_path)
+            runs = merged
+            level += 1
+        return runs
+
+    @classmethod
+    def _read_run(cls, run_path: str) -> Iterator[bytes]:
+        """Reads records of one run file
+
+        Args:
+            run_path (str): path of the run file
+
+        Yields:
+            bytes: 20-byte digests in sorted order
+        """
+        with open(run_path, 'rb', buffering=Config.FILE_BUFFER_SIZE) as run:
+            while True:
+                digest = run.read(cls.RECORD_SIZE)
+                if not digest:
+                    return
+                yield digest
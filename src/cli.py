@@ -0,0 +1,222 @@
+import argparse
+import csv
+import io
+import json
+import sys
+from typing import Iterator
+from src.config import Config
+from src.dictionary_automaton import require_native_dictionary
+from src.file_handler import FileHandler
+from src.generation_policy import get_policy
+from src.password_generator import PasswordGenerator
+from src.random_source import get_random_source
+from src.seen_set import seen_set_size
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command line parser
+
+    Returns:
+        argparse.ArgumentParser: parser of the headless commands
+    """
+    parser = argparse.ArgumentParser(prog='python -m src', description='Headless password generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='generate passwords and stream them to stdout or a file')
+    generate.add_argument('-n', '--count', type=int, default=1, help='number of passwords (default: 1)')
+    generate.add_argument('-l', '--length', type=int, default=8, help=f'password length, {Config.MIN_PASSWORD_LENGTH} - {Config.MAX_PASSWORD_LENGTH} (default: 8)')
+    generate.add_argument('-d', '--digits', action='store_true', help='include numbers')
+    generate.add_argument('-u', '--upper', action='store_true', help='include upper case symbols')
+    generate.add_argument('--no-lower', dest='lower', action='store_false', help='do not include lower case symbols')
+    generate.add_argument('-s', '--special', action='store_true', help='include special symbols')
+    generate.add_argument('-e', '--evaluate', choices=('internal', 'external', 'native'), help='score every password by the internal, third party or native zxcvbn compatible evaluation')
+    generate.add_argument('--seed', help='seed of a reproducible run, for load tests only, the passwords are predictable')
+    generate.add_argument('--unique', action='store_true', help='never repeat a password, the count must not exceed the possible passwords')
+    generate.add_argument('-b', '--check-breach', action='store_true', help='check every password against Have I been pwned (or the configured offline index)')
+    generate.add_argument('-f', '--format', choices=('text', 'jsonl', 'csv'), default='text', help='output format (default: text)')
+    generate.add_argument('-o', '--output', help='append to this file instead of writing to stdout')
+    generate.add_argument('-w', '--workers', type=int, default=1, help='worker processes, 0 uses all cores (default: 1)')
+
+    audit = commands.add_parser('audit', help='evaluate and breach check every password of a file, one password per line')
+    audit.add_argument('input', help='password file, e.g. written by the generate command or the GUI')
+    audit.add_argument('-o', '--output', required=True, help='per line report in JSON lines, overwritten unless the audit is resumed')
+    audit.add_argument('-e', '--evaluate', choices=('internal', 'external', 'native', 'none'), default='internal', help='evaluation method, none only checks breaches (default: internal)')
+    audit.add_argument('-b', '--check-breach', action='store_true', help='check every password against Have I been pwned (or the configured offline index)')
+    audit.add_argument('-c', '--checkpoint', help='progress checkpoint, an existing one resumes the interrupted audit')
+    audit.add_argument('-w', '--workers', type=int, default=1, help='worker processes of the evaluation, 0 uses all cores (default: 1)')
+    return parser
+
+
+def iter_results(arguments: argparse.Namespace) -> Iterator[list]:
+    """Generates, evaluates and breach checks the passwords chunk by chunk
+
+    Args:
+        arguments (argparse.Namespace): parsed generate arguments
+
+    Raises:
+        ValueError: when given parameters are invalid
+
+    Yields:
+        list: chunk of (password, score, breached) tuples, score and breached are None when not requested
+    """
+    # Seeded runs always use the chunks and substreams of the engine, so the passwords do not depend on the number of workers
+    if arguments.workers != 1 or (arguments.seed if arguments.seed is not None else Config.RANDOM_SEED) is not None:
+        from src.parallel_engine import ParallelEngine
+        engine = ParallelEngine(workers=arguments.workers or None, seed=arguments.seed)
+        chunks = engine.generate(arguments.count, arguments.length, arguments.digits, arguments.upper, arguments.lower, arguments.special, evaluation=arguments.evaluate, unique=arguments.unique)
+        # Workers return (password, score) tuples when evaluating
+        chunks = (chunk if arguments.evaluate else [(password, None) for password in chunk] for chunk in chunks)
+    else:
+        chunks = _iter_local_chunks(arguments)
+
+    evaluator = None
+    if arguments.check_breach:
+        from src.password_evaluator import PasswordEvaluator
+        evaluator = PasswordEvaluator()
+    for chunk in chunks:
+        if evaluator is not None:
+            breached = evaluator.is_breached_many([password for password, _ in chunk])
+        else:
+            breached = [None] * len(chunk)
+        yield [(password, score, is_breached) for (password, score), is_breached in zip(chunk, breached)]
+
+
+def _iter_local_chunks(arguments: argparse.Namespace) -> Iterator[list]:
+    """Generates and evaluates the passwords of unseeded runs in this process
+
+    Args:
+        arguments (argparse.Namespace): parsed generate arguments
+
+    Raises:
+        ValueError: when given parameters are invalid
+
+    Yields:
+        list: chunk of (password, score) tuples
+    """
+    policy = get_policy(arguments.digits, arguments.upper, arguments.lower, arguments.special)
+    passwords = PasswordGenerator(get_random_source(arguments.seed)).iter_passwords(policy, count=arguments.count, length=arguments.length, unique=arguments.unique)
+    evaluator = None
+    if arguments.evaluate:
+        from src.password_evaluator import PasswordEvaluator
+        evaluator = PasswordEvaluator()
+    while True:
+        chunk = [password for _, password in zip(range(Config.STREAM_BLOCK_SIZE), passwords)]
+        if not chunk:
+            return
+        if arguments.evaluate == 'internal':
+            scores = evaluator.internal_password_evaluation_batch(chunk)
+        elif arguments.evaluate == 'external':
+            scores = [evaluator.external_password_evaluation(password) for password in chunk]
+        elif arguments.evaluate == 'native':
+            scores = [evaluator.native_password_evaluation(password) for password in chunk]
+        else:
+            scores = [None] * len(chunk)
+        yield list(zip(chunk, scores))
+
+
+def format_results(results: list, output_format: str, fields: list) -> list:
+    """Formats one chunk of results into output lines
+
+    Args:
+        results (list): (password, score, breached) tuples
+        output_format (str): 'text', 'jsonl' or 'csv'
+        fields (list): requested fields, password is always first
+
+    Returns:
+        list: one line per password, without line endings
+    """
+    indexes = [('password', 'score', 'breached').index(field) for field in fields]
+    if output_format == 'jsonl':
+        return [json.dumps({field: result[index] for field, index in zip(fields, indexes)}) for result in results]
+    if output_format == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows([result[index] for index in indexes] for result in results)
+        return buffer.getvalue().split('\n')[:-1]
+    # Plain passwords keep the format of FileHandler, extra fields are separated by tabs
+    if len(fields) == 1:
+        return [result[0] for result in results]
+    return ['\t'.join(str(result[index]) for index in indexes) for result in results]
+
+
+def generate(arguments: argparse.Namespace) -> int:
+    """Runs the generate command
+
+    Args:
+        arguments (argparse.Namespace): parsed generate arguments
+
+    Raises:
+        ValueError: when given parameters are invalid
+
+    Returns:
+        int: exit code
+    """
+    fields = ['password'] + (['score'] if arguments.evaluate else []) + (['breached'] if arguments.check_breach else [])
+    # Generation is lazy, invalid parameters are rejected here before the output file is created
+    policy = get_policy(arguments.digits, arguments.upper, arguments.lower, arguments.special)
+    if arguments.count < 0 or not policy.is_valid_length(arguments.length):
+        raise ValueError('Invalid combination of parameters')
+    if arguments.evaluate == 'native':
+        require_native_dictionary()
+    if arguments.unique:
+        # Memory of the uniqueness check is reported before it is allocated
+        kind, memory = seen_set_size(policy, arguments.length, arguments.count)
+        print(f'Uniqueness check of {arguments.count} passwords uses a {kind} set of {memory} bytes', file=sys.stderr)
+    header = [','.join(fields)] if arguments.format == 'csv' else []
+    results = iter_results(arguments)
+
+    if arguments.output:
+        with FileHandler().open_writer(arguments.output) as writer:
+            if header and writer.is_empty:
+                writer.write(header[0])
+            writer.write_many(line for chunk in results for line in format_results(chunk, arguments.format, fields))
+        return 0
+
+    if header:
+        sys.stdout.write(header[0] + '\n')
+    for chunk in results:
+        sys.stdout.write('\n'.join(format_results(chunk, arguments.format, fields)) + '\n')
+    sys.stdout.flush()
+    return 0
+
+
+def audit(arguments: argparse.Namespace) -> int:
+    """Runs the audit command, the summary is printed as JSON
+
+    Args:
+        arguments (argparse.Namespace): parsed audit arguments
+
+    Raises:
+        ValueError: when given parameters are invalid or the checkpoint belongs to another audit
+
+    Returns:
+        int: exit code
+    """
+    # Imported here, generating does not need the evaluator dependencies
+    from src.auditor import PasswordAuditor
+    evaluation = None if arguments.evaluate == 'none' else arguments.evaluate
+    auditor = PasswordAuditor(evaluation, arguments.check_breach, workers=arguments.workers)
+    summary = auditor.audit(arguments.input, arguments.output, arguments.checkpoint)
+    print(json.dumps(summary.to_dict(), indent=2))
+    return 0
+
+
+def main(argv: list = None) -> int:
+    """Entry point of python -m src
+
+    Args:
+        argv (list, optional): command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: exit code
+    """
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+    try:
+        if arguments.command == 'audit':
+            return audit(arguments)
+        return generate(arguments)
+    except ValueError as e:
+        parser.error(str(e))
+    except (ConnectionError, IOError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
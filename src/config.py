@@ -4,4 +4,67 @@ class Config():
     MAX_PASSWORD_LENGTH = 50
     PASSWORD_LENGTH_RATING = {'joke': 1, 'weak': 6, 'moderate': 10, 'strong': 16}
     SEQUENCE_LENGTH = 3
-    PASSWORD_BREACH_CHECK_API = 'https://api.pwnedpasswords.com/range/'     
\ No newline at end of file
+    # Character runs are detected with these code point steps and along the keyboard rows
+    SEQUENCE_STEPS = (1,)
+    SEQUENCE_KEYBOARD_ROWS = ('1234567890', 'qwertyuiop', 'asdfghjkl', 'zxcvbnm')
+    PASSWORD_BREACH_CHECK_API = 'https://api.pwnedpasswords.com/range/'
+    # Passwords generated or evaluated by one worker task, workers default to the number of cores
+    PARALLEL_CHUNK_SIZE = 10000
+    PARALLEL_WORKERS = None
+    # Passwords generated per block by iter_passwords and written per chunk by streaming saves
+    STREAM_BLOCK_SIZE = 1000
+    FILE_WRITE_CHUNK_SIZE = 10000
+    FILE_BUFFER_SIZE = 1024 * 1024
+    # Flush the password file every N records and / or T seconds, None disables the policy
+    FILE_FLUSH_EVERY = None
+    FILE_FLUSH_INTERVAL = None
+    FILE_FSYNC = False
+    # Offline breach index built by BreachIndex.build, is_breached uses it instead of the API when set
+    BREACH_INDEX_PATH = None
+    BREACH_INDEX_PREFIX_BITS = 20
+    # Index builds sort chunks of N records in memory, about 70 bytes per record, and merge at most FAN_IN runs at once
+    BREACH_INDEX_SORT_CHUNK = 1000000
+    BREACH_INDEX_MERGE_FAN_IN = 64
+    # Downloaded breach ranges are fresh for TTL seconds, kept in memory (LRU) and in sqlite when a path is set
+    BREACH_CACHE_PATH = None
+    BREACH_CACHE_TTL = 24 * 60 * 60
+    BREACH_CACHE_MEMORY_SIZE = 256
+    # Breach API requests: ranges downloaded at once, attempts after a failure, first backoff and timeout in seconds
+    BREACH_CHECK_CONCURRENCY = 16
+    BREACH_CHECK_RETRIES = 3
+    BREACH_CHECK_BACKOFF = 0.5
+    BREACH_CHECK_TIMEOUT = 10
+    # Bloom filter built by BloomFilter.build, checked before the breach index or API when set
+    BREACH_BLOOM_FILTER_PATH = None
+    BREACH_BLOOM_FILTER_FALSE_POSITIVE_RATE = 0.01
+    # External evaluation results kept in memory, a max length caps the zxcvbn cost by scoring longer passwords as their weaker end (None evaluates all)
+    EXTERNAL_EVALUATION_CACHE_SIZE = 4096
+    EXTERNAL_EVALUATION_MAX_LENGTH = None
+    # GUI evaluation runs on worker threads after typing pauses for the debounce time, results are polled every N ms
+    BACKGROUND_EVALUATION_WORKERS = 2
+    EVALUATION_DEBOUNCE_MS = 150
+    EVALUATION_POLL_MS = 16
+    # Counters and timers of the hot paths, see src.metrics, disabled metrics cost almost nothing
+    METRICS_ENABLED = False
+    # Passphrases are drawn from the wordlist (text with one word per line or built by Wordlist.build)
+    PASSPHRASE_WORDLIST_PATH = None
+    PASSPHRASE_WORDS = 6
+    PASSPHRASE_SEPARATOR = '-'
+    MIN_PASSPHRASE_WORDS = 3
+    MAX_PASSPHRASE_WORDS = 20
+    MAX_PASSPHRASE_DIGITS = 8
+    # Native zxcvbn compatible evaluation, an automaton built by DictionaryAutomaton.build, by default built from the installed zxcvbn lists into the cache dir
+    NATIVE_EVALUATION_DICTIONARY_PATH = None
+    NATIVE_EVALUATION_CACHE_DIR = None
+    NATIVE_EVALUATION_MAX_LENGTH = 64
+    # Unique batches remember the passwords in a bitmap of the keyspace or a table of 64-bit fingerprints filled up to the load factor
+    UNIQUE_FINGERPRINT_LOAD_FACTOR = 0.5
+    # Random bytes are read in blocks of this size, a seed makes generation reproducible (never set it for real passwords)
+    RANDOM_BUFFER_SIZE = 64 * 1024
+    RANDOM_SEED = None
+    # Audits read the password file in blocks of this size, passwords are evaluated in chunks and progress is checkpointed every N seconds
+    AUDIT_READ_BLOCK_SIZE = 1024 * 1024
+    AUDIT_CHUNK_SIZE = 10000
+    AUDIT_CHECKPOINT_INTERVAL = 5
+    # Passwords scored together by ScoringEngine.score_many
+    SCORE_BATCH_SIZE = 4096
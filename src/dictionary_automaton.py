@@ -0,0 +1,327 @@
+import importlib.metadata
+import importlib.util
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Iterator
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _import_frequency_lists() -> dict:
+    """Imports the zxcvbn frequency lists on first use, they are large and only needed to build the automaton
+
+    Returns:
+        dict: dictionary name -> list of words from the most common one
+    """
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+    return FREQUENCY_LISTS
+
+
+def iter_frequency_list(frequency_list_path: str) -> Iterator[str]:
+    """Reads a ranked frequency list, one word per line from the most common one, 'word count' lines give their first field
+
+    Args:
+        frequency_list_path (str): path of the text frequency list
+
+    Raises:
+        ValueError: if the frequency list is not UTF-8
+
+    Yields:
+        str: lower case word of every non-empty line
+    """
+    with open(frequency_list_path, 'rb', buffering=Config.FILE_BUFFER_SIZE) as frequency_list:
+        for line in frequency_list:
+            fields = line.split()
+            if not fields:
+                continue
+            try:
+                yield fields[0].decode('utf-8').lower()
+            except UnicodeDecodeError:
+                raise ValueError(f'Invalid line in frequency list: {line.strip()!r}')
+
+
+class DictionaryAutomaton():
+    """Memory-mapped Aho-Corasick automaton of ranked dictionaries, finds all dictionary words in a password in one pass
+
+    The trie nodes are numbered breadth first, so the edges of a node are a contiguous slice sorted by character.
+    File layout: header, dictionary names, then uint32 arrays read in place:
+    edge start per node (+1), edge characters, edge targets, failure link, output link, depth,
+    output start per node (+1), output dictionary and output rank
+    """
+    MAGIC = b'PWDACDA1'
+    # magic, node count, edge count, output count, size of the dictionary names
+    HEADER = struct.Struct('<8sIIII')
+    NO_NODE = 0xFFFFFFFF
+
+    def __init__(self, automaton_path: str) -> None:
+        """Opens an automaton built by DictionaryAutomaton.build
+
+        Args:
+            automaton_path (str): path of the automaton file
+
+        Raises:
+            ValueError: if the file is not a valid automaton
+        """
+        self.automaton_path = automaton_path
+        self._arrays = []
+        with open(automaton_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < self.HEADER.size:
+            self.close()
+            raise ValueError('Invalid dictionary automaton file')
+        magic, node_count, edge_count, output_count, names_size = self.HEADER.unpack_from(self._mmap, 0)
+        names_end = self.HEADER.size + names_size
+        sizes = (node_count + 1, edge_count, edge_count, node_count, node_count, node_count, node_count + 1, output_count, output_count)
+        # Arrays start at the next multiple of 4 after the names
+        offset = names_end + -names_end % 4
+        if magic != self.MAGIC or node_count < 1 or len(self._mmap) != offset + 4 * sum(sizes):
+            self.close()
+            raise ValueError('Invalid dictionary automaton file')
+        self.dictionary_names = self._mmap[self.HEADER.size:names_end].decode('utf-8').split('\n')
+
+        view = memoryview(self._mmap)
+        for size in sizes:
+            self._arrays.append(view[offset:offset + 4 * size].cast('I'))
+            offset += 4 * size
+        view.release()
+        (self._edge_start, self._edge_chars, self._edge_targets, self._fail, self._output_link,
+         self._depth, self._output_start, self._output_dictionary, self._output_rank) = self._arrays
+
+    def __enter__(self) -> 'DictionaryAutomaton':
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        self.close()
+
+    def matches(self, text: str) -> Iterator[tuple]:
+        """Finds every dictionary word in the text, overlapping words included
+
+        Args:
+            text (str): lower case text
+
+        Yields:
+            tuple: (i, j, dictionary name, rank) of every word text[i:j + 1], by increasing j
+        """
+        edge_start = self._edge_start
+        edge_chars = self._edge_chars
+        edge_targets = self._edge_targets
+        fail = self._fail
+        output_link = self._output_link
+        depth = self._depth
+        output_start = self._output_start
+        output_dictionary = self._output_dictionary
+        output_rank = self._output_rank
+        names = self.dictionary_names
+        no_node = self.NO_NODE
+
+        node = 0
+        for j, char in enumerate(text):
+            code = ord(char)
+            # Follow the failure links until a node has an edge for the character or the root is reached
+            while True:
+                low, high = edge_start[node], edge_start[node + 1]
+                edge = bisect_left(edge_chars, code, low, high)
+                if edge < high and edge_chars[edge] == code:
+                    node = edge_targets[edge]
+                    break
+                if node == 0:
+                    break
+                node = fail[node]
+
+            # Words ending here are the node itself and the nodes of its output chain
+            output = node if output_start[node] < output_start[node + 1] else output_link[node]
+            while output != no_node:
+                i = j - depth[output] + 1
+                for index in range(output_start[output], output_start[output + 1]):
+                    yield i, j, names[output_dictionary[index]], output_rank[index]
+                output = output_link[output]
+
+    def close(self) -> None:
+        """Closes the memory map
+        """
+        for view in self._arrays:
+            view.release()
+        self._arrays = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @classmethod
+    def compile(cls, dictionaries: dict) -> bytes:
+        """Compiles ranked dictionaries into the automaton layout
+
+        Args:
+            dictionaries (dict): name -> iterable of words from the most common one, ranks start at 1
+
+        Raises:
+            ValueError: if a dictionary name is empty or contains a line break
+
+        Returns:
+            bytes: compiled automaton
+        """
+        names = list(dictionaries)
+        if any(not name or '\n' in name for name in names):
+            raise ValueError('Invalid dictionary name')
+
+        # Trie of dicts, outputs are {dictionary index: rank}, a repeated word keeps its last rank like zxcvbn
+        children = [{}]
+        outputs = [{}]
+        for dictionary_index, name in enumerate(names):
+            for rank, word in enumerate(dictionaries[name], 1):
+                if not word:
+                    continue
+                node = 0
+                for char in word:
+                    child = children[node].get(char)
+                    if child is None:
+                        child = len(children)
+                        children[node][char] = child
+                        children.append({})
+                        outputs.append({})
+                    node = child
+                outputs[node][dictionary_index] = rank
+
+        # Breadth first numbering keeps the edges of every node together
+        order = [0]
+        depths = {0: 0}
+        queue = deque([0])
+        while queue:
+            node = queue.popleft()
+            for char in sorted(children[node]):
+                child = children[node][char]
+                depths[child] = depths[node] + 1
+                order.append(child)
+                queue.append(child)
+        number = {node: index for index, node in enumerate(order)}
+
+        # Failure links in breadth first order, parents are always linked before their children
+        fail = {0: 0}
+        output_link = {0: cls.NO_NODE}
+        for node in order:
+            for char, child in children[node].items():
+                if node == 0:
+                    fail[child] = 0
+                else:
+                    state = fail[node]
+                    while char not in children[state] and state != 0:
+                        state = fail[state]
+                    fail[child] = children[state].get(char, 0)
+                link = fail[child]
+                output_link[child] = link if outputs[link] else output_link[link]
+
+        edge_start, edge_chars, edge_targets = array('I', [0]), array('I'), array('I')
+        fail_links, output_links, node_depths = array('I'), array('I'), array('I')
+        output_start, output_dictionary, output_rank = array('I', [0]), array('I'), array('I')
+        for node in order:
+            for char in sorted(children[node]):
+                edge_chars.append(ord(char))
+                edge_targets.append(number[children[node][char]])
+            edge_start.append(len(edge_chars))
+            fail_links.append(number[fail[node]])
+            output_links.append(cls.NO_NODE if output_link[node] == cls.NO_NODE else number[output_link[node]])
+            node_depths.append(depths[node])
+            for dictionary_index, rank in sorted(outputs[node].items()):
+                output_dictionary.append(dictionary_index)
+                output_rank.append(rank)
+            output_start.append(len(output_dictionary))
+
+        names_data = '\n'.join(names).encode('utf-8')
+        data = bytearray(cls.HEADER.pack(cls.MAGIC, len(order), len(edge_chars), len(output_dictionary), len(names_data)))
+        data += names_data
+        data += bytes(-len(data) % 4)
+        for values in (edge_start, edge_chars, edge_targets, fail_links, output_links, node_depths,
+                       output_start, output_dictionary, output_rank):
+            data += values.tobytes()
+        return bytes(data)
+
+    @classmethod
+    def build(cls, frequency_lists: dict, automaton_path: str) -> int:
+        """Builds the automaton file from ranked frequency lists, e.g. the zxcvbn lists
+
+        Args:
+            frequency_lists (dict): dictionary name -> path of the text frequency list
+            automaton_path (str): path of the automaton file to create
+
+        Raises:
+            ValueError: if a frequency list is not UTF-8 or a name is invalid
+
+        Returns:
+            int: number of trie nodes
+        """
+        data = cls.compile({name: iter_frequency_list(path) for name, path in frequency_lists.items()})
+        with open(automaton_path, 'wb') as f:
+            f.write(data)
+        return cls.HEADER.unpack_from(data, 0)[1]
+
+
+@lru_cache(maxsize=4)
+def get_dictionary_automaton(automaton_path: str) -> DictionaryAutomaton:
+    """Returns the opened automaton, opening it only on first use
+
+    Args:
+        automaton_path (str): path of the automaton file
+
+    Raises:
+        ValueError: if the file is not a valid automaton
+
+    Returns:
+        DictionaryAutomaton: cached automaton
+    """
+    return DictionaryAutomaton(automaton_path)
+
+
+def native_dictionary_available() -> bool:
+    """Checks if native evaluation has dictionaries, configured or built from the installed zxcvbn
+
+    Returns:
+        bool: True if a dictionary is configured or zxcvbn is installed
+    """
+    return bool(Config.NATIVE_EVALUATION_DICTIONARY_PATH) or importlib.util.find_spec('zxcvbn') is not None
+
+
+def require_native_dictionary() -> None:
+    """Rejects native evaluation without dictionaries before any work starts, see native_dictionary_available
+
+    Raises:
+        ValueError: if no dictionary is configured and zxcvbn is not installed
+    """
+    if not native_dictionary_available():
+        raise ValueError('Native evaluation needs dictionaries, install zxcvbn or set Config.NATIVE_EVALUATION_DICTIONARY_PATH')
+
+
+def zxcvbn_dictionary_path() -> str:
+    """Returns the automaton of the zxcvbn frequency lists, building it on first use
+
+    The automaton is cached in Config.NATIVE_EVALUATION_CACHE_DIR (by default the user cache directory)
+    per zxcvbn version, it is written under a temporary name and renamed, so processes building it at once do not clash
+
+    Raises:
+        ImportError: if zxcvbn is not installed
+
+    Returns:
+        str: path of the automaton file
+    """
+    try:
+        version = importlib.metadata.version('zxcvbn')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    cache_dir = Config.NATIVE_EVALUATION_CACHE_DIR or os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'password-generator')
+    automaton_path = os.path.join(cache_dir, f'zxcvbn-{version}.ac')
+    if os.path.exists(automaton_path):
+        return automaton_path
+    frequency_lists = _import_frequency_lists()
+    logger.info('Building the native evaluation dictionaries into %s', automaton_path)
+    data = DictionaryAutomaton.compile(frequency_lists)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary_path = f'{automaton_path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(data)
+    os.replace(temporary_path, automaton_path)
+    return automaton_path
@@ -0,0 +1,84 @@
+import math
+from functools import lru_cache
+from itertools import combinations
+from src.config import Config
+from src.generation_policy import GenerationPolicy, get_policy
+
+# Character class names in the order of the get_policy flags
+CLASS_NAMES = ('digits', 'upper', 'lower', 'special')
+
+
+def policy_for_classes(classes: tuple) -> GenerationPolicy:
+    """Returns the compiled policy requiring the named character classes
+
+    Args:
+        classes (tuple): names from CLASS_NAMES
+
+    Raises:
+        ValueError: if a class name is unknown or no class is given
+
+    Returns:
+        GenerationPolicy: cached compiled policy
+    """
+    classes = set(classes)
+    unknown = classes.difference(CLASS_NAMES)
+    if unknown:
+        raise ValueError(f'Unknown character classes {", ".join(sorted(unknown))}')
+    return get_policy(*(name in classes for name in CLASS_NAMES))
+
+
+@lru_cache(maxsize=1024)
+def valid_count(policy: GenerationPolicy, length: int) -> int:
+    """Number of passwords of the length with at least one character of every required class
+
+    Inclusion-exclusion over the classes which may be missing: all strings over the charset,
+    minus the strings missing one class, plus the strings missing two classes and so on
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        length (int): password length
+
+    Returns:
+        int: exact number of valid passwords
+    """
+    count = 0
+    class_sizes = [len(char_type) for char_type in policy.char_types]
+    for missing in range(len(class_sizes) + 1):
+        for missing_sizes in combinations(class_sizes, missing):
+            count += (-1) ** missing * (policy.charset_size - sum(missing_sizes)) ** length
+    return count
+
+
+def entropy_bits(policy: GenerationPolicy, length: int) -> float:
+    """Exact entropy of a password drawn uniformly from all valid passwords, as generated by PasswordGenerator
+
+    The required classes make it slightly lower than length * log2(charset size)
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        length (int): password length
+
+    Returns:
+        float: entropy in bits, 0 if no password of the length is valid
+    """
+    count = valid_count(policy, length)
+    return math.log2(count) if count else 0.0
+
+
+def minimum_length(policy: GenerationPolicy, bits: float) -> int:
+    """Shortest allowed length whose entropy reaches the target
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        bits (float): wanted entropy in bits
+
+    Raises:
+        ValueError: if not even Config.MAX_PASSWORD_LENGTH characters reach the target
+
+    Returns:
+        int: password length
+    """
+    for length in range(Config.MIN_PASSWORD_LENGTH, Config.MAX_PASSWORD_LENGTH + 1):
+        if entropy_bits(policy, length) >= bits:
+            return length
+    raise ValueError(f'{bits} bits need more than {Config.MAX_PASSWORD_LENGTH} characters')
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from src.config import Config
+
+# Only the part of the zxcvbn result the application uses, truncated is True if only a prefix was evaluated
+StrengthResult = namedtuple('StrengthResult', ['score', 'truncated'])
+
+
+class ExternalEvaluationCache():
+    """Bounded LRU of external evaluation results, keyed by a salted hash so no plaintext password is kept
+    """
+    def __init__(self, max_size: int = None) -> None:
+        """Initializes ExternalEvaluationCache
+
+        Args:
+            max_size (int, optional): results kept in the cache. Defaults to Config.EXTERNAL_EVALUATION_CACHE_SIZE.
+        """
+        self.max_size = max_size if max_size is not None else Config.EXTERNAL_EVALUATION_CACHE_SIZE
+        # Random salt per cache, the keys cannot be compared with precomputed hashes
+        self._salt = os.urandom(16)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def key(self, password: str) -> bytes:
+        """Salted hash of the password used as the cache key
+
+        Args:
+            password (str): password
+
+        Returns:
+            bytes: 16-byte keyed BLAKE2b digest
+        """
+        return hashlib.blake2b(password.encode('utf-8'), key=self._salt, digest_size=16).digest()
+
+    def get(self, password: str) -> StrengthResult:
+        """Returns the cached result of the password
+
+        Args:
+            password (str): password
+
+        Returns:
+            StrengthResult: cached result, None if the password was not evaluated yet
+        """
+        key = self.key(password)
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, password: str, result: StrengthResult) -> None:
+        """Stores the result, dropping the least recently used results over the size limit
+
+        Args:
+            password (str): evaluated password
+            result (StrengthResult): its result
+        """
+        if self.max_size <= 0:
+            return
+        key = self.key(password)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all results
+        """
+        with self._lock:
+            self._results.clear()
@@ -1,4 +1,165 @@
 import os
+import time
+from itertools import islice
+from typing import Iterable, Iterator
+from src.config import Config
+from src.metrics import metrics
+
+
+class PasswordFileWriter():
+    """Keeps a password file open for many saves, writing one password per line
+    """
+    def __init__(self, file_path: str, flush_every: int = None, flush_interval: float = None, fsync: bool = None, buffering: int = None) -> None:
+        """Initializes PasswordFileWriter, the file is opened by open() or by entering the context manager
+
+        Args:
+            file_path (str): filepath where to save the passwords
+            flush_every (int, optional): flush after every N records. Defaults to Config.FILE_FLUSH_EVERY.
+            flush_interval (float, optional): flush when T seconds passed since the last flush. Defaults to Config.FILE_FLUSH_INTERVAL.
+            fsync (bool, optional): if flushing also forces the data to disk. Defaults to Config.FILE_FSYNC.
+            buffering (int, optional): buffer size of the file as in open(), -1 for the system default. Defaults to Config.FILE_BUFFER_SIZE.
+        """
+        self.file_path = file_path
+        self.buffering = buffering if buffering is not None else Config.FILE_BUFFER_SIZE
+        self.flush_every = flush_every if flush_every is not None else Config.FILE_FLUSH_EVERY
+        self.flush_interval = flush_interval if flush_interval is not None else Config.FILE_FLUSH_INTERVAL
+        self.fsync = fsync if fsync is not None else Config.FILE_FSYNC
+        self.records = 0
+        self._file = None
+        self._needs_newline = False
+        self._unflushed = 0
+        self._last_flush = 0.0
+
+    def __enter__(self) -> 'PasswordFileWriter':
+        return self.open()
+
+    def __exit__(self, *args: tuple) -> None:
+        self.close()
+
+    @property
+    def is_empty(self) -> bool:
+        """True while the opened file has no content, e.g. to write a header first
+        """
+        return not self._needs_newline
+
+    def open(self) -> 'PasswordFileWriter':
+        """Opens the file for appending
+
+        Raises:
+            IOERROR: If the file cannot be opened
+
+        Returns:
+            PasswordFileWriter: the writer itself
+        """
+        try:
+            self._file = open(self.file_path, 'a', encoding="utf-8", buffering=self.buffering)
+        except IOError as e:
+            raise IOError(f"Error saving file: {str(e)}")
+        # Existing content needs a newline before the first password, afterwards the state is kept in memory
+        self._needs_newline = self._file.tell() > 0
+        self._last_flush = time.monotonic()
+        return self
+
+    def write(self, password: str) -> None:
+        """Writes one password
+
+        Args:
+            password (str): password to save
+
+        Raises:
+            ValueError: if the password is empty
+            IOERROR: If saving produces error
+        """
+        if not password:
+            raise ValueError('Nothing to save yet')
+        self._write(password, 1)
+
+    def write_many(self, passwords: Iterable[str]) -> int:
+        """Writes many passwords, joining them into large chunks
+
+        Args:
+            passwords (Iterable[str]): passwords to save, consumed lazily
+
+        Raises:
+            ValueError: if a password is empty, the passwords before it are saved and the rest is not
+            IOERROR: If saving produces error
+
+        Returns:
+            int: number of saved passwords
+        """
+        passwords = iter(passwords)
+        saved = 0
+        while True:
+            chunk = list(islice(passwords, Config.FILE_WRITE_CHUNK_SIZE))
+            if not chunk:
+                return saved
+            if not all(chunk):
+                # Chunks are only a write size, the result does not depend on where the empty password falls
+                valid = next(index for index, password in enumerate(chunk) if not password)
+                if valid:
+                    self._write('\n'.join(chunk[:valid]), valid)
+                raise ValueError('Nothing to save yet')
+            self._write('\n'.join(chunk), len(chunk))
+            saved += len(chunk)
+
+    def flush(self) -> None:
+        """Flushes the buffered passwords, and forces them to disk if fsync is enabled
+
+        Raises:
+            IOERROR: If saving produces error
+        """
+        try:
+            with metrics.timer('file_flush', fsync=str(bool(self.fsync)).lower()):
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+        except IOError as e:
+            raise IOError(f"Error saving file: {str(e)}")
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flushes and closes the file
+
+        Raises:
+            IOERROR: If saving produces error
+        """
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _write(self, text: str, records: int) -> None:
+        """Writes already joined passwords and applies the flush policy
+
+        Args:
+            text (str): one or more passwords joined by newlines
+            records (int): number of passwords in text
+
+        Raises:
+            IOERROR: If saving produces error
+        """
+        try:
+            with metrics.timer('file_write'):
+                if self._needs_newline:
+                    self._file.write('\n')
+                self._file.write(text)
+        except IOError as e:
+            metrics.increment('file_write_errors')
+            raise IOError(f"Error saving file: {str(e)}")
+        metrics.increment('passwords_written', records)
+        self._needs_newline = True
+        self.records += records
+        self._unflushed += records
+
+        if self.flush_every and self._unflushed >= self.flush_every:
+            self.flush()
+        elif self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
 
 class FileHandler():
     def save_to_file(self, file_path: str, password: str) -> str:
@@ -19,15 +180,111 @@ class FileHandler():
         if not password:
             raise ValueError('Nothing to save yet')
         
-        file_type = os.path.splitext(file_path)[1]
-        if not file_type:
-            file_path += '.txt'
+        file_path = self.resolve_file_path(file_path)
             
+        # One password does not need the large buffer of bulk writes
+        with PasswordFileWriter(file_path, buffering=-1) as writer:
+            writer.write(password)
+        return f"Password saved in {file_path}"
+
+    def save_passwords(self, file_path: str, passwords: Iterable[str]) -> str:
+        """Streams many passwords into a file through one buffered file handle
+
+        Args:
+            file_path (str): filepath / filename where to save the passwords
+            passwords (Iterable[str]): passwords to save, consumed lazily
+
+        Raises:
+            IOERROR: If saving produces error
+
+        Returns:
+            str: Returns message to display in GUI
+        """
+        if not file_path:
+            raise ValueError('Filepath is mandatory')
+
+        file_path = self.resolve_file_path(file_path)
+        with PasswordFileWriter(file_path) as writer:
+            saved = writer.write_many(passwords)
+        return f"{saved} passwords saved in {file_path}"
+
+    def open_writer(self, file_path: str, **flush_policy) -> PasswordFileWriter:
+        """Opens a long-lived writer for many saves into the same file
+
+        Args:
+            file_path (str): filepath / filename where to save the passwords
+            **flush_policy: flush_every, flush_interval and fsync, see PasswordFileWriter
+
+        Raises:
+            IOERROR: If the file cannot be opened
+
+        Returns:
+            PasswordFileWriter: opened writer, close it or use it as a context manager
+        """
+        if not file_path:
+            raise ValueError('Filepath is mandatory')
+        return PasswordFileWriter(self.resolve_file_path(file_path), **flush_policy).open()
+
+    def read_chunks(self, file_path: str, chunk_size: int = None, offset: int = 0) -> Iterator[tuple]:
+        """Streams the lines of a password file in chunks, reading blocks so files of any size use bounded memory
+
+        Args:
+            file_path (str): filepath of a file with one password per line, as written by save_to_file
+            chunk_size (int, optional): lines per chunk. Defaults to Config.AUDIT_CHUNK_SIZE.
+            offset (int, optional): byte offset of the first line, e.g. the end offset of a chunk read before. Defaults to 0.
+
+        Raises:
+            IOERROR: If reading produces error
+
+        Yields:
+            tuple: list of lines (empty lines included, line endings removed) and the byte offset after the chunk
+        """
+        if not file_path:
+            raise ValueError('Filepath is mandatory')
+        chunk_size = chunk_size or Config.AUDIT_CHUNK_SIZE
         try:
-            with open(file_path, 'a', encoding="utf-8") as f:
-                if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                    f.write('\n')
-                f.write(password)
-            return f"Password saved in {file_path}"
+            with open(file_path, 'rb') as f:
+                f.seek(offset)
+                lines = []
+                pending = b''
+                while True:
+                    block = f.read(Config.AUDIT_READ_BLOCK_SIZE)
+                    if not block:
+                        break
+                    # The last part is an incomplete line until the next block or the end of the file
+                    parts = (pending + block).split(b'\n')
+                    pending = parts.pop()
+                    lines.extend(parts)
+                    # Chunks are taken by index, the consumed lines are dropped once per block
+                    start = 0
+                    while len(lines) - start >= chunk_size:
+                        chunk = lines[start:start + chunk_size]
+                        start += chunk_size
+                        offset += sum(map(len, chunk)) + len(chunk)
+                        yield self._decode_lines(chunk), offset
+                    del lines[:start]
+                if pending:
+                    lines.append(pending)
+                if lines:
+                    # Every line but a final one without newline is followed by one
+                    offset += sum(map(len, lines)) + len(lines) - (1 if pending else 0)
+                    yield self._decode_lines(lines), offset
         except IOError as e:
-            raise IOError(f"Error saving file: {str(e)}")
\ No newline at end of file
+            raise IOError(f"Error reading file: {str(e)}")
+
+    def _decode_lines(self, lines: list) -> list:
+        return [line.decode('utf-8', 'replace').removesuffix('\r') for line in lines]
+
+    def resolve_file_path(self, file_path: str) -> str:
+        """Adds the default .txt extension to file paths without one
+
+        Args:
+            file_path (str): filepath / filename given by user
+
+        Returns:
+            str: file path to write to
+        """
+        file_type = os.path.splitext(file_path)[1]
+        if not file_type:
+            file_path += '.txt'
+        return file_path
@@ -0,0 +1,110 @@
+import math
+import string
+from functools import lru_cache
+from src.config import Config
+
+
+class GenerationPolicy():
+    """Compiled character set and limits for one combination of character types
+
+    Policies are immutable, get_policy hands the same instance to every caller
+    """
+    # Bit of each character type in class masks
+    DIGITS = 1
+    UPPER = 2
+    LOWER = 4
+    SPECIAL = 8
+    __slots__ = ('MIN_PASSWORD_LENGTH', 'MAX_PASSWORD_LENGTH', 'flags', 'char_types', 'class_mask', 'charset', 'charset_size',
+                 'byte_limit', 'byte_to_char', 'rejected_bytes', 'char_type_bytes', 'bits_per_character')
+
+    def __init__(self, include_digits: bool = False, include_upper: bool = False, include_lower: bool = True, include_special_chars: bool = False) -> None:
+        """Compiles the policy, use get_policy to reuse already compiled policies
+
+        Args:
+            include_digits (bool, optional): If digits are required in password. Defaults to False.
+            include_upper (bool, optional): If Upper characters are required in password. Defaults to False.
+            include_lower (bool, optional): If Lower characters are required in password. Defaults to True.
+            include_special_chars (bool, optional): If special characters are required in password. Defaults to False.
+
+        Raises:
+            ValueError: if no character type is included
+        """
+        if not any((include_digits, include_upper, include_lower, include_special_chars)):
+            raise ValueError('Invalid combination of parameters')
+
+        self.MIN_PASSWORD_LENGTH = Config.MIN_PASSWORD_LENGTH
+        self.MAX_PASSWORD_LENGTH = Config.MAX_PASSWORD_LENGTH
+        self.flags = (bool(include_digits), bool(include_upper), bool(include_lower), bool(include_special_chars))
+
+        # Character types in the order generate_password always used them
+        char_types = []
+        class_mask = 0
+        for included, char_type, type_bit in zip(self.flags, (string.digits, string.ascii_uppercase, string.ascii_lowercase, string.punctuation), (self.DIGITS, self.UPPER, self.LOWER, self.SPECIAL)):
+            if included:
+                char_types.append(char_type)
+                class_mask |= type_bit
+        self.char_types = tuple(char_types)
+        self.class_mask = class_mask
+        self.charset = ''.join(char_types)
+        self.charset_size = len(self.charset)
+
+        # Bytes above the highest multiple of the charset size are rejected, so every character is equally likely
+        self.byte_limit = 256 - 256 % self.charset_size
+        self.byte_to_char = bytes(ord(self.charset[byte % self.charset_size]) if byte < self.byte_limit else 0 for byte in range(256))
+        self.rejected_bytes = bytes(range(self.byte_limit, 256))
+        # Deleting a character type from a candidate must shorten it, else the type is missing
+        self.char_type_bytes = tuple(char_type.encode('ascii') for char_type in char_types)
+
+        # Entropy of one uniformly drawn character
+        self.bits_per_character = math.log2(self.charset_size)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        # Every attribute is set once while compiling
+        if hasattr(self, name):
+            raise AttributeError(f'GenerationPolicy is immutable, {name} cannot be changed')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'GenerationPolicy is immutable, {name} cannot be deleted')
+
+    def is_valid_length(self, length: int) -> bool:
+        """Checks the length against the configured bounds
+
+        Args:
+            length (int): password length
+
+        Returns:
+            bool: True if the length is allowed
+        """
+        return self.MIN_PASSWORD_LENGTH <= length <= self.MAX_PASSWORD_LENGTH
+
+    def has_required_types(self, candidate: bytes) -> bool:
+        """Checks that the candidate contains at least one character of every included type
+
+        Args:
+            candidate (bytes): ASCII encoded password candidate
+
+        Returns:
+            bool: True if no character type is missing
+        """
+        length = len(candidate)
+        return all(len(candidate.translate(None, type_bytes)) < length for type_bytes in self.char_type_bytes)
+
+
+@lru_cache(maxsize=16)
+def get_policy(include_digits: bool = False, include_upper: bool = False, include_lower: bool = True, include_special_chars: bool = False) -> GenerationPolicy:
+    """Returns the compiled policy for the flag combination, compiling it only on first use
+
+    Args:
+        include_digits (bool, optional): If digits are required in password. Defaults to False.
+        include_upper (bool, optional): If Upper characters are required in password. Defaults to False.
+        include_lower (bool, optional): If Lower characters are required in password. Defaults to True.
+        include_special_chars (bool, optional): If special characters are required in password. Defaults to False.
+
+    Raises:
+        ValueError: if no character type is included
+
+    Returns:
+        GenerationPolicy: cached compiled policy
+    """
+    return GenerationPolicy(bool(include_digits), bool(include_upper), bool(include_lower), bool(include_special_chars))
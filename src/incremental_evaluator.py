@@ -0,0 +1,432 @@
+from bisect import bisect_left, bisect_right, insort
+from src.scoring_engine import ScoringEngine
+
+
+class _RunBounds():
+    """Sorted first and last links of the maximal runs of one kind
+
+    Inserting or deleting characters moves the links of all later runs. The move is kept as a pending shift
+    of the bounds from the gap on, so an edit moves the gap only over the runs between it and the previous edit
+    """
+    def __init__(self) -> None:
+        """Initializes _RunBounds without runs
+        """
+        self.starts = []
+        self.ends = []
+        # Bounds from the gap on are stored without the pending shift
+        self.gap = 0
+        self.shift = 0
+
+    def split(self, link: int) -> tuple:
+        """Removes the link from the run through it, leaving the runs before and after it
+
+        Args:
+            link (int): index of a link in a run
+
+        Returns:
+            tuple: first and last link of the run before the split
+        """
+        index = self._count_starts(link, True) - 1
+        self._move_gap(index + 1)
+        starts, ends = self.starts, self.ends
+        start, end = starts[index], ends[index]
+        pieces = []
+        if link > start:
+            pieces.append((start, link - 1))
+        if end > link:
+            pieces.append((link + 1, end))
+        starts[index:index + 1] = [piece_start for piece_start, _ in pieces]
+        ends[index:index + 1] = [piece_end for _, piece_end in pieces]
+        self.gap += len(pieces) - 1
+        return start, end
+
+    def join(self, link: int) -> tuple:
+        """Adds the link, joining the runs ending right before and starting right after it
+
+        Args:
+            link (int): index of a link of no run
+
+        Returns:
+            tuple: first and last link of the joined run
+        """
+        index = self._count_starts(link, False)
+        starts, ends = self.starts, self.ends
+        self._move_gap(min(index + 1, len(starts)))
+        start = end = link
+        first = last = index
+        if index > 0 and ends[index - 1] == link - 1:
+            first = index - 1
+            start = starts[first]
+        if index < len(starts) and starts[index] == link + 1:
+            last = index + 1
+            end = ends[index]
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+        self.gap += 1 - (last - first)
+        return start, end
+
+    def shift_from(self, link: int, delta: int) -> None:
+        """Moves the runs starting at or after the link, no run may contain both the link and the one before it
+
+        Args:
+            link (int): index of the first moved link
+            delta (int): number of inserted links, negative for deleted ones
+        """
+        self._move_gap(self._count_starts(link, False))
+        if self.gap < len(self.starts):
+            self.shift += delta
+
+    def _count_starts(self, link: int, inclusive: bool) -> int:
+        """Counts the runs starting before the link, or also at it when inclusive
+        """
+        starts, gap = self.starts, self.gap
+        bisect = bisect_right if inclusive else bisect_left
+        # All runs before the gap are counted if the first one after it is
+        if gap < len(starts) and (starts[gap] + self.shift <= link if inclusive else starts[gap] + self.shift < link):
+            return bisect(starts, link - self.shift, gap)
+        return bisect(starts, link, 0, gap)
+
+    def _move_gap(self, index: int) -> None:
+        """Applies the pending shift to the bounds between the gap and the index
+        """
+        starts, ends, shift = self.starts, self.ends, self.shift
+        if shift:
+            for i in range(self.gap, index):
+                starts[i] += shift
+                ends[i] += shift
+            for i in range(index, self.gap):
+                starts[i] -= shift
+                ends[i] -= shift
+        self.gap = index
+        if index == len(starts):
+            self.shift = 0
+
+
+class IncrementalEvaluator():
+    """Keeps the internal evaluation criteria of a password which is edited character by character
+
+    Character occurrences, character types and the runs of the sequence analyzer are updated per edit.
+    Runs are kept as the links between neighbouring characters, an edit of one character changes at most
+    two links. The runs through them are found by bisecting the bounds of the runs of each kind, see _RunBounds,
+    so splitting and joining runs does not walk them, also for long runs such as consecutive code points
+
+    Scores are the same as of ScoringEngine.evaluate of the whole password
+    """
+    def __init__(self, scoring_engine: ScoringEngine = None) -> None:
+        """Initializes IncrementalEvaluator with an empty password
+
+        Args:
+            scoring_engine (ScoringEngine, optional): engine whose rating and sequence analyzer are used. Defaults to a new ScoringEngine.
+        """
+        self.scoring_engine = scoring_engine or ScoringEngine()
+        self.sequence_analyzer = self.scoring_engine.sequence_analyzer
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._password)
+
+    @property
+    def password(self) -> str:
+        """Current password"""
+        return self._password
+
+    def clear(self) -> None:
+        """Resets the state to an empty password
+        """
+        self._password = ''
+        # Run kinds continued by every pair of neighbours, links[p] is between characters p and p + 1
+        self._links = []
+        self._occurrences = {}
+        # Number of characters occurring n times, by n
+        self._occurrence_counts = {}
+        self._max_repetitions = 0
+        # Number of characters of every type bit
+        self._class_counts = [0] * 16
+        self._class_mask = 0
+        # Sorted first and last links of the maximal runs, by run kind
+        self._runs = {}
+        # Number of maximal runs of every length in characters, and the sorted lengths
+        self._run_lengths = {}
+        self._sorted_run_lengths = []
+        self._longest = 0
+
+    def append(self, text: str) -> None:
+        """Adds characters at the end, as typed
+
+        Args:
+            text (str): added characters
+        """
+        self.insert(len(self._password), text)
+
+    def delete(self, count: int = 1) -> None:
+        """Removes characters from the end, as by backspace
+
+        Args:
+            count (int, optional): number of removed characters. Defaults to 1.
+
+        Raises:
+            IndexError: if the password is shorter than count
+        """
+        if count > len(self._password):
+            raise IndexError('Not enough characters to delete')
+        self.delete_at(len(self._password) - count, count)
+
+    def insert(self, index: int, text: str) -> None:
+        """Inserts characters before the index, as typed at the cursor
+
+        Args:
+            index (int): position of the first inserted character, 0 - len(password)
+            text (str): inserted characters
+
+        Raises:
+            IndexError: if the index is out of range
+        """
+        length = len(self._password)
+        if not 0 <= index <= length:
+            raise IndexError('Index out of range')
+        if not text:
+            return
+        for char in text:
+            self._add_char(char)
+        count = len(text)
+        password = self._password = self._password[:index] + text + self._password[index:]
+        if length:
+            # The link between the neighbours of the insertion is emptied, the later links move by the inserted ones
+            if 0 < index < length:
+                self._set_link(index - 1, ())
+            position = min(index, length - 1)
+            for bounds in self._runs.values():
+                bounds.shift_from(position, count)
+            self._links[position:position] = [()] * count
+        else:
+            self._links = [()] * (count - 1)
+        neighbour_kinds = self.sequence_analyzer.neighbour_kinds
+        for link in range(max(index - 1, 0), min(index + count, len(password) - 1)):
+            self._set_link(link, neighbour_kinds(password[link], password[link + 1]))
+
+    def delete_at(self, index: int, count: int = 1) -> None:
+        """Removes characters at the index, as by delete at the cursor
+
+        Args:
+            index (int): position of the first removed character
+            count (int, optional): number of removed characters. Defaults to 1.
+
+        Raises:
+            IndexError: if the characters are out of range
+        """
+        length = len(self._password)
+        if index < 0 or count < 0 or index + count > length:
+            raise IndexError('Not enough characters to delete')
+        if not count:
+            return
+        # Links touching the removed characters are emptied, then as many links as characters are dropped
+        for link in range(max(index - 1, 0), min(index + count, length - 1)):
+            self._set_link(link, ())
+        position = min(index, max(length - count - 1, 0))
+        removed = max(length - 1, 0) - max(length - count - 1, 0)
+        for bounds in self._runs.values():
+            bounds.shift_from(position + removed, -removed)
+        del self._links[position:position + removed]
+        for char in self._password[index:index + count]:
+            self._remove_char(char)
+        password = self._password = self._password[:index] + self._password[index + count:]
+        if 0 < index < len(password):
+            self._set_link(index - 1, self.sequence_analyzer.neighbour_kinds(password[index - 1], password[index]))
+
+    def replace(self, index: int, char: str) -> None:
+        """Replaces one character
+
+        Args:
+            index (int): position of the character, negative from the end
+            char (str): new character
+
+        Raises:
+            IndexError: if the index is out of range
+        """
+        old = self._password[index]
+        index %= len(self._password)
+        if old == char:
+            return
+        self._remove_char(old)
+        self._add_char(char)
+        password = self._password = self._password[:index] + char + self._password[index + 1:]
+        # Only the links to both neighbours change
+        if index > 0:
+            self._set_link(index - 1, self.sequence_analyzer.neighbour_kinds(password[index - 1], char))
+        if index < len(self._links):
+            self._set_link(index, self.sequence_analyzer.neighbour_kinds(char, password[index + 1]))
+
+    def update(self, password: str) -> None:
+        """Applies the edits turning the current password into the given one, e.g. the new content of an entry
+
+        The common prefix and suffix are kept, the characters between them are replaced, inserted or deleted
+
+        Args:
+            password (str): new password
+        """
+        current = self._password
+        if password == current:
+            return
+        prefix = _common_prefix(current, password)
+        suffix = _common_suffix(current, password, min(len(current), len(password)) - prefix)
+        old_end, new_end = len(current) - suffix, len(password) - suffix
+        replaced = min(old_end, new_end) - prefix
+        for index in range(prefix, prefix + replaced):
+            self.replace(index, password[index])
+        if old_end > new_end:
+            self.delete_at(prefix + replaced, old_end - new_end)
+        else:
+            self.insert(prefix + replaced, password[prefix + replaced:new_end])
+
+    def evaluate(self) -> tuple:
+        """Evaluates all criteria of the current password
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            tuple: length, repetition, variety and sequence scores, each int (1 - 4)
+        """
+        if not self._password:
+            raise ValueError('Empty password')
+        scoring_engine = self.scoring_engine
+        length = len(self._password)
+        return (
+            scoring_engine.length_score(length),
+            scoring_engine.repetition_score(length, self._max_repetitions),
+            scoring_engine.VARIETY_TABLE[self._class_mask],
+            scoring_engine.sequence_score(length, self._longest),
+        )
+
+    def score(self) -> int:
+        """Evaluates the current password by the internal algorithm
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            int: rounded score: int (1 - 4)
+        """
+        length, repetition, variety, sequence = self.evaluate()
+        return self.scoring_engine.total_score(length * 6 + repetition + variety * 2 + sequence)
+
+    def _add_char(self, char: str) -> None:
+        count = self._occurrences.get(char, 0) + 1
+        self._occurrences[char] = count
+        if count > 1:
+            self._occurrence_counts[count - 1] -= 1
+        self._occurrence_counts[count] = self._occurrence_counts.get(count, 0) + 1
+        if count > self._max_repetitions:
+            self._max_repetitions = count
+        code = ord(char)
+        type_bit = self.scoring_engine.CLASS_TABLE[code] if code < 256 else 0
+        if type_bit:
+            self._class_counts[type_bit] += 1
+            self._class_mask |= type_bit
+
+    def _remove_char(self, char: str) -> None:
+        count = self._occurrences[char]
+        if count == 1:
+            del self._occurrences[char]
+        else:
+            self._occurrences[char] = count - 1
+        self._occurrence_counts[count] -= 1
+        if count > 1:
+            self._occurrence_counts[count - 1] += 1
+        # The character itself now occurs count - 1 times
+        if count == self._max_repetitions and not self._occurrence_counts[count]:
+            self._max_repetitions = count - 1
+        code = ord(char)
+        type_bit = self.scoring_engine.CLASS_TABLE[code] if code < 256 else 0
+        if type_bit:
+            self._class_counts[type_bit] -= 1
+            if not self._class_counts[type_bit]:
+                self._class_mask &= ~type_bit
+
+    def _set_link(self, position: int, kinds: tuple) -> None:
+        """Changes the run kinds of one link, splitting and joining the runs through it
+
+        Args:
+            position (int): index of the link
+            kinds (tuple): new run kinds, see SequenceAnalyzer.neighbour_kinds
+        """
+        old_kinds = self._links[position]
+        for kind in old_kinds:
+            if kind not in kinds:
+                start, end = self._runs[kind].split(position)
+                self._remove_run(end - start + 2)
+                if position > start:
+                    self._add_run(position - start + 1)
+                if end > position:
+                    self._add_run(end - position + 1)
+        self._links[position] = kinds
+        for kind in kinds:
+            if kind not in old_kinds:
+                bounds = self._runs.get(kind)
+                if bounds is None:
+                    bounds = self._runs[kind] = _RunBounds()
+                start, end = bounds.join(position)
+                if position > start:
+                    self._remove_run(position - start + 1)
+                if end > position:
+                    self._remove_run(end - position + 1)
+                self._add_run(end - start + 2)
+
+    def _add_run(self, length: int) -> None:
+        count = self._run_lengths.get(length, 0)
+        self._run_lengths[length] = count + 1
+        if not count:
+            insort(self._sorted_run_lengths, length)
+            self._longest = self._sorted_run_lengths[-1]
+
+    def _remove_run(self, length: int) -> None:
+        count = self._run_lengths[length] - 1
+        if count:
+            self._run_lengths[length] = count
+            return
+        del self._run_lengths[length]
+        # Distinct lengths are few, their sum is at most the number of links
+        del self._sorted_run_lengths[bisect_left(self._sorted_run_lengths, length)]
+        self._longest = self._sorted_run_lengths[-1] if self._sorted_run_lengths else 0
+
+
+def _common_prefix(first: str, second: str) -> int:
+    """Length of the common prefix, halving the compared slices so the work stays linear in C
+
+    Args:
+        first (str): first string
+        second (str): second string
+
+    Returns:
+        int: number of equal leading characters
+    """
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[low:middle] == second[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(first: str, second: str, limit: int) -> int:
+    """Length of the common suffix, see _common_prefix
+
+    Args:
+        first (str): first string
+        second (str): second string
+        limit (int): longest suffix counted, e.g. to not overlap the common prefix
+
+    Returns:
+        int: number of equal trailing characters
+    """
+    first_length, second_length = len(first), len(second)
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[first_length - middle:first_length - low] == second[second_length - middle:second_length - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
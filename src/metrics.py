@@ -0,0 +1,295 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from src.config import Config
+
+
+class MemorySink():
+    """Keeps counters and summaries (count, sum, min, max) of observed values in memory
+    """
+    def __init__(self) -> None:
+        """Initializes MemorySink
+        """
+        self.counters = {}
+        self.summaries = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, value: float, labels: tuple) -> None:
+        """Adds the value to the counter
+
+        Args:
+            name (str): metric name
+            value (float): increment
+            labels (tuple): sorted (label, value) pairs
+        """
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: tuple) -> None:
+        """Adds the value to the summary
+
+        Args:
+            name (str): metric name
+            value (float): observed value, seconds for timers
+            labels (tuple): sorted (label, value) pairs
+        """
+        with self._lock:
+            key = (name, labels)
+            summary = self.summaries.get(key)
+            if summary is None:
+                self.summaries[key] = [1, value, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value < summary[2]:
+                    summary[2] = value
+                if value > summary[3]:
+                    summary[3] = value
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """Returns the counter value, 0 if nothing was counted
+
+        Args:
+            name (str): metric name
+            **labels (str): labels of the counter
+
+        Returns:
+            float: counter value
+        """
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def get_summary(self, name: str, **labels: str) -> dict:
+        """Returns the summary of observed values
+
+        Args:
+            name (str): metric name
+            **labels (str): labels of the summary
+
+        Returns:
+            dict: count, sum, min and max, None if nothing was observed
+        """
+        summary = self.summaries.get((name, tuple(sorted(labels.items()))))
+        if summary is None:
+            return None
+        return dict(zip(('count', 'sum', 'min', 'max'), summary))
+
+    def clear(self) -> None:
+        """Removes all metrics
+        """
+        with self._lock:
+            self.counters.clear()
+            self.summaries.clear()
+
+
+class PrometheusSink(MemorySink):
+    """Keeps metrics in memory and renders them in the Prometheus text exposition format
+    """
+    def __init__(self, prefix: str = 'password_generator') -> None:
+        """Initializes PrometheusSink
+
+        Args:
+            prefix (str, optional): prefix of all metric names. Defaults to 'password_generator'.
+        """
+        super().__init__()
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Renders counters as counters and observed values as summaries
+
+        Returns:
+            str: metrics in the Prometheus text format
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            summaries = sorted(self.summaries.items())
+        typed = set()
+        for (name, labels), value in counters:
+            name = f'{self.prefix}_{name}_total'
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{self.format_labels(labels)} {value}')
+        for (name, labels), (count, total, _, _) in summaries:
+            name = f'{self.prefix}_{name}'
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} summary')
+            lines.append(f'{name}_count{self.format_labels(labels)} {count}')
+            lines.append(f'{name}_sum{self.format_labels(labels)} {total}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, file_path: str) -> None:
+        """Writes the rendered metrics, for example for the node exporter textfile collector
+
+        The file is replaced at once, so a scraper never reads it half written
+
+        Args:
+            file_path (str): path of the metrics file
+        """
+        with open(f'{file_path}.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(f'{file_path}.tmp', file_path)
+
+    @staticmethod
+    def format_labels(labels: tuple) -> str:
+        """Formats the labels of one sample
+
+        Args:
+            labels (tuple): sorted (label, value) pairs
+
+        Returns:
+            str: labels in curly brackets, empty string without labels
+        """
+        if not labels:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+        return '{' + ','.join(f'{label}="{value}"' for (label, _), value in zip(labels, escaped)) + '}'
+
+
+class JsonLogSink():
+    """Logs every metric event as one JSON object
+    """
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO) -> None:
+        """Initializes JsonLogSink
+
+        Args:
+            logger (logging.Logger, optional): logger of the events. Defaults to the 'src.metrics' logger.
+            level (int, optional): log level of the events. Defaults to logging.INFO.
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def counter(self, name: str, value: float, labels: tuple) -> None:
+        self.logger.log(self.level, json.dumps({'type': 'counter', 'name': name, 'value': value, 'labels': dict(labels)}))
+
+    def observe(self, name: str, value: float, labels: tuple) -> None:
+        self.logger.log(self.level, json.dumps({'type': 'summary', 'name': name, 'value': value, 'labels': dict(labels)}))
+
+
+class _NullTimer():
+    """Timer used while metrics are disabled, it does nothing
+    """
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        pass
+
+
+class _Timer():
+    """Observes the seconds spent inside the with block
+    """
+    def __init__(self, metrics: 'Metrics', name: str, labels: tuple) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        self.metrics.sink.observe(self.name, time.perf_counter() - self.start, self.labels)
+
+
+class Metrics():
+    """Opt-in counters and timers of the hot paths, exported through a pluggable sink
+
+    While disabled every call returns at once, and timer returns a shared timer which does nothing.
+    Loops over many passwords should check the enabled attribute themselves
+    """
+    _NULL_TIMER = _NullTimer()
+
+    def __init__(self, sink: object = None, enabled: bool = False) -> None:
+        """Initializes Metrics
+
+        Args:
+            sink (object, optional): receiver of counter and observe calls. Defaults to MemorySink.
+            enabled (bool, optional): If metrics are recorded. Defaults to False.
+        """
+        self.sink = sink or MemorySink()
+        self.enabled = enabled
+
+    def enable(self, sink: object = None) -> object:
+        """Starts recording
+
+        Args:
+            sink (object, optional): new sink. Defaults to the current sink.
+
+        Returns:
+            object: the sink receiving the metrics
+        """
+        if sink is not None:
+            self.sink = sink
+        self.enabled = True
+        return self.sink
+
+    def disable(self) -> None:
+        """Stops recording, the sink keeps what was already recorded
+        """
+        self.enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increments the counter
+
+        Args:
+            name (str): metric name
+            value (float, optional): increment. Defaults to 1.
+            **labels (str): labels of the counter
+        """
+        if self.enabled:
+            self.sink.counter(name, value, tuple(sorted(labels.items())))
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records the value into the summary
+
+        Args:
+            name (str): metric name
+            value (float): observed value
+            **labels (str): labels of the summary
+        """
+        if self.enabled:
+            self.sink.observe(name, value, tuple(sorted(labels.items())))
+
+    def timer(self, name: str, **labels: str) -> object:
+        """Times the with block, the seconds are recorded into the summary '<name>_seconds'
+
+        Args:
+            name (str): metric name
+            **labels (str): labels of the summary
+
+        Returns:
+            object: context manager
+        """
+        if not self.enabled:
+            return self._NULL_TIMER
+        return _Timer(self, f'{name}_seconds', tuple(sorted(labels.items())))
+
+    def timed(self, name: str, **labels: str) -> object:
+        """Decorator timing every call of the function like timer
+
+        Args:
+            name (str): metric name
+            **labels (str): labels of the summary
+
+        Returns:
+            object: decorator
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.timer(name, **labels):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+# Shared instance used by the instrumented modules
+metrics = Metrics(enabled=Config.METRICS_ENABLED)
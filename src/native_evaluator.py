@@ -0,0 +1,694 @@
+"""zxcvbn compatible password strength estimation without the zxcvbn package
+
+The matchers and the guess estimation follow zxcvbn 4.4, so passwords get the same 0 - 4 score when the
+same frequency lists are used. Dictionary words are found by a memory-mapped Aho-Corasick automaton in one
+pass over the password, instead of looking up every substring in every dictionary held in memory
+"""
+import math
+import re
+from src.adjacency_graphs import (ADJACENCY_GRAPHS, KEYBOARD_AVERAGE_DEGREE, KEYBOARD_STARTING_POSITIONS,
+                                  KEYPAD_AVERAGE_DEGREE, KEYPAD_STARTING_POSITIONS)
+from src.config import Config
+from src.dictionary_automaton import DictionaryAutomaton, get_dictionary_automaton, require_native_dictionary, zxcvbn_dictionary_path
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = 2017
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+MAX_SEQUENCE_DELTA = 5
+# Guesses below the thresholds (plus DELTA) give the scores 0 - 3, more guesses give 4
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+SCORE_DELTA = 5
+
+L33T_TABLE = {
+    'a': ['4', '@'], 'b': ['8'], 'c': ['(', '{', '[', '<'], 'e': ['3'], 'g': ['6', '9'], 'i': ['1', '!', '|'],
+    'l': ['1', '|', '7'], 'o': ['0'], 's': ['$', '5'], 't': ['+', '7'], 'x': ['%'], 'z': ['2'],
+}
+REGEXES = {'recent_year': re.compile(r'19\d\d|200\d|201\d')}
+# Dates without separators are split into day, month and year at these positions, by token length
+DATE_SPLITS = {
+    4: [(1, 2), (2, 3)],
+    5: [(1, 3), (2, 3)],
+    6: [(1, 2), (2, 4), (4, 5)],
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)],
+    8: [(2, 4), (4, 6)],
+}
+DATE_NO_SEPARATOR = re.compile(r'^\d{4,8}$')
+DATE_WITH_SEPARATOR = re.compile(r'^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$')
+SHIFTED = re.compile(r'[~!@#$%^&*()_+QWERTYUIOP{}|ASDFGHJKL:"ZXCVBNM<>?]')
+START_UPPER = re.compile(r'^[A-Z][^A-Z]+$')
+END_UPPER = re.compile(r'^[^A-Z]+[A-Z]$')
+ALL_UPPER = re.compile(r'^[^a-z]+$')
+ALL_LOWER = re.compile(r'^[^A-Z]+$')
+REPEAT_GREEDY = re.compile(r'(.+)\1+')
+REPEAT_LAZY = re.compile(r'(.+?)\1+')
+REPEAT_LAZY_ANCHORED = re.compile(r'^(.+?)\1+$')
+
+
+def n_choose_k(n: int, k: int) -> float:
+    """Binomial coefficient, computed like zxcvbn
+
+    Args:
+        n (int): number of items
+        k (int): number of chosen items
+
+    Returns:
+        float: n over k
+    """
+    if k > n:
+        return 0
+    if k == 0:
+        return 1
+    result = 1
+    for divisor in range(1, k + 1):
+        result *= n
+        result /= divisor
+        n -= 1
+    return result
+
+
+def guesses_to_score(guesses: float) -> int:
+    """Maps the guess estimate to the zxcvbn score
+
+    Args:
+        guesses (float): estimated number of guesses
+
+    Returns:
+        int: score: int(0 - 4)
+    """
+    for score, threshold in enumerate(SCORE_THRESHOLDS):
+        if guesses < threshold + SCORE_DELTA:
+            return score
+    return len(SCORE_THRESHOLDS)
+
+
+class NativeEvaluator():
+    """Estimates the guesses needed to crack a password, zxcvbn compatible
+
+    Matches are dicts with the keys of the zxcvbn matches: pattern, i, j, token and the pattern specific ones
+    """
+    def __init__(self, dictionary_path: str = None) -> None:
+        """Initializes NativeEvaluator
+
+        Args:
+            dictionary_path (str, optional): automaton built by DictionaryAutomaton.build. Defaults to Config.NATIVE_EVALUATION_DICTIONARY_PATH,
+                or the automaton of the installed zxcvbn frequency lists, see zxcvbn_dictionary_path.
+
+        Raises:
+            ValueError: if the dictionary file is invalid, or no dictionary is configured and zxcvbn is not installed
+        """
+        dictionary_path = dictionary_path or Config.NATIVE_EVALUATION_DICTIONARY_PATH
+        if not dictionary_path:
+            # Without dictionaries common passwords would be scored as random characters
+            require_native_dictionary()
+            dictionary_path = zxcvbn_dictionary_path()
+        # Automatons are shared by all evaluators of the process and mapped once
+        self.dictionary: DictionaryAutomaton = get_dictionary_automaton(dictionary_path)
+
+    def evaluate(self, password: str) -> dict:
+        """Estimates the guesses of the password
+
+        Args:
+            password (str): password to be evaluated
+
+        Returns:
+            dict: guesses, guesses_log10, score: int(0 - 4) and the sequence of matches
+        """
+        result = self.most_guessable_match_sequence(password, self.omnimatch(password))
+        result['score'] = guesses_to_score(result['guesses'])
+        return result
+
+    def score(self, password: str) -> int:
+        """Evaluates the password like zxcvbn
+
+        Args:
+            password (str): password to be evaluated
+
+        Returns:
+            int: score: int(0 - 4)
+        """
+        return self.evaluate(password)['score']
+
+    def omnimatch(self, password: str) -> list:
+        """Runs all matchers
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: matches sorted by (i, j)
+        """
+        matches = []
+        for matcher in (self.dictionary_match, self.reverse_dictionary_match, self.l33t_match, self.spatial_match,
+                        self.repeat_match, self.sequence_match, self.regex_match, self.date_match):
+            matches.extend(matcher(password))
+        return sorted(matches, key=lambda match: (match['i'], match['j']))
+
+    def dictionary_match(self, password: str) -> list:
+        """Finds the dictionary words in the password, case insensitive
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: dictionary matches
+        """
+        password_lower = password.lower()
+        return [{'pattern': 'dictionary', 'i': i, 'j': j, 'token': password[i:j + 1], 'matched_word': password_lower[i:j + 1],
+                 'rank': rank, 'dictionary_name': name, 'reversed': False, 'l33t': False}
+                for i, j, name, rank in self.dictionary.matches(password_lower)]
+
+    def reverse_dictionary_match(self, password: str) -> list:
+        """Finds the reversed dictionary words in the password
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: dictionary matches with reversed True
+        """
+        matches = self.dictionary_match(password[::-1])
+        for match in matches:
+            match['token'] = match['token'][::-1]
+            match['reversed'] = True
+            match['i'], match['j'] = len(password) - 1 - match['j'], len(password) - 1 - match['i']
+        return matches
+
+    def l33t_match(self, password: str) -> list:
+        """Finds dictionary words with l33t substitutions, e.g. 'p4ssw0rd'
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: dictionary matches with l33t True and the substitutions in sub
+        """
+        matches = []
+        for substitution in enumerate_l33t_substitutions(relevant_l33t_table(password)):
+            if not substitution:
+                break
+            for match in self.dictionary_match(''.join(substitution.get(char, char) for char in password)):
+                token = password[match['i']:match['j'] + 1]
+                # Only words containing a substituted character are l33t matches
+                if token.lower() == match['matched_word']:
+                    continue
+                match['l33t'] = True
+                match['token'] = token
+                match['sub'] = {l33t: char for l33t, char in substitution.items() if l33t in token}
+                matches.append(match)
+        return [match for match in matches if len(match['token']) > 1]
+
+    def spatial_match(self, password: str) -> list:
+        """Finds runs of adjacent keys on the keyboards and keypads
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: spatial matches of at least 3 keys
+        """
+        matches = []
+        for graph_name, graph in ADJACENCY_GRAPHS.items():
+            matches.extend(self._spatial_match_graph(password, graph, graph_name))
+        return matches
+
+    def _spatial_match_graph(self, password: str, graph: dict, graph_name: str) -> list:
+        matches = []
+        keyboard = graph_name in ('qwerty', 'dvorak')
+        i = 0
+        while i < len(password) - 1:
+            j = i + 1
+            last_direction = None
+            turns = 0
+            shifted_count = 1 if keyboard and SHIFTED.search(password[i]) else 0
+            while True:
+                found = False
+                if j < len(password):
+                    char = password[j]
+                    # Direction is the index of the neighbour, a change of direction is a turn
+                    for direction, neighbour in enumerate(graph.get(password[j - 1]) or []):
+                        if neighbour and char in neighbour:
+                            found = True
+                            if neighbour.index(char) == 1:
+                                shifted_count += 1
+                            if last_direction != direction:
+                                turns += 1
+                                last_direction = direction
+                            break
+                if found:
+                    j += 1
+                    continue
+                if j - i > 2:
+                    matches.append({'pattern': 'spatial', 'i': i, 'j': j - 1, 'token': password[i:j], 'graph': graph_name,
+                                    'turns': turns, 'shifted_count': shifted_count})
+                i = j
+                break
+        return matches
+
+    def repeat_match(self, password: str) -> list:
+        """Finds repeated characters and repeated strings, e.g. 'aaa' or 'abcabc'
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: repeat matches with the guesses of the repeated base token
+        """
+        matches = []
+        last_index = 0
+        while last_index < len(password):
+            greedy = REPEAT_GREEDY.search(password, last_index)
+            if not greedy:
+                break
+            lazy = REPEAT_LAZY.search(password, last_index)
+            if len(greedy.group(0)) > len(lazy.group(0)):
+                # 'aabaab' greedy finds 'aab' repeated, lazy only 'aa'
+                match = greedy
+                base_token = REPEAT_LAZY_ANCHORED.search(match.group(0)).group(1)
+            else:
+                match = lazy
+                base_token = match.group(1)
+            i, j = match.start(), match.end() - 1
+            base_analysis = self.most_guessable_match_sequence(base_token, self.omnimatch(base_token))
+            matches.append({'pattern': 'repeat', 'i': i, 'j': j, 'token': match.group(0), 'base_token': base_token,
+                            'base_guesses': base_analysis['guesses'], 'base_matches': base_analysis['sequence'],
+                            'repeat_count': len(match.group(0)) / len(base_token)})
+            last_index = j + 1
+        return matches
+
+    def sequence_match(self, password: str) -> list:
+        """Finds runs of characters with a constant code point difference up to MAX_SEQUENCE_DELTA, e.g. 'abc' or '7531'
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: sequence matches
+        """
+        if len(password) == 1:
+            return []
+        matches = []
+
+        def add(i: int, j: int, delta: int) -> None:
+            if (j - i > 1 or (delta and abs(delta) == 1)) and 0 < abs(delta) <= MAX_SEQUENCE_DELTA:
+                token = password[i:j + 1]
+                if re.match(r'^[a-z]+$', token):
+                    name, space = 'lower', 26
+                elif re.match(r'^[A-Z]+$', token):
+                    name, space = 'upper', 26
+                elif re.match(r'^\d+$', token):
+                    name, space = 'digits', 10
+                else:
+                    name, space = 'unicode', 26
+                matches.append({'pattern': 'sequence', 'i': i, 'j': j, 'token': token, 'sequence_name': name,
+                                'sequence_space': space, 'ascending': delta > 0})
+
+        i = 0
+        last_delta = None
+        for k in range(1, len(password)):
+            delta = ord(password[k]) - ord(password[k - 1])
+            if last_delta is None:
+                last_delta = delta
+            if delta == last_delta:
+                continue
+            # Consecutive runs share their boundary character
+            add(i, k - 1, last_delta)
+            i = k - 1
+            last_delta = delta
+        add(i, len(password) - 1, last_delta)
+        return matches
+
+    def regex_match(self, password: str) -> list:
+        """Finds recent years
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: regex matches
+        """
+        return [{'pattern': 'regex', 'i': match.start(), 'j': match.end() - 1, 'token': match.group(0), 'regex_name': name}
+                for name, regex in REGEXES.items() for match in regex.finditer(password)]
+
+    def date_match(self, password: str) -> list:
+        """Finds dates with and without separators, e.g. '13.5.1999' or '130599'
+
+        Args:
+            password (str): password to be matched
+
+        Returns:
+            list: date matches which are not part of a longer date match
+        """
+        matches = []
+        # Dates without separators, the candidate nearest to REFERENCE_YEAR is taken
+        for i in range(len(password) - 3):
+            for j in range(i + 3, min(i + 8, len(password))):
+                token = password[i:j + 1]
+                if not DATE_NO_SEPARATOR.match(token):
+                    continue
+                candidates = []
+                for k, l in DATE_SPLITS[len(token)]:
+                    date = map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
+                    if date:
+                        candidates.append(date)
+                if not candidates:
+                    continue
+                best = min(candidates, key=lambda candidate: abs(candidate['year'] - REFERENCE_YEAR))
+                matches.append({'pattern': 'date', 'i': i, 'j': j, 'token': token, 'separator': '', **best})
+
+        # Dates with the same separator between day, month and year
+        for i in range(len(password) - 5):
+            for j in range(i + 5, min(i + 10, len(password))):
+                token = password[i:j + 1]
+                parts = DATE_WITH_SEPARATOR.match(token)
+                if not parts:
+                    continue
+                date = map_ints_to_dmy((int(parts.group(1)), int(parts.group(3)), int(parts.group(4))))
+                if date:
+                    matches.append({'pattern': 'date', 'i': i, 'j': j, 'token': token, 'separator': parts.group(2), **date})
+
+        return [match for match in matches
+                if not any(other != match and other['i'] <= match['i'] and other['j'] >= match['j']
+                           for other in matches)]
+
+    def most_guessable_match_sequence(self, password: str, matches: list, exclude_additive: bool = False) -> dict:
+        """Finds the sequence of non-overlapping matches covering the password with the fewest guesses
+
+        Dynamic programming over the end position and the number of matches l, gaps are filled by bruteforce matches.
+        A sequence of l matches costs l! * product of their guesses + MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1)
+
+        Args:
+            password (str): password to be evaluated
+            matches (list): matches found by omnimatch
+            exclude_additive (bool, optional): If the additive term is left out. Defaults to False.
+
+        Returns:
+            dict: password, guesses, guesses_log10 and the sequence of matches
+        """
+        n = len(password)
+        matches_by_j = [[] for _ in range(n)]
+        for match in matches:
+            matches_by_j[match['j']].append(match)
+        for matches_ending in matches_by_j:
+            matches_ending.sort(key=lambda match: match['i'])
+
+        # Best match, product of guesses and total guesses by end position and sequence length
+        optimal_match = [{} for _ in range(n)]
+        optimal_product = [{} for _ in range(n)]
+        optimal_guesses = [{} for _ in range(n)]
+
+        def update(match: dict, length: int) -> None:
+            k = match['j']
+            product = self.estimate_guesses(match, password)
+            if length > 1:
+                product *= optimal_product[match['i'] - 1][length - 1]
+            guesses = math.factorial(length) * product
+            if not exclude_additive:
+                guesses += MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (length - 1)
+            # A sequence is kept only when no sequence of at most the same length is as good
+            for competing_length, competing_guesses in optimal_guesses[k].items():
+                if competing_length <= length and competing_guesses <= guesses:
+                    return
+            optimal_guesses[k][length] = guesses
+            optimal_match[k][length] = match
+            optimal_product[k][length] = product
+
+        def bruteforce_update(k: int) -> None:
+            update(self._bruteforce_match(password, 0, k), 1)
+            for i in range(1, k + 1):
+                # Two bruteforce matches in a row are never better than one
+                lengths = [length for length, last_match in optimal_match[i - 1].items() if last_match['pattern'] != 'bruteforce']
+                if lengths:
+                    match = self._bruteforce_match(password, i, k)
+                    for length in lengths:
+                        update(match, length + 1)
+
+        for k in range(n):
+            for match in matches_by_j[k]:
+                if match['i'] > 0:
+                    for length in list(optimal_match[match['i'] - 1]):
+                        update(match, length + 1)
+                else:
+                    update(match, 1)
+            bruteforce_update(k)
+
+        sequence = []
+        if n:
+            # Walk back from the best sequence covering the whole password
+            length, guesses = None, math.inf
+            for candidate_length, candidate_guesses in optimal_guesses[n - 1].items():
+                if candidate_guesses < guesses:
+                    length, guesses = candidate_length, candidate_guesses
+            k = n - 1
+            while k >= 0:
+                match = optimal_match[k][length]
+                sequence.insert(0, match)
+                k = match['i'] - 1
+                length -= 1
+        else:
+            guesses = 1
+        return {'password': password, 'guesses': guesses, 'guesses_log10': math.log10(guesses), 'sequence': sequence}
+
+    def _bruteforce_match(self, password: str, i: int, j: int) -> dict:
+        return {'pattern': 'bruteforce', 'i': i, 'j': j, 'token': password[i:j + 1]}
+
+    def estimate_guesses(self, match: dict, password: str) -> float:
+        """Guesses of the match, at least 10 or 50 for matches of one or more characters inside a longer password
+
+        Args:
+            match (dict): match of any pattern, the result is stored in it
+            password (str): the whole password
+
+        Returns:
+            float: estimated guesses
+        """
+        if 'guesses' in match:
+            return match['guesses']
+        min_guesses = 1
+        if len(match['token']) < len(password):
+            min_guesses = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match['token']) == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+        guesses = getattr(self, f'{match["pattern"]}_guesses')(match)
+        match['guesses'] = max(guesses, min_guesses)
+        return match['guesses']
+
+    def bruteforce_guesses(self, match: dict) -> float:
+        """Guesses of a bruteforce match: BRUTEFORCE_CARDINALITY ** length"""
+        guesses = BRUTEFORCE_CARDINALITY ** len(match['token'])
+        min_guesses = (MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match['token']) == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR) + 1
+        return max(guesses, min_guesses)
+
+    def dictionary_guesses(self, match: dict) -> float:
+        """Guesses of a dictionary match: rank times the upper case, l33t and reversal variations"""
+        return match['rank'] * uppercase_variations(match['token']) * l33t_variations(match) * (2 if match['reversed'] else 1)
+
+    def spatial_guesses(self, match: dict) -> float:
+        """Guesses of a spatial match: possible key paths of the length with up to the number of turns, times shift variations"""
+        if match['graph'] in ('qwerty', 'dvorak'):
+            starting_positions, average_degree = KEYBOARD_STARTING_POSITIONS, KEYBOARD_AVERAGE_DEGREE
+        else:
+            starting_positions, average_degree = KEYPAD_STARTING_POSITIONS, KEYPAD_AVERAGE_DEGREE
+        guesses = 0
+        length = len(match['token'])
+        turns = match['turns']
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += n_choose_k(i - 1, j - 1) * starting_positions * average_degree ** j
+        if match['shifted_count']:
+            shifted = match['shifted_count']
+            unshifted = length - shifted
+            if shifted == 0 or unshifted == 0:
+                guesses *= 2
+            else:
+                guesses *= sum(n_choose_k(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+        return guesses
+
+    def repeat_guesses(self, match: dict) -> float:
+        """Guesses of a repeat match: guesses of the base token times the repeat count"""
+        return match['base_guesses'] * match['repeat_count']
+
+    def sequence_guesses(self, match: dict) -> float:
+        """Guesses of a sequence match: guesses of the first character times the length, doubled for descending sequences"""
+        first = match['token'][:1]
+        if first in ('a', 'A', 'z', 'Z', '0', '1', '9'):
+            base_guesses = 4
+        elif first.isdigit():
+            base_guesses = 10
+        else:
+            base_guesses = 26
+        if not match['ascending']:
+            base_guesses *= 2
+        return base_guesses * len(match['token'])
+
+    def regex_guesses(self, match: dict) -> float:
+        """Guesses of a recent year: distance from REFERENCE_YEAR, at least MIN_YEAR_SPACE"""
+        return max(abs(int(match['token']) - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+    def date_guesses(self, match: dict) -> float:
+        """Guesses of a date: years from REFERENCE_YEAR times 365 days, 4 times more with a separator"""
+        guesses = max(abs(match['year'] - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365
+        if match['separator']:
+            guesses *= 4
+        return guesses
+
+
+def relevant_l33t_table(password: str) -> dict:
+    """Reduces L33T_TABLE to the substitutions used in the password
+
+    Args:
+        password (str): password to be matched
+
+    Returns:
+        dict: letter -> l33t characters found in the password
+    """
+    characters = set(password)
+    table = {}
+    for letter, substitutions in L33T_TABLE.items():
+        relevant = [substitution for substitution in substitutions if substitution in characters]
+        if relevant:
+            table[letter] = relevant
+    return table
+
+
+def enumerate_l33t_substitutions(table: dict) -> list:
+    """All ways to map the l33t characters back to letters, a character ambiguous like '1' gets one letter per mapping
+
+    Args:
+        table (dict): letter -> l33t characters, see relevant_l33t_table
+
+    Returns:
+        list: dicts l33t character -> letter
+    """
+    substitutions = [[]]
+    for letter, l33t_characters in table.items():
+        extended = []
+        for l33t in l33t_characters:
+            for substitution in substitutions:
+                mapped = [index for index, (character, _) in enumerate(substitution) if character == l33t]
+                if not mapped:
+                    extended.append(substitution + [(l33t, letter)])
+                else:
+                    # Character already maps to another letter, keep that mapping and add the alternative
+                    alternative = list(substitution)
+                    alternative.pop(mapped[0])
+                    alternative.append((l33t, letter))
+                    extended.append(substitution)
+                    extended.append(alternative)
+        # Drop the mappings which differ only by order
+        seen = set()
+        substitutions = []
+        for substitution in extended:
+            label = tuple(sorted((letter, l33t) for l33t, letter in substitution))
+            if label not in seen:
+                seen.add(label)
+                substitutions.append(substitution)
+    return [dict(substitution) for substitution in substitutions]
+
+
+def uppercase_variations(token: str) -> float:
+    """Capitalizations of the word which are as likely as the one in the token
+
+    Args:
+        token (str): matched token
+
+    Returns:
+        float: 1 for lower case, 2 for the first, last or all letters upper case, else the number of mixed-case variants
+    """
+    if ALL_LOWER.match(token) or token.lower() == token:
+        return 1
+    if START_UPPER.match(token) or END_UPPER.match(token) or ALL_UPPER.match(token):
+        return 2
+    upper = sum(1 for char in token if char.isupper())
+    lower = sum(1 for char in token if char.islower())
+    return sum(n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def l33t_variations(match: dict) -> float:
+    """Variations of the l33t substitutions of a dictionary match
+
+    Args:
+        match (dict): dictionary match
+
+    Returns:
+        float: 1 without substitutions, else the ways to substitute as many characters
+    """
+    if not match['l33t']:
+        return 1
+    variations = 1
+    token = match['token'].lower()
+    for l33t, letter in match['sub'].items():
+        substituted = token.count(l33t)
+        unsubstituted = token.count(letter)
+        if substituted == 0 or unsubstituted == 0:
+            variations *= 2
+        else:
+            variations *= sum(n_choose_k(substituted + unsubstituted, i) for i in range(1, min(substituted, unsubstituted) + 1))
+    return variations
+
+
+def map_ints_to_dmy(ints: tuple) -> dict:
+    """Interprets three numbers as a date, day and month in any order, the year first or last
+
+    Args:
+        ints (tuple): three numbers of the date candidate
+
+    Returns:
+        dict: year, month and day, None if the numbers are no date
+    """
+    if ints[1] > 31 or ints[1] <= 0:
+        return None
+    over_12 = over_31 = under_1 = 0
+    for value in ints:
+        if 99 < value < DATE_MIN_YEAR or value > DATE_MAX_YEAR:
+            return None
+        over_31 += value > 31
+        over_12 += value > 12
+        under_1 += value <= 0
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+
+    splits = ((ints[2], ints[0:2]), (ints[0], ints[1:3]))
+    # A four digit year decides the split
+    for year, rest in splits:
+        if DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+            day_month = map_ints_to_dm(rest)
+            return {'year': year, **day_month} if day_month else None
+    for year, rest in splits:
+        day_month = map_ints_to_dm(rest)
+        if day_month:
+            return {'year': two_to_four_digit_year(year), **day_month}
+    return None
+
+
+def map_ints_to_dm(ints: tuple) -> dict:
+    """Interprets two numbers as day and month in any order
+
+    Args:
+        ints (tuple): two numbers
+
+    Returns:
+        dict: month and day, None if the numbers are no day and month
+    """
+    for day, month in (ints, ints[::-1]):
+        if 1 <= day <= 31 and 1 <= month <= 12:
+            return {'month': month, 'day': day}
+    return None
+
+
+def two_to_four_digit_year(year: int) -> int:
+    """Expands a two digit year, 51 - 99 to the 1900s, else to the 2000s
+
+    Args:
+        year (int): year
+
+    Returns:
+        int: four digit year
+    """
+    if year > 99:
+        return year
+    if year > 50:
+        return year + 1900
+    return year + 2000
@@ -0,0 +1,217 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator
+from src.config import Config
+from src.dictionary_automaton import require_native_dictionary
+from src.generation_policy import get_policy
+from src.password_generator import PasswordGenerator
+from src.random_source import SeededRandomSource, system_random_source
+from src.scoring_engine import ScoringEngine
+from src.seen_set import new_seen_set
+
+
+def _evaluate_chunk(passwords: list, evaluation: str) -> list:
+    """Scores the passwords of one chunk inside a worker process
+
+    Args:
+        passwords (list): passwords to be evaluated
+        evaluation (str): 'internal', 'external' or 'native' evaluation method
+
+    Returns:
+        list: (password, score) tuples
+    """
+    if evaluation == 'internal':
+        return list(zip(passwords, ScoringEngine().score_many(passwords)))
+    # Imported here so workers which only generate do not load the evaluator dependencies
+    from src.password_evaluator import PasswordEvaluator
+    evaluator = PasswordEvaluator()
+    evaluate = evaluator.native_password_evaluation if evaluation == 'native' else evaluator.external_password_evaluation
+    return [(password, int(evaluate(password))) for password in passwords]
+
+
+def _generate_chunk(flags: tuple, length: int, count: int, evaluation: str = None, seed: 'int | str | bytes' = None, chunk_index: int = 0) -> list:
+    """Generates (and optionally scores) one chunk of passwords inside a worker process
+
+    Every worker draws from the operating system CSPRNG, so each process is seeded independently.
+    Seeded runs use the substream of the chunk, so the passwords do not depend on the number of workers
+
+    Args:
+        flags (tuple): character type flags of the policy, see get_policy
+        length (int): password length
+        count (int): number of passwords in the chunk
+        evaluation (str, optional): 'internal', 'external' or 'native' to score the passwords. Defaults to None.
+        seed (int | str | bytes, optional): seed of a reproducible run. Defaults to None.
+        chunk_index (int, optional): index of the chunk in the run. Defaults to 0.
+
+    Returns:
+        list: passwords, or (password, score) tuples when evaluation is given
+    """
+    random_source = SeededRandomSource(seed).substream(chunk_index) if seed is not None else system_random_source
+    passwords = PasswordGenerator(random_source).generate_from_policy(get_policy(*flags), count, length)
+    if evaluation:
+        return _evaluate_chunk(passwords, evaluation)
+    return passwords
+
+
+class ParallelEngine():
+    """Shards generation and evaluation across a pool of worker processes
+    """
+    EVALUATION_METHODS = ('internal', 'external', 'native')
+
+    def __init__(self, workers: int = None, chunk_size: int = None, seed: 'int | str | bytes' = None) -> None:
+        """Initializes ParallelEngine
+
+        Args:
+            workers (int, optional): number of worker processes, 1 runs the tasks in this process. Defaults to Config.PARALLEL_WORKERS or the number of cores.
+            chunk_size (int, optional): passwords handled by one worker task. Defaults to Config.PARALLEL_CHUNK_SIZE.
+            seed (int | str | bytes, optional): seed of reproducible generation, see SeededRandomSource. Defaults to Config.RANDOM_SEED.
+
+        Raises:
+            ValueError: if workers or chunk size is not positive
+        """
+        # Only None selects the defaults, 0 is rejected like any other non positive value
+        self.workers = workers if workers is not None else Config.PARALLEL_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size if chunk_size is not None else Config.PARALLEL_CHUNK_SIZE
+        self.seed = seed if seed is not None else Config.RANDOM_SEED
+        if self.workers < 1 or self.chunk_size < 1:
+            raise ValueError('Workers and chunk size must be positive')
+
+    def generate(self, count: int, length: int = 8, include_digits: bool = False, include_upper: bool = False, include_lower: bool = True, include_special_chars: bool = False, evaluation: str = None, unique: bool = False) -> Iterator[list]:
+        """Generates passwords in worker processes and streams them back chunk by chunk
+
+        Args:
+            count (int): number of passwords to generate
+            length (int, optional): Required password length. Defaults to 8.
+            include_digits (bool, optional): If digits are required in password. Defaults to False.
+            include_upper (bool, optional): If Upper characters are required in password. Defaults to False.
+            include_lower (bool, optional): If Lower characters are required in password. Defaults to True.
+            include_special_chars (bool, optional): If special characters are required in password. Defaults to False.
+            evaluation (str, optional): 'internal', 'external' or 'native' to score every password. Defaults to None.
+            unique (bool, optional): If no password repeats, duplicates are dropped here and replaced by more chunks. Defaults to False.
+
+        Raises:
+            ValueError: when given parameters are invalid or unique passwords are more than the keyspace
+
+        Yields:
+            list: chunk of passwords, or of (password, score) tuples when evaluation is given
+        """
+        # Validate in the caller so errors are not raised from inside the pool
+        policy = get_policy(include_digits, include_upper, include_lower, include_special_chars)
+        if count < 0 or not policy.is_valid_length(length):
+            raise ValueError('Invalid combination of parameters')
+        self._validate_evaluation(evaluation)
+        if unique:
+            return self._generate_unique(policy.flags, length, count, evaluation, new_seen_set(policy, length, count))
+
+        chunk_sizes = [self.chunk_size] * (count // self.chunk_size)
+        if count % self.chunk_size:
+            chunk_sizes.append(count % self.chunk_size)
+        tasks = ((_generate_chunk, policy.flags, length, chunk_size, evaluation, self.seed, index) for index, chunk_size in enumerate(chunk_sizes))
+        return self._run(tasks)
+
+    def _generate_unique(self, flags: tuple, length: int, count: int, evaluation: str, seen: 'BitmapSeenSet | FingerprintSeenSet') -> Iterator[list]:
+        """Streams chunks of passwords not seen before, submitting chunks until count passwords were accepted
+
+        Args:
+            flags (tuple): character type flags of the policy, see get_policy
+            length (int): password length
+            count (int): number of passwords to generate
+            evaluation (str): evaluation method or None
+            seen (BitmapSeenSet | FingerprintSeenSet): empty set of the stream, see new_seen_set
+
+        Yields:
+            list: chunk of passwords, or of (password, score) tuples when evaluation is given
+        """
+        accepted = 0
+
+        def tasks() -> Iterator[tuple]:
+            # At most the chunks in flight are generated in excess, chunks have a fixed size so seeded runs
+            # do not depend on how many were in flight
+            index = 0
+            while accepted < count:
+                yield (_generate_chunk, flags, length, min(self.chunk_size, count), evaluation, self.seed, index)
+                index += 1
+
+        if not count:
+            return
+        for chunk in self._run(tasks()):
+            chunk = [item for item in chunk if seen.add(item[0] if evaluation else item)][:count - accepted]
+            accepted += len(chunk)
+            if chunk:
+                yield chunk
+            if accepted == count:
+                return
+
+    def evaluate(self, passwords: Iterable[str], evaluation: str = 'internal') -> Iterator[list]:
+        """Scores passwords in worker processes and streams the results back chunk by chunk
+
+        Args:
+            passwords (Iterable[str]): passwords to be evaluated, consumed lazily
+            evaluation (str, optional): 'internal', 'external' or 'native' evaluation method. Defaults to 'internal'.
+
+        Raises:
+            ValueError: if the evaluation method is unknown
+
+        Yields:
+            list: chunk of (password, score) tuples in input order
+        """
+        passwords = iter(passwords)
+        return self.evaluate_chunks(iter(lambda: list(islice(passwords, self.chunk_size)), []), evaluation)
+
+    def evaluate_chunks(self, chunks: Iterable[list], evaluation: str = 'internal') -> Iterator[list]:
+        """Scores chunks of passwords in worker processes, one task per given chunk, e.g. to keep track of file offsets
+
+        Args:
+            chunks (Iterable[list]): chunks of passwords, consumed lazily
+            evaluation (str, optional): 'internal', 'external' or 'native' evaluation method. Defaults to 'internal'.
+
+        Raises:
+            ValueError: if the evaluation method is unknown
+
+        Yields:
+            list: (password, score) tuples of every chunk, in input order
+        """
+        self._validate_evaluation(evaluation)
+        tasks = ((_evaluate_chunk, chunk, evaluation) for chunk in chunks)
+        return self._run(tasks)
+
+    def _validate_evaluation(self, evaluation: str) -> None:
+        """Checks the evaluation method
+
+        Args:
+            evaluation (str): evaluation method or None
+
+        Raises:
+            ValueError: if the evaluation method is unknown, or native without dictionaries
+        """
+        if evaluation is not None and evaluation not in self.EVALUATION_METHODS:
+            raise ValueError(f'Unknown evaluation method {evaluation}')
+        if evaluation == 'native':
+            require_native_dictionary()
+
+    def _run(self, tasks: Iterator[tuple]) -> Iterator[list]:
+        """Runs the tasks in the pool, keeping only a bounded number of chunks in flight
+
+        Args:
+            tasks (Iterator[tuple]): (function, *arguments) for every chunk
+
+        Yields:
+            list: results of the tasks in submission order
+        """
+        if self.workers == 1:
+            # A single worker runs the tasks in this process, the chunks and their substreams stay the same
+            for function, *arguments in tasks:
+                yield function(*arguments)
+            return
+        # Two tasks per worker keep every core busy while the caller consumes results
+        max_in_flight = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            in_flight = deque()
+            for task in tasks:
+                in_flight.append(executor.submit(*task))
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
@@ -0,0 +1,159 @@
+import math
+import sys
+from array import array
+from src.config import Config
+from src.random_source import get_random_source, system_random_source
+from src.wordlist import Wordlist, get_wordlist
+
+
+def random_below(bound: int, count: int, random_source: 'SystemRandomSource | SeededRandomSource' = None) -> list:
+    """Draws uniformly distributed integers from the random source
+
+    Little-endian 32-bit samples above the highest multiple of the bound are rejected, so there is no modulo bias
+    and seeded runs draw the same integers on every platform
+
+    Args:
+        bound (int): exclusive upper bound, 1 - 2 ** 32
+        count (int): number of integers
+        random_source (SystemRandomSource | SeededRandomSource, optional): source of the random bytes. Defaults to the operating system CSPRNG.
+
+    Returns:
+        list: integers 0 - bound - 1
+    """
+    random_source = random_source or system_random_source
+    limit = (1 << 32) - (1 << 32) % bound
+    values = []
+    while len(values) < count:
+        missing = count - len(values)
+        # A few extra samples usually cover the rejected ones
+        samples = array('I', random_source.token_bytes((missing + missing // 16 + 1) * 4))
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        values.extend(sample % bound for sample in samples if sample < limit)
+    del values[count:]
+    return values
+
+
+class PassphraseGenerator():
+    """Generates diceware passphrases of words drawn from a memory-mapped wordlist
+    """
+    CAPITALIZATIONS = ('none', 'first', 'random')
+
+    def __init__(self, wordlist_path: str = None, random_source: 'SystemRandomSource | SeededRandomSource' = None) -> None:
+        """Initializes PassphraseGenerator
+
+        Args:
+            wordlist_path (str, optional): compiled or text wordlist, see Wordlist. Defaults to Config.PASSPHRASE_WORDLIST_PATH.
+            random_source (SystemRandomSource | SeededRandomSource, optional): source of the random bytes. Defaults to get_random_source().
+
+        Raises:
+            ValueError: if no wordlist is configured or the wordlist is invalid
+        """
+        wordlist_path = wordlist_path or Config.PASSPHRASE_WORDLIST_PATH
+        if not wordlist_path:
+            raise ValueError('No wordlist configured')
+        self.wordlist: Wordlist = get_wordlist(wordlist_path)
+        self.random_source = random_source or get_random_source()
+        self.MIN_PASSPHRASE_WORDS = Config.MIN_PASSPHRASE_WORDS
+        self.MAX_PASSPHRASE_WORDS = Config.MAX_PASSPHRASE_WORDS
+        self.MAX_PASSPHRASE_DIGITS = Config.MAX_PASSPHRASE_DIGITS
+
+    def validate_parameters(self, words: int, capitalization: str = 'none', digits: int = 0) -> bool:
+        """Validates parameters selected by the user
+
+        Args:
+            words (int): number of words
+            capitalization (str, optional): 'none', 'first' letter of every word or 'random' words. Defaults to 'none'.
+            digits (int, optional): number of injected digits. Defaults to 0.
+
+        Returns:
+            bool: true if the parameter combination is valid
+        """
+        return (self.MIN_PASSPHRASE_WORDS <= words <= self.MAX_PASSPHRASE_WORDS
+                and capitalization in self.CAPITALIZATIONS
+                and 0 <= digits <= self.MAX_PASSPHRASE_DIGITS)
+
+    def entropy(self, words: int = None, capitalization: str = 'none', digits: int = 0) -> float:
+        """Entropy of the random choices, exact for wordlists of lower case words without digits joined by a separator
+
+        Every word adds log2 of the wordlist size, random capitalization one bit per word,
+        the digit block log2(10) per digit and log2 of the number of places it can be inserted at.
+        Passphrases generated with an empty separator can join different words into the same text ('ab' + 'c' and 'a' + 'bc'),
+        for them the entropy is an upper bound
+
+        Args:
+            words (int, optional): number of words. Defaults to Config.PASSPHRASE_WORDS.
+            capitalization (str, optional): 'none', 'first' or 'random'. Defaults to 'none'.
+            digits (int, optional): number of injected digits. Defaults to 0.
+
+        Raises:
+            ValueError: when given parameters are invalid
+
+        Returns:
+            float: entropy in bits
+        """
+        words = words if words is not None else Config.PASSPHRASE_WORDS
+        if not self.validate_parameters(words, capitalization, digits):
+            raise ValueError('Invalid combination of parameters')
+        bits = words * math.log2(len(self.wordlist))
+        if capitalization == 'random':
+            bits += words
+        if digits:
+            bits += digits * math.log2(10) + math.log2(words + 1)
+        return bits
+
+    def generate_passphrase(self, words: int = None, separator: str = None, capitalization: str = 'none', digits: int = 0) -> str:
+        """Generates one passphrase
+
+        Args:
+            words (int, optional): number of words. Defaults to Config.PASSPHRASE_WORDS.
+            separator (str, optional): put between the words. Defaults to Config.PASSPHRASE_SEPARATOR.
+            capitalization (str, optional): 'none', 'first' letter of every word or 'random' words. Defaults to 'none'.
+            digits (int, optional): length of the digit block inserted between the words. Defaults to 0.
+
+        Raises:
+            ValueError: when given parameters are invalid
+
+        Returns:
+            str: Generated passphrase
+        """
+        return self.generate_batch(1, words, separator, capitalization, digits)[0]
+
+    def generate_batch(self, n: int, words: int = None, separator: str = None, capitalization: str = 'none', digits: int = 0) -> list:
+        """Generates many passphrases at once, all random numbers of the batch are drawn together
+
+        Args:
+            n (int): Number of passphrases to generate
+            words (int, optional): number of words. Defaults to Config.PASSPHRASE_WORDS.
+            separator (str, optional): put between the words. Defaults to Config.PASSPHRASE_SEPARATOR.
+            capitalization (str, optional): 'none', 'first' letter of every word or 'random' words. Defaults to 'none'.
+            digits (int, optional): length of the digit block inserted between the words. Defaults to 0.
+
+        Raises:
+            ValueError: when given parameters are invalid
+
+        Returns:
+            list: Generated passphrases
+        """
+        words = words if words is not None else Config.PASSPHRASE_WORDS
+        separator = separator if separator is not None else Config.PASSPHRASE_SEPARATOR
+        if n < 0 or not self.validate_parameters(words, capitalization, digits):
+            raise ValueError('Invalid combination of parameters')
+
+        chosen = self.wordlist.words(random_below(len(self.wordlist), n * words, self.random_source))
+        if capitalization == 'first':
+            chosen = [word[:1].upper() + word[1:] for word in chosen]
+        elif capitalization == 'random':
+            chosen = [word[:1].upper() + word[1:] if upper else word for word, upper in zip(chosen, random_below(2, n * words, self.random_source))]
+
+        if not digits:
+            return [separator.join(chosen[start:start + words]) for start in range(0, n * words, words)]
+        digit_characters = ''.join(map(str, random_below(10, n * digits, self.random_source)))
+        places = random_below(words + 1, n, self.random_source)
+        passphrases = []
+        for index, place in enumerate(places):
+            tokens = chosen[index * words:(index + 1) * words]
+            # Digit block becomes one more token at a random place between the words
+            tokens.insert(place, digit_characters[index * digits:(index + 1) * digits])
+            passphrases.append(separator.join(tokens))
+        return passphrases
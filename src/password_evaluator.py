@@ -1,20 +1,67 @@
 from decimal import ROUND_HALF_DOWN, Decimal
-from zxcvbn import zxcvbn
 from src.config import Config
+from src.breach_cache import BreachRangeCache
+from src.breach_index import BreachIndex
+from src.bloom_filter import BloomFilter
+from src.scoring_engine import ScoringEngine
+from src.external_evaluation_cache import ExternalEvaluationCache, StrengthResult
+from src.metrics import metrics
+from array import array
+from typing import Iterable
 import hashlib
+import logging
 import string
-import requests
+import threading
+import time
 
+logger = logging.getLogger(__name__)
+
+
+def _import_zxcvbn():
+    """Imports zxcvbn on first use, it loads large frequency dictionaries which slow down the start of the application
+
+    Returns:
+        function: zxcvbn evaluation function
+    """
+    from zxcvbn import zxcvbn
+    return zxcvbn
+
+
+def _import_requests():
+    """Imports requests on first use, it is only needed for the breach checks
+
+    Returns:
+        module: requests module
+    """
+    import requests
+    return requests
 
 
 class PasswordEvaluator():
     """Initializes PasswordEvaluator
     """    
-    def __init__(self) -> None:
-        
+    def __init__(self, breach_index_path: str = None, breach_cache: BreachRangeCache = None, bloom_filter_path: str = None) -> None:
+        """Initializes PasswordEvaluator
+
+        Args:
+            breach_index_path (str, optional): offline breach index used instead of the API. Defaults to Config.BREACH_INDEX_PATH.
+            breach_cache (BreachRangeCache, optional): cache of downloaded API ranges. Defaults to a cache configured by Config.
+            bloom_filter_path (str, optional): Bloom filter which skips lookups of surely not breached passwords. Defaults to Config.BREACH_BLOOM_FILTER_PATH.
+        """
         self.PASSWORD_LENGTH_RATING = Config.PASSWORD_LENGTH_RATING
         self.SEQUENCE_LENGTH = Config.SEQUENCE_LENGTH
         self.PASSWORD_BREACH_CHECK_API = Config.PASSWORD_BREACH_CHECK_API        
+        breach_index_path = breach_index_path or Config.BREACH_INDEX_PATH
+        self.breach_index = BreachIndex(breach_index_path) if breach_index_path else None
+        self.breach_cache = breach_cache or BreachRangeCache()
+        bloom_filter_path = bloom_filter_path or Config.BREACH_BLOOM_FILTER_PATH
+        self.bloom_filter = BloomFilter(bloom_filter_path) if bloom_filter_path else None
+        self.scoring_engine = ScoringEngine()
+        self.sequence_analyzer = self.scoring_engine.sequence_analyzer
+        self.external_cache = ExternalEvaluationCache()
+        self._native_evaluator = None
+        self._session = None
+        self._session_lock = threading.Lock()
         
     def external_password_evaluation(self, password: str) -> int:
         """Evaluates password by the external library
@@ -26,44 +73,121 @@ class PasswordEvaluator():
             ValueError: if password is empty
 
         Returns:
-            int: rounded score: int(1 - 4)
+            int: score: int(0 - 4)
+        """
+        return self.external_password_result(password).score
+
+    def external_password_result(self, password: str) -> StrengthResult:
+        """Evaluates password by the external library, reusing cached results of already evaluated passwords
+
+        The whole password is evaluated unless Config.EXTERNAL_EVALUATION_MAX_LENGTH is set. Longer passwords
+        are then scored as the weaker of their first and last max length characters, since characters past
+        a cut can make the whole password match a weaker pattern. This is an approximation, not a bound
+
+        Args:
+            password (str): password to be evaluated
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            StrengthResult: score int (0 - 4) and if the password was truncated
         """
         if not password:
             raise ValueError('Empty password')        
-        # Get the external library result
-        result = zxcvbn(password=password)
-        # Take only the score from result
-        score = float(result['score'])
-        # Return rounded score
-        return Decimal(score).to_integral_value(rounding=ROUND_HALF_DOWN)      
+        result = self.external_cache.get(password)
+        if result is not None:
+            metrics.increment('external_cache', result='hit')
+            return result
+        metrics.increment('external_cache', result='miss')
+        max_length = Config.EXTERNAL_EVALUATION_MAX_LENGTH
+        truncated = max_length is not None and len(password) > max_length
+        windows = (password[:max_length], password[-max_length:]) if truncated else (password,)
+        zxcvbn = _import_zxcvbn()
+        # Get the external library result, the matching cost grows sharply with the length
+        with metrics.timer('zxcvbn'):
+            # Keep only the score from result
+            score = min(int(zxcvbn(password=window)['score']) for window in windows)
+        result = StrengthResult(score, truncated)
+        self.external_cache.put(password, result)
+        return result
     
-    def internal_password_evaluation(self, password: str) -> int:
+    def native_password_evaluation(self, password: str) -> int:
+        """Evaluates password by the native zxcvbn compatible algorithm, see src.native_evaluator
+
+        Passwords longer than Config.NATIVE_EVALUATION_MAX_LENGTH are scored as the weaker of their first and last
+        max length characters, like the capped external evaluation
+
+        Args:
+            password (str): password to be evaluated
+
+        Raises:
+            ValueError: if password is empty, the configured dictionaries are invalid or there are none, see native_dictionary_available
+
+        Returns:
+            int: score: int(0 - 4)
+        """
+        if not password:
+            raise ValueError('Empty password')
+        # Graphs and dictionaries are loaded on first use only
+        if self._native_evaluator is None:
+            from src.native_evaluator import NativeEvaluator
+            self._native_evaluator = NativeEvaluator()
+        max_length = Config.NATIVE_EVALUATION_MAX_LENGTH
+        windows = (password[:max_length], password[-max_length:]) if max_length is not None and len(password) > max_length else (password,)
+        with metrics.timer('native_evaluation'):
+            return min(map(self._native_evaluator.score, windows))
+
+    @metrics.timed('internal_evaluation')
+    def internal_password_evaluation(self, password: str, verbose: bool = False) -> int:
         """Evaluates the password by the internal algorithm
 
         Args:
             password (str): password to be evaluated
+            verbose (bool, optional): If the criteria scores are logged at debug level. Defaults to False.
 
         Returns:
             int: rounded score: int (1 - 4)
         """        
-        criteria_scores = {}
-        # Calculate password scores for multiple criteria
-        criteria_scores['length'] = self.evaluate_length(len(password)) * 6 # Length is more important
-        criteria_scores['repetition'] = self.evaluate_repetition(password)
-        criteria_scores['variety'] = self.evaluate_variety(password) * 2
-        criteria_scores['sequence'] = self.evaluate_sequence(password)
+        # All criteria are calculated in one pass, scores are the same as of the evaluate_* methods
+        criteria_scores = self.scoring_engine.criteria_scores(password)
+        if metrics.enabled:
+            for criterion, criterion_score in criteria_scores.items():
+                metrics.observe('internal_evaluation_criterion_score', criterion_score, criterion=criterion)
         
-        print(criteria_scores)
         # Calculate average score
         score = sum(criteria_scores.values()) / (float(len(criteria_scores)) + 6) # + 6 because of added weights
-        print(f'Score {score}' )
+        if verbose:
+            logger.debug('Criteria scores %s, score %s', criteria_scores, score)
         if score < 2:
             return 1
         # Return rounded average score
         return Decimal(score).to_integral_value(rounding=ROUND_HALF_DOWN)    
+
+    def internal_password_evaluation_batch(self, passwords: Iterable[str], workers: int = 1) -> array:
+        """Evaluates many passwords by the internal algorithm, without printing and Decimal rounding per password
+
+        Args:
+            passwords (Iterable[str]): passwords to be evaluated
+            workers (int, optional): worker processes to shard the passwords across. Defaults to 1.
+
+        Raises:
+            ValueError: if any password is empty
+
+        Returns:
+            array: unsigned byte array of rounded scores (1 - 4), in the order of passwords
+        """
+        if workers == 1:
+            return self.scoring_engine.score_many(passwords)
+        # Imported on first use, the process pool machinery is not needed for single passwords
+        from src.parallel_engine import ParallelEngine
+        scores = array('B')
+        for chunk in ParallelEngine(workers=workers).evaluate(passwords, 'internal'):
+            scores.extend(score for _, score in chunk)
+        return scores
     
     def is_breached(self, password: str) -> bool:
-        """check if the password is known to be breached on Have I been pwned site
+        """check if the password is known to be breached on Have I been pwned site, or in the offline breach index if configured
 
         Args:
             password (str): password to check
@@ -81,21 +205,129 @@ class PasswordEvaluator():
         password_encoded = password.encode('utf-8')
         # Encrypt password for the comparison of hash prefix
         encryption = hashlib.sha1(password_encoded)
+        # Bloom filter rules out most fresh passwords with a few bit probes
+        if self.bloom_filter is not None and encryption.digest() not in self.bloom_filter:
+            metrics.increment('breach_checks', source='bloom_filter')
+            return False
+        # Offline index answers without any network I/O
+        if self.breach_index is not None:
+            metrics.increment('breach_checks', source='index')
+            return encryption.digest() in self.breach_index
+        metrics.increment('breach_checks', source='api')
         hash = encryption.hexdigest().upper()
         hash_prefix = hash[0:5]
-        # request hashes with the same hash prefix from Have I been pwned? site
-        try:
-            response = requests.get(self.PASSWORD_BREACH_CHECK_API + hash_prefix)
-            if response.status_code == 200:
-                # Iterate through the returned hashes and compare with our hash
-                for line in response.iter_lines(decode_unicode=True):
-                    # If our hash is equal to returned hash, password is breached
-                    if (hash_prefix + line.split(':')[0]) == hash:
-                        return True              
-                else:
-                    return False
-        except ConnectionError:
+        hash_suffix = hash[5:]
+        # Hashes with the same prefix come from the range cache or from Have I been pwned? site
+        return hash_suffix in self.get_breach_range(hash_prefix)
+
+    def is_breached_many(self, passwords: Iterable[str], concurrency: int = None) -> list:
+        """check many passwords at once, downloading every hash prefix range only once and concurrently
+
+        Args:
+            passwords (Iterable[str]): passwords to check
+            concurrency (int, optional): ranges downloaded at the same time. Defaults to Config.BREACH_CHECK_CONCURRENCY.
+
+        Raises:
+            ValueError: if any password is empty
+            ConnectionError: if a range cannot be downloaded even after retries
+
+        Returns:
+            list: True for every breached password, in the order of passwords
+        """
+        passwords = list(passwords)
+        if not all(passwords):
+            raise ValueError('Empty password')
+        digests = [hashlib.sha1(password.encode('utf-8')).digest() for password in passwords]
+        # Passwords ruled out by the Bloom filter need no lookup at all, None marks the ones still to check
+        if self.bloom_filter is not None:
+            results = [None if digest in self.bloom_filter else False for digest in digests]
+        else:
+            results = [None] * len(digests)
+        if self.breach_index is not None:
+            return [digest in self.breach_index if result is None else result for digest, result in zip(digests, results)]
+
+        hashes = [digest.hex().upper() if result is None else None for digest, result in zip(digests, results)]
+        # Group by prefix so passwords sharing a range cost one download
+        prefixes = sorted(set(hash[0:5] for hash in hashes if hash))
+        concurrency = concurrency or Config.BREACH_CHECK_CONCURRENCY
+        # Imported on first use like the process pool in internal_password_evaluation_batch
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(prefixes)))) as executor:
+            ranges = dict(zip(prefixes, executor.map(self.get_breach_range, prefixes)))
+        return [hash[5:] in ranges[hash[0:5]] if hash else result for hash, result in zip(hashes, results)]
+
+    def get_breach_range(self, hash_prefix: str) -> frozenset:
+        """Returns hash suffixes of the range, downloading it only if it is not cached or expired
+
+        Args:
+            hash_prefix (str): 5 upper case hex characters of the SHA-1 hash
+
+        Raises:
+            ConnectionError: if the response code is not 200 and the range cannot be downloaded
+
+        Returns:
+            frozenset: upper case hash suffixes known to be breached
+        """
+        cached = self.breach_cache.get_stale(hash_prefix)
+        if cached is not None and not self.breach_cache.is_expired(cached):
+            metrics.increment('breach_cache', result='hit')
+            return cached.suffixes
+        metrics.increment('breach_cache', result='miss' if cached is None else 'expired')
+        # Expired range is revalidated by its ETag, so unchanged ranges are not downloaded again
+        headers = {'If-None-Match': cached.etag} if cached is not None and cached.etag else {}
+        response = self.download_breach_range(hash_prefix, headers)
+        if response.status_code == 304 and cached is not None:
+            metrics.increment('breach_cache', result='revalidated')
+            return self.breach_cache.refresh(hash_prefix, cached).suffixes
+        if response.status_code != 200:
             raise ConnectionError('Connection Error')
+        # Lines are 'SUFFIX:COUNT', only the suffixes are kept
+        suffixes = frozenset(line.split(':', 1)[0] for line in response.text.splitlines() if line)
+        return self.breach_cache.put(hash_prefix, suffixes, response.headers.get('ETag')).suffixes
+
+    def download_breach_range(self, hash_prefix: str, headers: dict) -> 'requests.Response':
+        """Requests the range over the pooled keep-alive session, retrying failures with exponential backoff
+
+        Args:
+            hash_prefix (str): 5 upper case hex characters of the SHA-1 hash
+            headers (dict): request headers
+
+        Raises:
+            ConnectionError: if all attempts fail
+
+        Returns:
+            requests.Response: response with a status code other than 429 or 5xx
+        """
+        requests = _import_requests()
+        for attempt in range(Config.BREACH_CHECK_RETRIES + 1):
+            if attempt:
+                time.sleep(Config.BREACH_CHECK_BACKOFF * 2 ** (attempt - 1))
+            try:
+                with metrics.timer('breach_request'):
+                    response = self.get_session().get(self.PASSWORD_BREACH_CHECK_API + hash_prefix, headers=headers, timeout=Config.BREACH_CHECK_TIMEOUT)
+            except (requests.RequestException, ConnectionError):
+                metrics.increment('breach_request_failures', reason='connection')
+                continue
+            # Rate limited and server errors are worth another attempt
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            metrics.increment('breach_request_failures', reason=str(response.status_code))
+        raise ConnectionError('Connection Error')
+
+    def get_session(self) -> 'requests.Session':
+        """Returns the session shared by all breach checks, its connections are kept alive and pooled
+
+        Returns:
+            requests.Session: shared session
+        """
+        with self._session_lock:
+            if self._session is None:
+                requests = _import_requests()
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=Config.BREACH_CHECK_CONCURRENCY)
+                self._session.mount('https://', adapter)
+                self._session.mount('http://', adapter)
+            return self._session
 
     def evaluate_length(self, password_length: int) -> int:
         """Evaluates password length based on the configuration of evaluator
@@ -179,6 +411,8 @@ class PasswordEvaluator():
     def evaluate_sequence(self, password: string) -> int:
         """Evaluates the password by the criteria of containing character sequences, if there are long sequences of characters, the score is lower
 
+        Ascending and descending runs of characters and of keyboard keys are found by the sequence analyzer
+
         Args:
             password (string): password to be evaluated
 
@@ -186,54 +420,9 @@ class PasswordEvaluator():
             int: score: int (1 - 4)
         """        
         pwd_length = len(password)
-        
-        # Store the number of detected sequences
-        sequences = 0
         # Length of the longest sequence detected
-        longest_sequence = 0
-
-        # Iterate through password and detect sequences
-        # Do this twice for original password and for reversed password (to check reverse sequence e.g. 98765)
-        for _ in range(2):
-            # Previous character to detect the sequence for current character
-            previous_character = ''
-            # Currently detected sequence
-            sequence = ''
-            # For second iteration, check the sequence from reversed password
-            if _ == 1:
-                password = password[::-1]
-            index = 2
-            for char in password:
-                if not previous_character:
-                    previous_character = char
-                    continue
-                # Compare ascii values of previous and current character, if the difference is 1, there is a sequence
-                if ord(char) - 1 == ord(previous_character):
-                    # Add also previous character if sequence is starting
-                    if not sequence:
-                        sequence = previous_character
-                    # Add character to the current detected sequence
-                    sequence += char
-                    # Reassign previous character for the next iteration
-                    previous_character = char
-                    # Based on configuration, if the current length of the detected sequence characters equals to the configured length of sequence, raise the number of sequences
-                    if len(sequence) == self.SEQUENCE_LENGTH:
-                        sequences += 1
-                    # If we are at the end of string, we have to save the sequence length
-                    if index == len(password):
-                        if len(sequence) > longest_sequence:
-                            longest_sequence = len(sequence)
-                    index += 1
-                # Sequence finished
-                else:
-                    previous_character = char
-                    # Store the length of the detected sequence if its the new longest
-                    if len(sequence) > longest_sequence:
-                        longest_sequence = len(sequence)
-                    # Reset the sequence of characters
-                    sequence = ''
-                    index += 1
-           
+        longest_sequence = self.sequence_analyzer.longest(password)
+
         if longest_sequence == pwd_length:
             return 1
         elif longest_sequence >= pwd_length / 2:
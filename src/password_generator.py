@@ -1,14 +1,22 @@
 
 
-import random
-import string
+from typing import Iterator
 from src.config import Config
+from src.entropy import minimum_length, policy_for_classes
+from src.generation_policy import GenerationPolicy, get_policy
+from src.metrics import metrics
+from src.random_source import get_random_source
+from src.seen_set import new_seen_set
 
 
 class PasswordGenerator():
-    def __init__(self) -> None:   
+    def __init__(self, random_source: 'SystemRandomSource | SeededRandomSource' = None) -> None:   
         """Initializes Password generator
+
+        Args:
+            random_source (SystemRandomSource | SeededRandomSource, optional): source of the random bytes. Defaults to get_random_source().
         """           
+        self.random_source = random_source or get_random_source()
         self.MIN_PASSWORD_LENGTH = Config.MIN_PASSWORD_LENGTH
         self.MAX_PASSWORD_LENGTH = Config.MAX_PASSWORD_LENGTH
         
@@ -28,6 +36,7 @@ class PasswordGenerator():
         else:
             return False    
     
+    @metrics.timed('generation', method='single')
     def generate_password(self, length: int = 8, include_digits: bool = False, include_upper: bool = False, include_lower: bool = True, include_special_chars: bool = False) -> str:
         """Generates the password based on user selected parameters
 
@@ -44,43 +53,179 @@ class PasswordGenerator():
         Returns:
             str: Generated password which complies to parameters given by user
         """ 
-        # Validate parameters given by user      
-        if not self.validate_parameters(length, include_digits, include_lower, include_special_chars, include_upper):
+        # Compiled policy is cached, so validation and charset building happen once per flag combination
+        policy = get_policy(include_digits, include_upper, include_lower, include_special_chars)
+        if not policy.is_valid_length(length):
             raise ValueError('Invalid combination of parameters')
+
+        # Rejection sampling draws uniformly from all valid passwords, so the entropy is exactly entropy_bits
+        password = self._sample(policy, 1, length)[0]
+
+        metrics.increment('passwords_generated')
+        return password
+
+    def generate_for_entropy(self, bits: float, classes: tuple = ('lower',)) -> str:
+        """Generates the shortest password of the character classes whose exact entropy reaches the target
+
+        Args:
+            bits (float): wanted entropy in bits
+            classes (tuple, optional): required classes, names from 'digits', 'upper', 'lower' and 'special'. Defaults to ('lower',).
+
+        Raises:
+            ValueError: if a class is unknown, no class is given or the target needs more than the maximum length
+
+        Returns:
+            str: Generated password
+        """
+        policy = policy_for_classes(classes)
+        return self.generate_from_policy(policy, 1, minimum_length(policy, bits))[0]
+
+    def generate_batch(self, n: int, length: int = 8, include_digits: bool = False, include_upper: bool = False, include_lower: bool = True, include_special_chars: bool = False, unique: bool = False) -> list:
+        """Generates many passwords at once from large blocks of random bytes
+
+        Args:
+            n (int): Number of passwords to generate
+            length (int, optional): Required password length. Defaults to 8.
+            include_digits (bool, optional): If digits are required in password. Defaults to False.
+            include_upper (bool, optional): If Upper characters are required in password. Defaults to False.
+            include_lower (bool, optional): If Lower characters are required in password. Defaults to True.
+            include_special_chars (bool, optional): If special characters are required in password. Defaults to False.
+            unique (bool, optional): If no password repeats within the batch. Defaults to False.
+
+        Raises:
+            ValueError: Returns ValueError when given parameters are invalid or a unique batch is larger than the keyspace
+
+        Returns:
+            list: Generated passwords, each one contains at least one character of every required type
+        """
+        policy = get_policy(include_digits, include_upper, include_lower, include_special_chars)
+        return self.generate_from_policy(policy, n, length, unique)
+
+    @metrics.timed('generation', method='batch')
+    def generate_from_policy(self, policy: GenerationPolicy, n: int, length: int = 8, unique: bool = False) -> list:
+        """Generates many passwords at once for an already compiled policy
+
+        Args:
+            policy (GenerationPolicy): compiled policy, see get_policy
+            n (int): Number of passwords to generate
+            length (int, optional): Required password length. Defaults to 8.
+            unique (bool, optional): If no password repeats within the batch. Defaults to False.
+
+        Raises:
+            ValueError: Returns ValueError when given parameters are invalid or a unique batch is larger than the keyspace
+
+        Returns:
+            list: Generated passwords, each one contains at least one character of every required type
+        """
+        if n < 0 or not policy.is_valid_length(length):
+            raise ValueError('Invalid combination of parameters')
+        if unique:
+            passwords = self._sample_unique(policy, n, length, new_seen_set(policy, length, n))
         else:
-            # List of all characters to generate from
-            characters_to_use = []
-            # List of the randomly selected characters which must be included
-            required_characters = []
-
-            # Add values to the lists
-            if include_digits:
-                digits = string.digits
-                characters_to_use += digits
-                required_characters.append(random.choice(digits))
-            if include_upper:
-                upper_chars = string.ascii_uppercase
-                characters_to_use += upper_chars
-                required_characters.append(random.choice(upper_chars))
-            if include_lower:
-                lower_chars = string.ascii_lowercase
-                characters_to_use += lower_chars
-                required_characters.append(random.choice(lower_chars))
-            if include_special_chars:
-                special_chars = string.punctuation
-                characters_to_use += special_chars
-                required_characters.append(random.choice(special_chars))
-
-            # Select random characters from the charset
-            random_characters = [random.choice(characters_to_use) for _ in range(int(length) - len(required_characters))]
-            
-            # Build final password characters
-            password_characters = random_characters + required_characters
-            
-            # Randomly change the order of pwd characters
-            random.shuffle(password_characters)
-            
-            # Make the password string from the list
-            password = ''.join(password_characters)
-
-            return password
\ No newline at end of file
+            passwords = self._sample(policy, n, length)
+        metrics.increment('passwords_generated', n)
+        return passwords
+
+    def _sample_unique(self, policy: GenerationPolicy, n: int, length: int, seen: 'BitmapSeenSet | FingerprintSeenSet') -> list:
+        """Draws passwords until n of them were not seen before
+
+        Args:
+            policy (GenerationPolicy): compiled policy
+            n (int): Number of passwords to generate
+            length (int): Required password length
+            seen (BitmapSeenSet | FingerprintSeenSet): passwords already generated, see new_seen_set
+
+        Returns:
+            list: Generated passwords, all of them added to seen
+        """
+        passwords = []
+        while len(passwords) < n:
+            candidates = self._sample(policy, n - len(passwords), length)
+            accepted = [password for password in candidates if seen.add(password)]
+            passwords.extend(accepted)
+            if len(accepted) < len(candidates):
+                metrics.increment('duplicates_rejected', len(candidates) - len(accepted))
+        return passwords
+
+    def _sample(self, policy: GenerationPolicy, n: int, length: int) -> list:
+        """Draws candidates from blocks of random bytes until n of them contain every required character type
+
+        Args:
+            policy (GenerationPolicy): compiled policy
+            n (int): Number of passwords to generate
+            length (int): Required password length
+
+        Returns:
+            list: Generated passwords
+        """
+        passwords = []
+        # Share of candidates with every required type, refined after each block
+        acceptance = 1.0
+        while len(passwords) < n:
+            missing = n - len(passwords)
+            # Pull one large block and map it to charset characters in C, dropping rejected bytes
+            block_size = int(missing * length * 256 / policy.byte_limit / acceptance) + length
+            characters = self.random_source.token_bytes(block_size).translate(policy.byte_to_char, policy.rejected_bytes)
+            candidates = 0
+            accepted = 0
+            for start in range(0, len(characters) - length + 1, length):
+                candidate = characters[start:start + length]
+                candidates += 1
+                # Reject candidates missing a required character type
+                if policy.has_required_types(candidate):
+                    passwords.append(candidate.decode('ascii'))
+                    accepted += 1
+                    if accepted == missing:
+                        break
+            if candidates:
+                acceptance = max(accepted / candidates, 0.01)
+        return passwords
+
+    def iter_passwords(self, policy: GenerationPolicy, count: int = None, length: int = 8, unique: bool = False) -> Iterator[str]:
+        """Lazily yields passwords, generating them block by block so memory stays constant
+
+        Args:
+            policy (GenerationPolicy): compiled policy, see get_policy
+            count (int, optional): Number of passwords to yield, endless when None. Defaults to None.
+            length (int, optional): Required password length. Defaults to 8.
+            unique (bool, optional): If no password repeats within the stream, needs a count. Defaults to False.
+
+        Raises:
+            ValueError: Returns ValueError when given parameters are invalid or a unique stream is endless or larger than the keyspace
+
+        Returns:
+            Iterator[str]: Generated passwords
+        """
+        # Validate eagerly, not on the first next() call
+        if (count is not None and count < 0) or not policy.is_valid_length(length):
+            raise ValueError('Invalid combination of parameters')
+        seen = None
+        if unique:
+            if count is None:
+                raise ValueError('Unique passwords need a count')
+            # Memory of the whole stream is allocated up front
+            seen = new_seen_set(policy, length, count)
+        return self._iter_passwords(policy, count, length, seen)
+
+    def _iter_passwords(self, policy: GenerationPolicy, count: int, length: int, seen: 'BitmapSeenSet | FingerprintSeenSet' = None) -> Iterator[str]:
+        """Generator behind iter_passwords
+
+        Args:
+            policy (GenerationPolicy): compiled policy
+            count (int): Number of passwords to yield, endless when None
+            length (int): Required password length
+            seen (BitmapSeenSet | FingerprintSeenSet, optional): passwords of the unique stream, None if passwords may repeat. Defaults to None.
+
+        Yields:
+            str: Generated password
+        """
+        remaining = count
+        while remaining is None or remaining > 0:
+            block_size = Config.STREAM_BLOCK_SIZE if remaining is None else min(Config.STREAM_BLOCK_SIZE, remaining)
+            if seen is None:
+                yield from self.generate_from_policy(policy, block_size, length)
+            else:
+                yield from self._sample_unique(policy, block_size, length, seen)
+                metrics.increment('passwords_generated', block_size)
+            if remaining is not None:
+                remaining -= block_size
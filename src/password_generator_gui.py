@@ -5,6 +5,9 @@ from src.config import Config
 from src.password_generator import PasswordGenerator
 from src.password_evaluator import PasswordEvaluator
 from src.file_handler import FileHandler
+from src.background_evaluator import BackgroundEvaluator, EvaluationResult
+from src.dictionary_automaton import native_dictionary_available
+from src.incremental_evaluator import IncrementalEvaluator
 class PasswordGeneratorGUI():
     def __init__(self, root: Tk, title: str) -> None:
         self.root = root
@@ -13,6 +16,13 @@ class PasswordGeneratorGUI():
         self.password_generator = PasswordGenerator()
         self.password_evaluator = PasswordEvaluator()
         self.file_handler = FileHandler()
+        self.background_evaluator = BackgroundEvaluator(self.password_evaluator)
+        # Internal criteria of the typed password, updated on every keystroke
+        self.incremental_evaluator = IncrementalEvaluator(self.password_evaluator.scoring_engine)
+        # Scheduled evaluation waiting for typing to pause
+        self.pending_evaluation = None
+        # Evaluation threads are stopped when the window closes
+        self.root.protocol('WM_DELETE_WINDOW', self.close)
 
         # Main frame
         self.mainframe = ttk.Frame(root, padding = '3 3 12 12')
@@ -84,11 +94,18 @@ class PasswordGeneratorGUI():
         self.radio_internal_pwd_evaluation.grid(column=1, row=8, sticky=(W))
         self.radio_external_pwd_evaluation = ttk.Radiobutton(self.mainframe, text='Third party', variable=self.pwd_evaluation_method, value='external')
         self.radio_external_pwd_evaluation.grid(column=1, row=8, sticky=(E))
+        self.radio_native_pwd_evaluation = ttk.Radiobutton(self.mainframe, text='Native', variable=self.pwd_evaluation_method, value='native')
+        self.radio_native_pwd_evaluation.grid(column=1, row=8)
+        # Without dictionaries native scores of common passwords would be far too high
+        if not native_dictionary_available():
+            self.radio_native_pwd_evaluation.state(['disabled'])
         
         # Bind enter to generate button
         self.root.bind('<Return>', lambda event: self.btn_generate.invoke())
         # Default focus on length input
         self.length_entry.focus()
+        # Start collecting evaluation results from the worker threads
+        self.poll_evaluation()
         
     def validate_length(self, length: str) -> bool:
         """Validates the length input and shows validation message to user
@@ -131,41 +148,82 @@ class PasswordGeneratorGUI():
             return True
     
     def evaluate_password(self, *args: tuple) -> bool:
-        """Displays the password evaluation to the user
+        """Schedules the password evaluation, it starts once typing pauses for Config.EVALUATION_DEBOUNCE_MS
+
+        The internal evaluation without breach check is incremental and shown right away
 
         Returns:
             bool: Always returns True to keep validating
         """  
-        password = self.generated_password.get()      
+        # Restart the debounce time on every change
+        if self.pending_evaluation is not None:
+            self.root.after_cancel(self.pending_evaluation)
+            self.pending_evaluation = None
+        password = self.generated_password.get()
+        self.incremental_evaluator.update(password)
         if not password:
             return True
+        if self.pwd_evaluation_method.get() == 'internal' and not self.check_breached.get():
+            # Results of older background requests must not replace this one
+            self.background_evaluator.cancel()
+            self.show_evaluation(EvaluationResult(None, password, None, self.incremental_evaluator.score(), False))
+            return True
+        self.pending_evaluation = self.root.after(Config.EVALUATION_DEBOUNCE_MS, self.start_evaluation)
+        return True
+
+    def start_evaluation(self) -> None:
+        """Sends the password to the background evaluator, the breach check and evaluation run off the Tk main loop
+        """
+        self.pending_evaluation = None
+        password = self.generated_password.get()
+        if not password:
+            return
+        self.background_evaluator.submit(password, self.pwd_evaluation_method.get(), self.check_breached.get())
+
+    def poll_evaluation(self) -> None:
+        """Shows finished evaluations, keeps polling the background evaluator from the Tk main loop
+        """
+        for result in self.background_evaluator.completed():
+            self.show_evaluation(result)
+        self.root.after(Config.EVALUATION_POLL_MS, self.poll_evaluation)
+
+    def show_evaluation(self, result: EvaluationResult) -> None:
+        """Displays the password evaluation to the user
+
+        Args:
+            result (EvaluationResult): finished evaluation of the latest password
+        """
+        if result.error:
+            self.lbl_password_evaluation.configure(text=f'Evaluation failed: {result.error}', foreground='red')
+            return
         # Check if password is breached if needed    
-        if self.check_breached.get():
-            try:
-                if self.password_evaluator.is_breached(password):
-                    self.breach_info.configure(text='Password is breached, do not use', foreground='red')
-                    return True
-            except ConnectionError:
-                self.breach_info.configure(text='Could not connect to Have I been pwned api', foreground='orange')
-                return True
-        
-        # Determine evaluation method
-        if self.pwd_evaluation_method.get() == 'internal':
-            result = self.password_evaluator.internal_password_evaluation(password)
-        else:
-            result = self.password_evaluator.external_password_evaluation(password)
+        if result.connection_error:
+            self.breach_info.configure(text='Could not connect to Have I been pwned api', foreground='orange')
+            return
+        if result.breached:
+            self.breach_info.configure(text='Password is breached, do not use', foreground='red')
+            return
                     
         # Display evaluation text on GUI    
-        if result == 4:
+        if result.score == 4:
             self.lbl_password_evaluation.configure(text='Strong', foreground='green')
-        elif result == 3:
+        elif result.score == 3:
             self.lbl_password_evaluation.configure(text='Moderate', foreground='black')
-        elif result == 2:
+        elif result.score == 2:
             self.lbl_password_evaluation.configure(text='Weak', foreground='orange')
-        elif result == 1:
+        elif result.score == 1:
             self.lbl_password_evaluation.configure(text='Not a password', foreground='red')
-        return True
         
+    def close(self) -> None:
+        """Cancels the scheduled and waiting evaluations, stops the background evaluator and closes the window
+        """
+        if self.pending_evaluation is not None:
+            self.root.after_cancel(self.pending_evaluation)
+            self.pending_evaluation = None
+        self.background_evaluator.cancel()
+        self.background_evaluator.shutdown()
+        self.root.destroy()
+
     def add_style(self) -> None:
         """adds general styling to Tkinter GUI
         """        
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import threading
+from src.config import Config
+
+
+class SystemRandomSource():
+    """Operating system CSPRNG bytes, read in large blocks so small requests do not make a syscall each
+
+    The buffer is dropped in a forked child, so processes never share random bytes
+    """
+    def __init__(self, buffer_size: int = None) -> None:
+        """Initializes SystemRandomSource
+
+        Args:
+            buffer_size (int, optional): bytes read from os.urandom at once. Defaults to Config.RANDOM_BUFFER_SIZE.
+        """
+        self.buffer_size = buffer_size or Config.RANDOM_BUFFER_SIZE
+        self._buffer = b''
+        self._position = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def token_bytes(self, n: int) -> bytes:
+        """Returns random bytes
+
+        Args:
+            n (int): number of bytes
+
+        Returns:
+            bytes: random bytes
+        """
+        # Large requests are read directly, the buffer would only add a copy
+        if n >= self.buffer_size:
+            return os.urandom(n)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._buffer, self._position, self._pid = b'', 0, os.getpid()
+            end = self._position + n
+            if end > len(self._buffer):
+                self._buffer = self._buffer[self._position:] + os.urandom(self.buffer_size)
+                self._position, end = 0, n
+            data = self._buffer[self._position:end]
+            self._position = end
+            return data
+
+
+class SeededRandomSource():
+    """Deterministic bytes for reproducible runs, NOT for real passwords
+
+    Block i of the stream is SHAKE-256 of the seed and the counter i, so the same seed gives the same
+    bytes on every machine and substreams of one seed are independent
+    """
+    def __init__(self, seed: 'int | str | bytes', buffer_size: int = None) -> None:
+        """Initializes SeededRandomSource
+
+        Args:
+            seed (int | str | bytes): seed of the stream
+            buffer_size (int, optional): bytes of one counter block. Defaults to Config.RANDOM_BUFFER_SIZE.
+        """
+        self.seed = seed
+        self._key = seed if isinstance(seed, bytes) else str(seed).encode('utf-8')
+        self.buffer_size = buffer_size or Config.RANDOM_BUFFER_SIZE
+        self._counter = 0
+        self._buffer = b''
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def token_bytes(self, n: int) -> bytes:
+        """Returns the next bytes of the stream
+
+        Args:
+            n (int): number of bytes
+
+        Returns:
+            bytes: pseudo-random bytes
+        """
+        with self._lock:
+            end = self._position + n
+            if end > len(self._buffer):
+                # Whole blocks keep the stream independent of the request sizes
+                blocks = (end - len(self._buffer) + self.buffer_size - 1) // self.buffer_size
+                self._buffer = self._buffer[self._position:] + b''.join(self._block(self._counter + index) for index in range(blocks))
+                self._counter += blocks
+                self._position, end = 0, n
+            data = self._buffer[self._position:end]
+            self._position = end
+            return data
+
+    def substream(self, index: int) -> 'SeededRandomSource':
+        """Independent stream derived from the seed, e.g. for one chunk of a parallel run
+
+        Args:
+            index (int): index of the substream
+
+        Returns:
+            SeededRandomSource: new source at the start of its stream
+        """
+        return SeededRandomSource(hashlib.shake_256(b'substream\x00' + self._key + b'\x00' + str(index).encode('ascii')).digest(32), self.buffer_size)
+
+    def _block(self, counter: int) -> bytes:
+        return hashlib.shake_256(self._key + b'\x00' + counter.to_bytes(8, 'little')).digest(self.buffer_size)
+
+
+# Shared by all generators of the process unless a source is given
+system_random_source = SystemRandomSource()
+
+
+def get_random_source(seed: 'int | str | bytes' = None) -> 'SystemRandomSource | SeededRandomSource':
+    """Returns the random source for the seed
+
+    Args:
+        seed (int | str | bytes, optional): seed of a reproducible run. Defaults to Config.RANDOM_SEED, None is the operating system CSPRNG.
+
+    Returns:
+        SystemRandomSource | SeededRandomSource: new seeded source, or the shared system source
+    """
+    seed = seed if seed is not None else Config.RANDOM_SEED
+    if seed is None:
+        return system_random_source
+    return SeededRandomSource(seed)
@@ -0,0 +1,260 @@
+import string
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Iterable
+from src.config import Config
+from src.metrics import metrics
+from src.sequence_analyzer import SequenceAnalyzer
+
+# Character type bits of the class lookup table
+LOWER = 1
+UPPER = 2
+DIGIT = 4
+SPECIAL = 8
+
+
+def character_class(char: str) -> int:
+    """Character type bit of the character
+
+    Args:
+        char (str): single character
+
+    Returns:
+        int: type bit, 0 for characters of no type
+    """
+    if char in string.ascii_lowercase:
+        return LOWER
+    if char in string.ascii_uppercase:
+        return UPPER
+    if char in string.digits:
+        return DIGIT
+    if char in string.punctuation:
+        return SPECIAL
+    return 0
+
+
+class ScoringEngine():
+    """Computes the internal evaluation criteria in one pass over the password, and one pass of the sequence analyzer
+
+    Scores are the same as of the separate PasswordEvaluator.evaluate_* methods
+    """
+    # Character type of every Latin-1 character, other characters have no type
+    CLASS_TABLE = tuple(map(character_class, map(chr, range(256))))
+    # Number of character types of every class mask
+    VARIETY_TABLE = tuple(map(int.bit_count, range(16)))
+    # str.translate table replacing ASCII characters by their type bit, characters of no type are removed
+    CLASS_CHARS = {code: chr(bit) if bit else None for code, bit in enumerate(map(character_class, map(chr, range(128))))}
+
+    def __init__(self) -> None:
+        """Initializes ScoringEngine
+        """
+        self.PASSWORD_LENGTH_RATING = Config.PASSWORD_LENGTH_RATING
+        self.sequence_analyzer = SequenceAnalyzer()
+
+    def evaluate(self, password: str) -> tuple:
+        """Evaluates all criteria of the password
+
+        Args:
+            password (str): password to be evaluated
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            tuple: length, repetition, variety and sequence scores, each int (1 - 4)
+        """
+        if not password:
+            raise ValueError('Empty password')
+        class_table = self.CLASS_TABLE
+        # Occurrences of Latin-1 characters are counted in a list, of other characters in a dictionary
+        occurrences = [0] * 256
+        other_occurrences = {}
+        max_repetitions = 0
+        class_mask = 0
+
+        for char in password:
+            code = ord(char)
+            # Repetition and variety
+            if code < 256:
+                count = occurrences[code] + 1
+                occurrences[code] = count
+                class_mask |= class_table[code]
+            else:
+                count = other_occurrences.get(code, 0) + 1
+                other_occurrences[code] = count
+            if count > max_repetitions:
+                max_repetitions = count
+
+        length = len(password)
+        return (
+            self.length_score(length),
+            self.repetition_score(length, max_repetitions),
+            self.VARIETY_TABLE[class_mask],
+            self.sequence_score(length, self.sequence_analyzer.longest(password)),
+        )
+
+    def criteria_scores(self, password: str) -> dict:
+        """Weighted criteria scores as used by PasswordEvaluator.internal_password_evaluation
+
+        Args:
+            password (str): password to be evaluated
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            dict: weighted score of every criterion
+        """
+        length, repetition, variety, sequence = self.evaluate(password)
+        # Length is more important
+        return {'length': length * 6, 'repetition': repetition, 'variety': variety * 2, 'sequence': sequence}
+
+    def score(self, password: str) -> int:
+        """Evaluates the password by the internal algorithm
+
+        Args:
+            password (str): password to be evaluated
+
+        Raises:
+            ValueError: if password is empty
+
+        Returns:
+            int: rounded score: int (1 - 4)
+        """
+        length, repetition, variety, sequence = self.evaluate(password)
+        return self.total_score(length * 6 + repetition + variety * 2 + sequence)
+
+    @metrics.timed('internal_evaluation_batch')
+    def score_many(self, passwords: Iterable[str]) -> array:
+        """Evaluates many passwords by the internal algorithm, block by block
+
+        The sequences of a block are found in one scan of the joined ASCII passwords, see SequenceAnalyzer.longest_many,
+        repetition and variety use set, count and translate instead of a loop over the characters
+
+        Args:
+            passwords (Iterable[str]): passwords to be evaluated
+
+        Raises:
+            ValueError: if any password is empty
+
+        Returns:
+            array: unsigned byte array of rounded scores (1 - 4), in the order of passwords
+        """
+        scores = array('B')
+        passwords = iter(passwords)
+        while True:
+            block = list(islice(passwords, Config.SCORE_BATCH_SIZE))
+            if not block:
+                return scores
+            scores.extend(self._score_block(block))
+            metrics.increment('passwords_evaluated', len(block), method='internal_batch')
+
+    def _score_block(self, passwords: list) -> list:
+        """Evaluates one block of passwords, see score_many
+
+        Args:
+            passwords (list): passwords to be evaluated
+
+        Raises:
+            ValueError: if any password is empty
+
+        Returns:
+            list: rounded scores (1 - 4)
+        """
+        if not all(passwords):
+            raise ValueError('Empty password')
+        class_chars = self.CLASS_CHARS
+        # Scores of the criteria combinations seen in the block, passwords of one policy share few of them
+        known_scores = {}
+        scores = []
+        for password, longest in zip(passwords, self.sequence_analyzer.longest_many(passwords)):
+            # Types of other characters are looked up in the class table
+            if not password.isascii():
+                scores.append(self.score(password))
+                continue
+            length = len(password)
+            characters = set(password)
+            # No character occurs more often than the repeated characters allow, below half the length the score is known without counting
+            if (length - len(characters) + 1) * 2 < length:
+                repetition = 4
+            elif length <= 12:
+                repetition = self.repetition_score(length, max(map(password.count, characters)))
+            else:
+                repetition = self.repetition_score(length, max(Counter(password).values()))
+            criteria = (length, repetition, len(set(password.translate(class_chars))), longest)
+            score = known_scores.get(criteria)
+            if score is None:
+                score = known_scores[criteria] = self.total_score(self.length_score(length) * 6 + repetition + criteria[2] * 2 + self.sequence_score(length, longest))
+            scores.append(score)
+        return scores
+
+    @staticmethod
+    def total_score(weighted_sum: int) -> int:
+        """Rounds the weighted average of the criteria, halves are rounded down
+
+        Args:
+            weighted_sum (int): sum of the weighted criteria scores, the weights add up to 10
+
+        Returns:
+            int: rounded score: int (1 - 4)
+        """
+        if weighted_sum < 20:
+            return 1
+        whole, tenths = divmod(weighted_sum, 10)
+        return whole + 1 if tenths > 5 else whole
+
+    def length_score(self, password_length: int) -> int:
+        """Evaluates password length, same as PasswordEvaluator.evaluate_length
+
+        Args:
+            password_length (int): Length of the password
+
+        Returns:
+            int: score: int (1 - 4)
+        """
+        if password_length >= self.PASSWORD_LENGTH_RATING['strong']:
+            return 4
+        elif password_length >= self.PASSWORD_LENGTH_RATING['moderate']:
+            return 3
+        elif password_length > self.PASSWORD_LENGTH_RATING['weak']:
+            return 2
+        return 1
+
+    @staticmethod
+    def repetition_score(length: int, max_repetitions: int) -> int:
+        """Evaluates the occurrence of the most repeated character, same as PasswordEvaluator.evaluate_repetition
+
+        Args:
+            length (int): Length of the password
+            max_repetitions (int): occurrence of the most repeated character
+
+        Returns:
+            int: score: int (1 - 4)
+        """
+        if max_repetitions >= length / 1.3:
+            return 1
+        if max_repetitions >= length / 1.6:
+            return 2
+        if max_repetitions >= length / 2:
+            return 3
+        return 4
+
+    @staticmethod
+    def sequence_score(length: int, longest_sequence: int) -> int:
+        """Evaluates the longest character sequence, same as PasswordEvaluator.evaluate_sequence
+
+        Args:
+            length (int): Length of the password
+            longest_sequence (int): length of the longest run, see SequenceAnalyzer
+
+        Returns:
+            int: score: int (1 - 4)
+        """
+        if longest_sequence == length:
+            return 1
+        elif longest_sequence >= length / 2:
+            return 2
+        elif longest_sequence > length / 3:
+            return 3
+        return 4
@@ -0,0 +1,160 @@
+import logging
+from array import array
+from src.config import Config
+from src.entropy import valid_count
+from src.generation_policy import GenerationPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class BitmapSeenSet():
+    """Exact set of passwords of one policy and length, one bit per password of the keyspace
+
+    A password is its rank in the keyspace, its characters are the digits of a number in base charset size
+    """
+    def __init__(self, policy: GenerationPolicy, length: int) -> None:
+        """Initializes BitmapSeenSet
+
+        Args:
+            policy (GenerationPolicy): compiled policy, see get_policy
+            length (int): password length
+        """
+        self.base = policy.charset_size
+        self.memory = bitmap_size(policy, length)
+        self._bits = bytearray(self.memory)
+        # Maps charset characters to their digit value
+        self._digits = bytes.maketrans(policy.charset.encode('ascii'), bytes(range(policy.charset_size)))
+
+    def add(self, password: str) -> bool:
+        """Adds the password
+
+        Args:
+            password (str): password of the policy and length
+
+        Returns:
+            bool: True if the password was not seen before
+        """
+        rank = 0
+        base = self.base
+        for digit in password.encode('ascii').translate(self._digits):
+            rank = rank * base + digit
+        byte, bit = divmod(rank, 8)
+        mask = 1 << bit
+        if self._bits[byte] & mask:
+            return False
+        self._bits[byte] |= mask
+        return True
+
+
+class FingerprintSeenSet():
+    """Set of 64-bit password fingerprints in an open addressing table, for keyspaces too large for a bitmap
+
+    A password seen before is always found. Two different passwords sharing a fingerprint are unlikely
+    (about count ** 2 / 2 ** 65), the second one is then only rejected and another one generated
+    """
+    FINGERPRINT_MASK = (1 << 64) - 1
+
+    def __init__(self, count: int) -> None:
+        """Initializes FingerprintSeenSet
+
+        Args:
+            count (int): number of passwords to be added
+        """
+        self.capacity = fingerprint_table_capacity(count)
+        self.memory = self.capacity * 8
+        self._mask = self.capacity - 1
+        # 0 marks an empty slot
+        self._table = array('Q', bytes(self.memory))
+
+    def add(self, password: str) -> bool:
+        """Adds the password
+
+        Args:
+            password (str): password
+
+        Returns:
+            bool: True if the fingerprint was not seen before
+        """
+        fingerprint = hash(password) & self.FINGERPRINT_MASK or 1
+        table = self._table
+        slot = fingerprint & self._mask
+        # Linear probing, the table is never more than Config.UNIQUE_FINGERPRINT_LOAD_FACTOR full
+        while table[slot]:
+            if table[slot] == fingerprint:
+                return False
+            slot = (slot + 1) & self._mask
+        table[slot] = fingerprint
+        return True
+
+
+def bitmap_size(policy: GenerationPolicy, length: int) -> int:
+    """Bytes of the bitmap of all passwords over the charset
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        length (int): password length
+
+    Returns:
+        int: bitmap size in bytes
+    """
+    return (policy.charset_size ** length + 7) // 8
+
+
+def fingerprint_table_capacity(count: int) -> int:
+    """Slots of the fingerprint table for the count, a power of two
+
+    Args:
+        count (int): number of passwords to be added
+
+    Returns:
+        int: number of slots
+    """
+    capacity = 8
+    while capacity * Config.UNIQUE_FINGERPRINT_LOAD_FACTOR < count:
+        capacity *= 2
+    return capacity
+
+
+def seen_set_size(policy: GenerationPolicy, length: int, count: int) -> tuple:
+    """Chooses the smaller set able to hold the count of unique passwords, without allocating it
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        length (int): password length
+        count (int): number of unique passwords
+
+    Raises:
+        ValueError: if the policy has less than count valid passwords of the length
+
+    Returns:
+        tuple: 'bitmap' or 'fingerprint' and the memory in bytes
+    """
+    keyspace = valid_count(policy, length)
+    if count > keyspace:
+        raise ValueError(f'Only {keyspace} different passwords of length {length} exist for the character types')
+    bitmap_memory = bitmap_size(policy, length)
+    fingerprint_memory = fingerprint_table_capacity(count) * 8
+    if bitmap_memory <= fingerprint_memory:
+        return 'bitmap', bitmap_memory
+    return 'fingerprint', fingerprint_memory
+
+
+def new_seen_set(policy: GenerationPolicy, length: int, count: int) -> 'BitmapSeenSet | FingerprintSeenSet':
+    """Creates the set remembering the passwords of a unique batch, see seen_set_size
+
+    Args:
+        policy (GenerationPolicy): compiled policy, see get_policy
+        length (int): password length
+        count (int): number of unique passwords
+
+    Raises:
+        ValueError: if the policy has less than count valid passwords of the length
+
+    Returns:
+        BitmapSeenSet | FingerprintSeenSet: empty set
+    """
+    kind, memory = seen_set_size(policy, length, count)
+    logger.info('Unique batch of %s passwords uses a %s set of %s bytes', count, kind, memory)
+    if kind == 'bitmap':
+        return BitmapSeenSet(policy, length)
+    return FingerprintSeenSet(count)
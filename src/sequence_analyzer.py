@@ -0,0 +1,267 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate, repeat
+from operator import sub
+from src.config import Config
+
+# Run of characters following each other, kinds are the (kind, step) pairs the same span is a run of,
+# e.g. '1234' follows both the code points and the keyboard row, step is negative for descending runs
+SequenceRun = namedtuple('SequenceRun', ('start', 'length', 'kinds'))
+# Longest run of any kind, number of runs at least Config.SEQUENCE_LENGTH long and those runs
+SequenceAnalysis = namedtuple('SequenceAnalysis', ('longest', 'count', 'runs'))
+# Neighbours continuing a run are zero bytes of the compared ASCII positions
+ZERO_RUNS = re.compile(rb'\x00+')
+
+
+def shift_table(step: int) -> bytes:
+    """bytes.translate table adding the step to every byte
+
+    Args:
+        step (int): added step, negative to subtract
+
+    Returns:
+        bytes: 256 byte translation table
+    """
+    return bytes((byte + step) & 0xFF for byte in range(256))
+
+
+class SequenceAnalyzer():
+    """Finds ascending and descending character runs in linear time
+
+    Runs follow the character codes with a configured step ('abc', 'ace' for step 2, '987')
+    or the keyboard rows ('qwerty', 'lkjh'). A span which is a run of several kinds is reported once,
+    different spans may overlap
+    """
+    # Keyboard position of characters not on the keyboard, far from every key
+    NO_KEY = -1 << 20
+    NO_KEY_BYTE = 0xFF
+
+    def __init__(self, steps: tuple = None, keyboard_rows: tuple = None, min_length: int = None) -> None:
+        """Initializes SequenceAnalyzer and builds the adjacency tables
+
+        Args:
+            steps (tuple, optional): code point steps of the runs. Defaults to Config.SEQUENCE_STEPS.
+            keyboard_rows (tuple, optional): keyboard rows from the left, empty to ignore the keyboard. Defaults to Config.SEQUENCE_KEYBOARD_ROWS.
+            min_length (int, optional): length of runs which are counted and reported. Defaults to Config.SEQUENCE_LENGTH.
+
+        Raises:
+            ValueError: if a step is not positive
+        """
+        self.steps = tuple(steps if steps is not None else Config.SEQUENCE_STEPS)
+        if not all(step > 0 for step in self.steps):
+            raise ValueError('Sequence steps must be positive')
+        self.keyboard_rows = tuple(keyboard_rows if keyboard_rows is not None else Config.SEQUENCE_KEYBOARD_ROWS)
+        self.min_length = min_length or Config.SEQUENCE_LENGTH
+
+        # Keyboard position of every key, keys next to each other in a row differ by 1, rows are apart by more
+        self.keyboard_table = {}
+        keyboard_bytes = bytearray([self.NO_KEY_BYTE]) * 256
+        # Byte positions start at 1, so neither the no key byte plus one nor a key minus one is a key
+        position = 1
+        for row in self.keyboard_rows:
+            for column, key in enumerate(row):
+                for char in (key, key.upper()):
+                    self.keyboard_table.setdefault(char, position + column)
+                    if char.isascii() and keyboard_bytes[ord(char)] == self.NO_KEY_BYTE:
+                        keyboard_bytes[ord(char)] = position + column
+            position += len(row) + 2
+
+        # ASCII passwords are compared as bytes, when all positions fit into a byte without wrapping around
+        self.ascii_kinds = None
+        if max(self.steps, default=0) < 128 and position < self.NO_KEY_BYTE:
+            self.ascii_kinds = [('codepoint', step, None, shift_table(step), shift_table(-step)) for step in self.steps]
+            if self.keyboard_table:
+                self.ascii_kinds.append(('keyboard', 1, bytes(keyboard_bytes), shift_table(1), shift_table(-1)))
+
+    def analyze(self, password: str) -> SequenceAnalysis:
+        """Finds all runs of the password
+
+        Args:
+            password (str): password to be analyzed
+
+        Returns:
+            SequenceAnalysis: longest run of any kind (0 without runs), number of spans with runs of at least min_length characters and those runs by their start
+        """
+        runs = []
+        longest = self._scan(password, runs)
+        runs = self._merge_runs(runs)
+        return SequenceAnalysis(longest, len(runs), runs)
+
+    @staticmethod
+    def _merge_runs(runs: list) -> list:
+        """Merges the runs of several kinds over the same span, so no span is counted twice
+
+        Args:
+            runs (list): (start, length, kind, step) tuples collected by _scan
+
+        Returns:
+            list: SequenceRun of every span, by start and length
+        """
+        spans = {}
+        for start, length, kind, step in runs:
+            spans.setdefault((start, length), []).append((kind, step))
+        return [SequenceRun(start, length, tuple(kinds)) for (start, length), kinds in sorted(spans.items())]
+
+    def longest(self, password: str) -> int:
+        """Length of the longest run, without collecting the runs
+
+        Args:
+            password (str): password to be analyzed
+
+        Returns:
+            int: length of the longest run of any kind, 0 without runs
+        """
+        return self._scan(password, None)
+
+    def longest_many(self, passwords: list) -> list:
+        """Length of the longest run of every password, ASCII passwords are scanned together as one string
+
+        Neighbours across two passwords are masked out, so no run continues into the next password
+
+        Args:
+            passwords (list): passwords to be analyzed
+
+        Returns:
+            list: length of the longest run of every password, 0 without runs
+        """
+        ascii_indices = [index for index, password in enumerate(passwords) if password.isascii()] if self.ascii_kinds is not None else []
+        longest = [0] * len(passwords)
+        if len(ascii_indices) < len(passwords):
+            for index, password in enumerate(passwords):
+                if self.ascii_kinds is None or not password.isascii():
+                    longest[index] = self._scan_positions(password, None)
+        if not ascii_indices:
+            return longest
+
+        encoded = ''.join([passwords[index] for index in ascii_indices]).encode('ascii')
+        pairs = len(encoded) - 1
+        if pairs < 1:
+            return longest
+        ends = list(accumulate(len(passwords[index]) for index in ascii_indices))
+        # Pair p is between characters p and p + 1, the last pair of every password is across the boundary
+        boundaries = bytearray(pairs)
+        for end in ends:
+            if 0 < end <= pairs:
+                boundaries[end - 1] = 0xFF
+        boundary_mask = int.from_bytes(boundaries, 'big')
+        for _, _, position_table, ascending, descending in self.ascii_kinds:
+            positions = encoded if position_table is None else encoded.translate(position_table)
+            following = int.from_bytes(positions[1:], 'big')
+            previous = positions[:-1]
+            for shift in (ascending, descending):
+                matches = ((following ^ int.from_bytes(previous.translate(shift), 'big')) | boundary_mask).to_bytes(pairs, 'big')
+                for match in ZERO_RUNS.finditer(matches):
+                    index = ascii_indices[bisect_right(ends, match.start())]
+                    run = match.end() - match.start() + 1
+                    if run > longest[index]:
+                        longest[index] = run
+        return longest
+
+    def neighbour_kinds(self, previous: str, char: str) -> tuple:
+        """Kinds of runs which the two neighbouring characters continue, used by incremental evaluation
+
+        Args:
+            previous (str): first character
+            char (str): following character
+
+        Returns:
+            tuple: (kind, step) pairs as in SequenceRun.kinds, step is negative for descending neighbours
+        """
+        kinds = []
+        difference = ord(char) - ord(previous)
+        for step in self.steps:
+            if difference == step or difference == -step:
+                kinds.append(('codepoint', difference))
+        if self.keyboard_table:
+            difference = self.keyboard_table.get(char, self.NO_KEY) - self.keyboard_table.get(previous, self.NO_KEY)
+            if difference == 1 or difference == -1:
+                kinds.append(('keyboard', difference))
+        return tuple(kinds)
+
+    def _scan(self, password: str, runs: list) -> int:
+        """Finds the runs of every kind, a run of n characters is n - 1 neighbours differing by the same step
+
+        Args:
+            password (str): password to be analyzed
+            runs (list): list collecting (start, length, kind, step) of runs of at least min_length characters, None to skip collecting
+
+        Returns:
+            int: length of the longest run, 0 without runs
+        """
+        if self.ascii_kinds is not None and password.isascii():
+            return self._scan_ascii(password, runs)
+        return self._scan_positions(password, runs)
+
+    def _scan_ascii(self, password: str, runs: list) -> int:
+        """Finds the runs of an ASCII password, all the work per character is done in C
+
+        Positions shifted by the step are compared with the following positions as big integers,
+        the regular expression then finds the runs of equal bytes
+
+        Args:
+            password (str): ASCII password to be analyzed
+            runs (list): list collecting (start, length, kind, step) of runs of at least min_length characters, None to skip collecting
+
+        Returns:
+            int: length of the longest run, 0 without runs
+        """
+        encoded = password.encode('ascii')
+        pairs = len(encoded) - 1
+        if pairs < 1:
+            return 0
+        longest = 0
+        for kind, step, position_table, ascending, descending in self.ascii_kinds:
+            positions = encoded if position_table is None else encoded.translate(position_table)
+            following = int.from_bytes(positions[1:], 'big')
+            previous = positions[:-1]
+            for difference, shift in ((step, ascending), (-step, descending)):
+                matches = (following ^ int.from_bytes(previous.translate(shift), 'big')).to_bytes(pairs, 'big')
+                # Most passwords have no neighbours of this kind at all
+                if 0 not in matches:
+                    continue
+                for match in ZERO_RUNS.finditer(matches):
+                    run = match.end() - match.start() + 1
+                    if run > longest:
+                        longest = run
+                    if runs is not None and run >= self.min_length:
+                        runs.append((match.start(), run, kind, difference))
+        return longest
+
+    def _scan_positions(self, password: str, runs: list) -> int:
+        """Finds the runs of any password from the lists of position differences
+
+        Args:
+            password (str): password to be analyzed
+            runs (list): list collecting (start, length, kind, step) of runs of at least min_length characters, None to skip collecting
+
+        Returns:
+            int: length of the longest run, 0 without runs
+        """
+        codes = list(map(ord, password))
+        kinds = [('codepoint', step, codes) for step in self.steps]
+        if self.keyboard_table:
+            kinds.append(('keyboard', 1, list(map(self.keyboard_table.get, password, repeat(self.NO_KEY)))))
+        longest = 0
+        for kind, step, positions in kinds:
+            differences = list(map(sub, positions[1:], positions))
+            count = len(differences)
+            for difference in (step, -step):
+                # Most passwords have no neighbours of this kind at all
+                if difference not in differences:
+                    continue
+                start = differences.index(difference)
+                while True:
+                    end = start + 1
+                    while end < count and differences[end] == difference:
+                        end += 1
+                    run = end - start + 1
+                    if run > longest:
+                        longest = run
+                    if runs is not None and run >= self.min_length:
+                        runs.append((start, run, kind, difference))
+                    try:
+                        start = differences.index(difference, end + 1)
+                    except ValueError:
+                        break
+        return longest
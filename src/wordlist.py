@@ -0,0 +1,194 @@
+import mmap
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Iterator
+from src.config import Config
+
+
+def iter_wordlist_words(wordlist_path: str) -> Iterator[bytes]:
+    """Reads a text wordlist with one word per line, diceware lines '11111 word' give their last field
+
+    Args:
+        wordlist_path (str): path of the text wordlist
+
+    Raises:
+        ValueError: if the wordlist is not UTF-8
+
+    Yields:
+        bytes: UTF-8 encoded word of every non-empty line
+    """
+    with open(wordlist_path, 'rb', buffering=Config.FILE_BUFFER_SIZE) as wordlist:
+        for line in wordlist:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[-1]
+            try:
+                word.decode('utf-8')
+            except UnicodeDecodeError:
+                raise ValueError(f'Invalid line in wordlist: {line.strip()!r}')
+            yield word
+
+
+class Wordlist():
+    """Memory-mapped wordlist indexed by word offsets, words are read in place and never loaded as a list of strings
+
+    File layout: header, offset table with the start of every word and the end of the last one, UTF-8 words without separators
+    """
+    MAGIC = b'PWDWORD1'
+    # magic, word count
+    HEADER = struct.Struct('<8sI')
+
+    def __init__(self, wordlist_path: str) -> None:
+        """Opens a wordlist built by Wordlist.build, or compiles a text wordlist into anonymous memory
+
+        Args:
+            wordlist_path (str): path of the compiled or text wordlist
+
+        Raises:
+            ValueError: if the wordlist is invalid or has less than 2 words
+        """
+        self.wordlist_path = wordlist_path
+        self._offsets = None
+        with open(wordlist_path, 'rb') as f:
+            compiled = f.read(len(self.MAGIC)) == self.MAGIC
+            if compiled:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if not compiled:
+            data = self.compile(iter_wordlist_words(wordlist_path))
+            self._mmap = mmap.mmap(-1, len(data))
+            self._mmap.write(data)
+
+        if len(self._mmap) < self.HEADER.size:
+            self.close()
+            raise ValueError('Invalid wordlist file')
+        magic, self.count = self.HEADER.unpack_from(self._mmap, 0)
+        self._words_offset = self.HEADER.size + (self.count + 1) * 4
+        if magic != self.MAGIC or len(self._mmap) < self._words_offset:
+            self.close()
+            raise ValueError('Invalid wordlist file')
+        # Offset table is little-endian like the header, it is read in place on little-endian machines
+        if sys.byteorder == 'little':
+            self._offsets = memoryview(self._mmap)[self.HEADER.size:self._words_offset].cast('I')
+        else:
+            offsets = array('I', self._mmap[self.HEADER.size:self._words_offset])
+            offsets.byteswap()
+            self._offsets = memoryview(offsets)
+        if len(self._mmap) != self._words_offset + self._offsets[self.count]:
+            self.close()
+            raise ValueError('Invalid wordlist file')
+        if self.count < 2:
+            self.close()
+            raise ValueError('Wordlist must contain at least 2 different words')
+
+    def __enter__(self) -> 'Wordlist':
+        return self
+
+    def __exit__(self, *args: tuple) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        """Reads the word from the memory map
+
+        Args:
+            index (int): word index, 0 - count - 1
+
+        Raises:
+            IndexError: if the index is out of range
+
+        Returns:
+            str: the word
+        """
+        if not 0 <= index < self.count:
+            raise IndexError('Word index out of range')
+        return self._mmap[self._words_offset + self._offsets[index]:self._words_offset + self._offsets[index + 1]].decode('utf-8')
+
+    def words(self, indices: list) -> list:
+        """Reads many words at once
+
+        Args:
+            indices (list): word indices, 0 - count - 1
+
+        Raises:
+            IndexError: if an index is out of range
+
+        Returns:
+            list: the words in the order of indices
+        """
+        memory = self._mmap
+        offsets = self._offsets
+        start = self._words_offset
+        return [memory[start + offsets[index]:start + offsets[index + 1]].decode('utf-8') for index in indices]
+
+    def close(self) -> None:
+        """Closes the memory map
+        """
+        if self._offsets is not None:
+            self._offsets.release()
+            self._offsets = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    @classmethod
+    def compile(cls, words: Iterator[bytes]) -> bytes:
+        """Compiles words into the wordlist layout, duplicates are dropped so every word is equally likely
+
+        Args:
+            words (Iterator[bytes]): UTF-8 encoded words
+
+        Returns:
+            bytes: compiled wordlist
+        """
+        seen = set()
+        offsets = array('I', [0])
+        data = bytearray()
+        for word in words:
+            if word in seen:
+                continue
+            seen.add(word)
+            data += word
+            offsets.append(len(data))
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+        return cls.HEADER.pack(cls.MAGIC, len(offsets) - 1) + offsets.tobytes() + data
+
+    @classmethod
+    def build(cls, text_path: str, wordlist_path: str) -> int:
+        """Builds the compiled wordlist file from a text wordlist, so it is memory-mapped without compiling on every start
+
+        Args:
+            text_path (str): path of the text wordlist
+            wordlist_path (str): path of the compiled wordlist to create
+
+        Raises:
+            ValueError: if the text wordlist is not UTF-8
+
+        Returns:
+            int: number of unique words
+        """
+        data = cls.compile(iter_wordlist_words(text_path))
+        with open(wordlist_path, 'wb') as f:
+            f.write(data)
+        return cls.HEADER.unpack_from(data, 0)[1]
+
+
+@lru_cache(maxsize=4)
+def get_wordlist(wordlist_path: str) -> Wordlist:
+    """Returns the opened wordlist, opening (and compiling a text wordlist) only on first use
+
+    Args:
+        wordlist_path (str): path of the compiled or text wordlist
+
+    Raises:
+        ValueError: if the wordlist is invalid
+
+    Returns:
+        Wordlist: cached wordlist
+    """
+    return Wordlist(wordlist_path)
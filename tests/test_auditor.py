@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import pytest
+from src.auditor import AuditSummary, PasswordAuditor
+from src.breach_index import BreachIndex
+from src.config import Config
+from src.password_evaluator import PasswordEvaluator
+
+PASSWORDS = ['abcd', 'a1C*', 'a1C*zzz', 'abcd12**CCCCaabb', 'admin']
+
+@pytest.fixture
+def password_file(tmp_path):
+    path = tmp_path / 'passwords.txt'
+    # Blank and CRLF lines are counted, but not audited
+    path.write_bytes('\n'.join(PASSWORDS * 40).encode('utf-8') + b'\r\n\nadmin')
+    return path
+
+@pytest.fixture
+def evaluator(tmp_path):
+    dump_path = tmp_path / 'pwned.txt'
+    dump_path.write_text(hashlib.sha1(b'admin').hexdigest().upper() + ':1\n', encoding='ascii')
+    BreachIndex.build(str(dump_path), str(tmp_path / 'pwned.idx'))
+    return PasswordEvaluator(breach_index_path=str(tmp_path / 'pwned.idx'))
+
+def read_report(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+def test_audit(password_file, evaluator, tmp_path):
+    report_path = tmp_path / 'report.jsonl'
+    summary = PasswordAuditor(check_breach=True, chunk_size=30, evaluator=evaluator).audit(str(password_file), str(report_path))
+    records = read_report(report_path)
+    assert len(records) == 201
+    assert records[:5] == [
+        {'line': 1, 'length': 4, 'score': 1, 'breached': False},
+        {'line': 2, 'length': 4, 'score': 2, 'breached': False},
+        {'line': 3, 'length': 7, 'score': 3, 'breached': False},
+        {'line': 4, 'length': 16, 'score': 4, 'breached': False},
+        {'line': 5, 'length': 5, 'score': 1, 'breached': True},
+    ]
+    assert records[-1]['line'] == 202
+    assert all(type(record['score']) is int for record in records)
+    assert summary.to_dict() == {
+        'passwords': 201,
+        'empty_lines': 1,
+        'scores': {'1': 81, '2': 40, '3': 40, '4': 40},
+        'lengths': {'4': 80, '5': 41, '7': 40, '16': 40},
+        'breached': 41,
+        'breach_checked': 201,
+        'breach_rate': 41 / 201,
+    }
+
+def test_audit_workers(password_file, tmp_path):
+    PasswordAuditor(chunk_size=30).audit(str(password_file), str(tmp_path / 'local.jsonl'))
+    summary = PasswordAuditor(workers=2, chunk_size=30).audit(str(password_file), str(tmp_path / 'parallel.jsonl'))
+    assert read_report(tmp_path / 'parallel.jsonl') == read_report(tmp_path / 'local.jsonl')
+    assert summary.scores == {1: 81, 2: 40, 3: 40, 4: 40}
+    assert summary.breach_rate is None
+
+def test_resume(password_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'AUDIT_CHECKPOINT_INTERVAL', 0)
+    report_path = tmp_path / 'report.jsonl'
+    checkpoint_path = str(tmp_path / 'audit.checkpoint')
+    expected = PasswordAuditor(chunk_size=30).audit(str(password_file), str(tmp_path / 'expected.jsonl')).to_dict()
+
+    # Interrupt the audit after the third chunk
+    auditor = PasswordAuditor(chunk_size=30)
+    score = auditor._score
+    calls = []
+    def interrupted(passwords):
+        calls.append(passwords)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return score(passwords)
+    monkeypatch.setattr(auditor, '_score', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        auditor.audit(str(password_file), str(report_path), checkpoint_path)
+    with open(checkpoint_path, encoding='utf-8') as f:
+        assert json.load(f)['line'] == 91
+    assert len(read_report(report_path)) == 90
+
+    # A file edited before the checkpointed offset is not resumed, also when its size stays the same
+    content, stat = password_file.read_bytes(), password_file.stat()
+    password_file.write_bytes(b'X' + content[1:])
+    with pytest.raises(ValueError):
+        PasswordAuditor(chunk_size=30).audit(str(password_file), str(report_path), checkpoint_path)
+    password_file.write_bytes(content)
+    os.utime(password_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    summary = PasswordAuditor(chunk_size=30).audit(str(password_file), str(report_path), checkpoint_path)
+    assert summary.to_dict() == expected
+    assert read_report(report_path) == read_report(tmp_path / 'expected.jsonl')
+    with pytest.raises(ValueError):
+        PasswordAuditor('native').audit(str(password_file), str(report_path), checkpoint_path)
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        PasswordAuditor('unknown')
+    with pytest.raises(ValueError):
+        PasswordAuditor(None, check_breach=False)
+
+def test_audit_summary():
+    summary = AuditSummary()
+    summary.add(8, 3, True)
+    summary.add(8, 1, False)
+    summary.add(12)
+    assert summary.breach_rate == 0.5
+    assert AuditSummary.from_dict(summary.to_dict()).to_dict() == summary.to_dict()
@@ -0,0 +1,82 @@
+import threading
+import time
+import pytest
+from src.background_evaluator import BackgroundEvaluator
+
+class SlowEvaluator():
+    """Stand-in for PasswordEvaluator whose breach check blocks until released"""
+    def __init__(self):
+        self.release = threading.Event()
+        self.evaluated = []
+    def is_breached(self, password):
+        self.release.wait(5)
+        if password == 'offline':
+            raise ConnectionError('Connection Error')
+        return password == 'admin'
+    def internal_password_evaluation(self, password):
+        self.evaluated.append(password)
+        return 3
+    def external_password_evaluation(self, password):
+        self.evaluated.append(password)
+        return 4
+    def native_password_evaluation(self, password):
+        raise ValueError('Native evaluation needs dictionaries')
+
+def wait_for_results(background_evaluator):
+    for _ in range(500):
+        results = background_evaluator.completed()
+        if results:
+            return results
+        time.sleep(0.01)
+    return []
+
+@pytest.fixture
+def evaluator():
+    return SlowEvaluator()
+
+def test_latest_result_only(evaluator):
+    background_evaluator = BackgroundEvaluator(evaluator, workers=1)
+    background_evaluator.submit('first', check_breached=True)
+    background_evaluator.submit('second', check_breached=True)
+    request_id = background_evaluator.submit('third', 'external', check_breached=True)
+    evaluator.release.set()
+    results = wait_for_results(background_evaluator)
+    assert [(result.request_id, result.password, result.score) for result in results] == [(request_id, 'third', 4)]
+    # Stale requests were cancelled or not evaluated
+    assert 'second' not in evaluator.evaluated
+    background_evaluator.shutdown()
+
+def test_breached_and_connection_error(evaluator):
+    evaluator.release.set()
+    background_evaluator = BackgroundEvaluator(evaluator)
+    background_evaluator.submit('admin', check_breached=True)
+    result = wait_for_results(background_evaluator)[0]
+    assert result.breached and result.score is None
+    background_evaluator.submit('offline', check_breached=True)
+    result = wait_for_results(background_evaluator)[0]
+    assert result.connection_error
+    background_evaluator.submit('password')
+    result = wait_for_results(background_evaluator)[0]
+    assert (result.breached, result.score, result.connection_error) == (None, 3, False)
+    background_evaluator.shutdown()
+
+def test_cancel(evaluator):
+    background_evaluator = BackgroundEvaluator(evaluator, workers=1)
+    background_evaluator.submit('first', check_breached=True)
+    background_evaluator.cancel()
+    evaluator.release.set()
+    time.sleep(0.1)
+    # Result of the running request is dropped
+    assert background_evaluator.completed() == []
+    background_evaluator.shutdown()
+
+def test_evaluation_error(evaluator, caplog):
+    # Failures of the evaluation are logged and delivered, not lost in the unread future
+    background_evaluator = BackgroundEvaluator(evaluator)
+    background_evaluator.submit('password', 'native')
+    result = wait_for_results(background_evaluator)[0]
+    assert (result.score, result.error) == (None, 'Native evaluation needs dictionaries')
+    assert 'failed' in caplog.text
+    background_evaluator.submit('password')
+    assert wait_for_results(background_evaluator)[0].error is None
+    background_evaluator.shutdown()
@@ -0,0 +1,33 @@
+import hashlib
+import pytest
+from src.bloom_filter import BloomFilter
+
+@pytest.fixture
+def breach_dump(tmp_path):
+    lines = [f"{hashlib.sha1(f'breached{i}'.encode('utf-8')).hexdigest().upper()}:1" for i in range(2000)]
+    dump_path = tmp_path / 'pwned.txt'
+    dump_path.write_text('\n'.join(lines), encoding='ascii')
+    return str(dump_path)
+
+def test_build_and_probe(breach_dump, tmp_path):
+    filter_path = str(tmp_path / 'pwned.bloom')
+    assert BloomFilter.build(breach_dump, filter_path, false_positive_rate=0.01) == 2000
+    with BloomFilter(filter_path) as bloom_filter:
+        assert (bloom_filter.bits, bloom_filter.hash_count) == BloomFilter.size_for(2000, 0.01)
+        # No false negatives
+        assert all([bloom_filter.may_contain_password(f'breached{i}') for i in range(2000)])
+        false_positives = sum([bloom_filter.may_contain_password(f'fresh{i}') for i in range(10000)])
+        assert false_positives < 300
+
+def test_size_for():
+    assert BloomFilter.size_for(1000, 0.01) == (9586, 7)
+    with pytest.raises(ValueError):
+        BloomFilter.size_for(1000, 0)
+    with pytest.raises(ValueError):
+        BloomFilter.size_for(1000, 1)
+
+def test_invalid_file(tmp_path):
+    not_filter = tmp_path / 'not_filter.bloom'
+    not_filter.write_bytes(b'x' * 100)
+    with pytest.raises(ValueError):
+        BloomFilter(str(not_filter))
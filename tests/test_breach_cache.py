@@ -0,0 +1,40 @@
+import time
+import pytest
+from src.breach_cache import BreachRangeCache
+
+def test_memory_lru():
+    breach_cache = BreachRangeCache(memory_size=2)
+    breach_cache.put('00000', {'AAA'}, 'etag0')
+    breach_cache.put('11111', {'BBB'})
+    assert breach_cache.get('00000').suffixes == frozenset({'AAA'})
+    breach_cache.put('22222', {'CCC'})
+    # 11111 was the least recently used range
+    assert breach_cache.get('11111') is None
+    assert breach_cache.get('00000').etag == 'etag0'
+    assert breach_cache.get('22222').suffixes == frozenset({'CCC'})
+
+def test_ttl_and_refresh():
+    breach_cache = BreachRangeCache(ttl=0.05)
+    breach_cache.put('00000', {'AAA'}, 'etag0')
+    time.sleep(0.1)
+    assert breach_cache.get('00000') is None
+    stale = breach_cache.get_stale('00000')
+    assert stale.etag == 'etag0'
+    breach_cache.refresh('00000', stale)
+    assert breach_cache.get('00000').suffixes == frozenset({'AAA'})
+
+def test_persistent_cache(tmp_path):
+    path = str(tmp_path / 'breach_cache.sqlite')
+    breach_cache = BreachRangeCache(path=path, ttl=60)
+    breach_cache.put('ABCDE', {'AAA', 'BBB'}, 'etag')
+    breach_cache.close()
+
+    breach_cache = BreachRangeCache(path=path, ttl=60)
+    cached = breach_cache.get('ABCDE')
+    assert cached.suffixes == frozenset({'AAA', 'BBB'})
+    assert cached.etag == 'etag'
+    breach_cache.ttl = 0
+    time.sleep(0.01)
+    assert breach_cache.evict_expired() == 1
+    assert breach_cache.get_stale('ABCDE') is None
+    breach_cache.close()
@@ -0,0 +1,45 @@
+import hashlib
+import pytest
+from src.breach_index import BreachIndex
+from src.config import Config
+
+BREACHED = ['admin', 'password', '123456', 'qwerty', 'letmein']
+
+@pytest.fixture
+def breach_dump(tmp_path):
+    # Unsorted dump with a duplicate, like concatenated downloads
+    lines = [f"{hashlib.sha1(password.encode('utf-8')).hexdigest().upper()}:{count}" for count, password in enumerate(BREACHED + ['admin'])]
+    dump_path = tmp_path / 'pwned.txt'
+    dump_path.write_text('\n'.join(reversed(lines)) + '\n', encoding='ascii')
+    return str(dump_path)
+
+def test_build_and_lookup(breach_dump, tmp_path, monkeypatch):
+    # Force several sorted runs and merge passes to exercise the external sort
+    monkeypatch.setattr(Config, 'BREACH_INDEX_SORT_CHUNK', 1)
+    monkeypatch.setattr(Config, 'BREACH_INDEX_MERGE_FAN_IN', 2)
+    index_path = str(tmp_path / 'pwned.idx')
+    assert BreachIndex.build(breach_dump, index_path, prefix_bits=4) == len(BREACHED)
+    with BreachIndex(index_path) as breach_index:
+        assert len(breach_index) == len(BREACHED)
+        for password in BREACHED:
+            assert breach_index.contains_password(password)
+        assert not breach_index.contains_password('784defwefs221fdc5asd4as6d48496532666')
+        assert not breach_index.contains_password('Admin')
+
+def test_default_prefix_bits(breach_dump, tmp_path):
+    index_path = str(tmp_path / 'pwned.idx')
+    BreachIndex.build(breach_dump, index_path)
+    with BreachIndex(index_path) as breach_index:
+        assert breach_index.prefix_bits == Config.BREACH_INDEX_PREFIX_BITS
+        assert breach_index.contains_password('admin')
+        assert not breach_index.contains_password('admin1')
+
+def test_invalid_files(tmp_path):
+    dump_path = tmp_path / 'invalid.txt'
+    dump_path.write_text('NOTAHASH:1\n', encoding='ascii')
+    with pytest.raises(ValueError):
+        BreachIndex.build(str(dump_path), str(tmp_path / 'invalid.idx'))
+    not_index = tmp_path / 'not_index.idx'
+    not_index.write_bytes(b'x' * 100)
+    with pytest.raises(ValueError):
+        BreachIndex(str(not_index))
@@ -0,0 +1,86 @@
+import csv
+import json
+import string
+import pytest
+from src.cli import main
+from src.config import Config
+
+def test_generate_text(capsys):
+    assert main(['generate', '-n', '5', '-l', '12', '-d', '-u', '-s']) == 0
+    passwords = capsys.readouterr().out.splitlines()
+    assert len(passwords) == 5
+    for password in passwords:
+        assert len(password) == 12
+        assert any([c.isdigit() for c in password])
+        assert any([c.isupper() for c in password])
+        assert any([c in string.punctuation for c in password])
+
+def test_generate_jsonl(capsys):
+    assert main(['generate', '-n', '3', '--no-lower', '-d', '-e', 'internal', '-f', 'jsonl']) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 3
+    assert all([record['password'].isdigit() and record['score'] in (1, 2, 3, 4) for record in records])
+
+def test_generate_csv_file(tmp_path):
+    file_path = tmp_path / 'passwords.csv'
+    assert main(['generate', '-n', '4', '-e', 'internal', '-f', 'csv', '-o', str(file_path), '-w', '2']) == 0
+    assert main(['generate', '-n', '2', '-e', 'internal', '-f', 'csv', '-o', str(file_path)]) == 0
+    rows = list(csv.reader(file_path.read_text(encoding='utf-8').splitlines()))
+    # Header is written only into an empty file
+    assert rows[0] == ['password', 'score']
+    assert len(rows) == 7
+
+def test_generate_unique(capsys):
+    assert main(['generate', '-n', '10000', '-l', '4', '--no-lower', '-d', '--unique']) == 0
+    output = capsys.readouterr()
+    assert len(set(output.out.splitlines())) == 10000
+    assert 'bitmap set of 1250 bytes' in output.err
+    with pytest.raises(SystemExit):
+        main(['generate', '-n', '10001', '-l', '4', '--no-lower', '-d', '--unique'])
+
+def test_generate_seeded(capsys, monkeypatch):
+    assert main(['generate', '-n', '20', '--seed', 'load-test']) == 0
+    first = capsys.readouterr().out
+    assert main(['generate', '-n', '20', '--seed', 'load-test']) == 0
+    assert capsys.readouterr().out == first
+    # Seeded passwords do not depend on the number of workers, also across chunks and with unique passwords
+    monkeypatch.setattr(Config, 'PARALLEL_CHUNK_SIZE', 1000)
+    for arguments in (['-n', '2500'], ['-n', '2500', '--unique', '-l', '4', '--no-lower', '-d']):
+        assert main(['generate', '--seed', 'load-test', '-w', '1'] + arguments) == 0
+        first = capsys.readouterr().out
+        assert main(['generate', '--seed', 'load-test', '-w', '2'] + arguments) == 0
+        assert capsys.readouterr().out == first
+
+def test_audit(tmp_path, capsys):
+    input_path = tmp_path / 'passwords.txt'
+    input_path.write_text('abcd\na1C*\na1C*zzz', encoding='utf-8')
+    report_path = tmp_path / 'report.jsonl'
+    assert main(['audit', str(input_path), '-o', str(report_path), '-c', str(tmp_path / 'audit.checkpoint')]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary['passwords'] == 3
+    assert summary['scores'] == {'1': 1, '2': 1, '3': 1}
+    assert [json.loads(line)['score'] for line in report_path.read_text(encoding='utf-8').splitlines()] == [1, 2, 3]
+    assert main(['audit', str(tmp_path / 'missing.txt'), '-o', str(report_path)]) == 1
+    with pytest.raises(SystemExit):
+        main(['audit', str(input_path), '-o', str(report_path), '-e', 'none'])
+
+def test_invalid_parameters(capsys, tmp_path):
+    with pytest.raises(SystemExit):
+        main(['generate', '-l', '3'])
+    # No output file is left behind
+    for arguments in (['-l', '3'], ['-n', '-1'], ['--no-lower'], ['-n', '10001', '-l', '4', '--no-lower', '-d', '--unique']):
+        with pytest.raises(SystemExit):
+            main(['generate', '-o', str(tmp_path / 'out.txt')] + arguments)
+    assert not (tmp_path / 'out.txt').exists()
+    with pytest.raises(SystemExit):
+        main(['generate', '--no-lower'])
+    assert 'Invalid combination of parameters' in capsys.readouterr().err
+
+def test_native_without_dictionaries(tmp_path, monkeypatch):
+    monkeypatch.setattr('src.dictionary_automaton.native_dictionary_available', lambda: False)
+    with pytest.raises(SystemExit):
+        main(['generate', '-e', 'native', '-o', str(tmp_path / 'out.txt')])
+    assert not (tmp_path / 'out.txt').exists()
+    (tmp_path / 'passwords.txt').write_text('password', encoding='utf-8')
+    with pytest.raises(SystemExit):
+        main(['audit', str(tmp_path / 'passwords.txt'), '-o', str(tmp_path / 'report.jsonl'), '-e', 'native'])
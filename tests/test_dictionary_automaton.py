@@ -0,0 +1,42 @@
+import pytest
+from src.dictionary_automaton import DictionaryAutomaton
+
+@pytest.fixture
+def automaton(tmp_path):
+    passwords = tmp_path / 'passwords.txt'
+    passwords.write_text('she 100\nhe 50\n\nhers 10\nhe 1\n', encoding='utf-8')
+    english = tmp_path / 'english.txt'
+    english.write_text('his\nshe\nžluť\n', encoding='utf-8')
+    path = str(tmp_path / 'dictionaries.ac')
+    DictionaryAutomaton.build({'passwords': str(passwords), 'english': str(english)}, path)
+    with DictionaryAutomaton(path) as automaton:
+        yield automaton
+
+def test_matches(automaton):
+    assert automaton.dictionary_names == ['passwords', 'english']
+    # Overlapping words and words in both dictionaries, a repeated word keeps its last rank
+    assert sorted(automaton.matches('ushers')) == [
+        (1, 3, 'english', 2), (1, 3, 'passwords', 1), (2, 3, 'passwords', 4), (2, 5, 'passwords', 3),
+    ]
+    assert list(automaton.matches('ahishe')) == [(1, 3, 'english', 1), (3, 5, 'passwords', 1), (3, 5, 'english', 2), (4, 5, 'passwords', 4)]
+    assert list(automaton.matches('žluťoučký')) == [(0, 3, 'english', 3)]
+    assert list(automaton.matches('')) == []
+
+def test_matches_all_substrings(tmp_path):
+    dictionaries = {'first': ['a', 'ab', 'bab', 'abba', 'c'], 'second': ['bb', 'ab', 'cab']}
+    path = tmp_path / 'dictionaries.ac'
+    path.write_bytes(DictionaryAutomaton.compile(dictionaries))
+    ranks = {name: {word: rank for rank, word in enumerate(words, 1)} for name, words in dictionaries.items()}
+    text = 'abbabcabbacab'
+    expected = sorted((i, j, name, ranks[name][text[i:j + 1]]) for name in ranks
+                      for i in range(len(text)) for j in range(i, len(text)) if text[i:j + 1] in ranks[name])
+    with DictionaryAutomaton(str(path)) as automaton:
+        assert sorted(automaton.matches(text)) == expected
+
+def test_invalid_automaton(tmp_path):
+    path = tmp_path / 'dictionaries.ac'
+    path.write_bytes(DictionaryAutomaton.MAGIC + b'\x05')
+    with pytest.raises(ValueError):
+        DictionaryAutomaton(str(path))
+    with pytest.raises(ValueError):
+        DictionaryAutomaton.compile({'': ['word']})
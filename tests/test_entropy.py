@@ -0,0 +1,40 @@
+import math
+from itertools import product
+import pytest
+from src.config import Config
+from src.entropy import entropy_bits, minimum_length, policy_for_classes, valid_count
+from src.generation_policy import get_policy
+
+def test_valid_count():
+    # One class needs no correction
+    assert valid_count(get_policy(include_lower=True), 5) == 26 ** 5
+    # Strings of digits and upper case letters missing either class are not valid
+    assert valid_count(get_policy(True, True, False, False), 4) == 36 ** 4 - 26 ** 4 - 10 ** 4
+    # Less characters than classes
+    assert valid_count(get_policy(True, True, True, True), 3) == 0
+
+def test_valid_count_matches_enumeration():
+    policy = get_policy(True, True, False, False)
+    valid = sum(1 for candidate in product(policy.charset.encode('ascii'), repeat=3) if policy.has_required_types(bytes(candidate)))
+    assert valid_count(policy, 3) == valid
+
+def test_entropy_bits():
+    assert entropy_bits(get_policy(include_lower=True), 10) == pytest.approx(10 * math.log2(26))
+    policy = get_policy(True, True, True, True)
+    # Required classes lower the entropy slightly
+    assert entropy_bits(policy, 12) < 12 * policy.bits_per_character
+    assert entropy_bits(policy, 12) == pytest.approx(math.log2(valid_count(policy, 12)))
+
+def test_minimum_length():
+    policy = get_policy(include_lower=True)
+    assert minimum_length(policy, 80) == 18
+    assert minimum_length(policy, 1) == Config.MIN_PASSWORD_LENGTH
+    with pytest.raises(ValueError):
+        minimum_length(policy, 1000)
+
+def test_policy_for_classes():
+    assert policy_for_classes(('lower', 'digits')) is get_policy(True, False, True, False)
+    with pytest.raises(ValueError):
+        policy_for_classes(('emoji',))
+    with pytest.raises(ValueError):
+        policy_for_classes(())
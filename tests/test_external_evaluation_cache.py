@@ -0,0 +1,26 @@
+from src.external_evaluation_cache import ExternalEvaluationCache, StrengthResult
+
+def test_cache():
+    external_cache = ExternalEvaluationCache(max_size=2)
+    assert external_cache.get('first') is None
+    external_cache.put('first', StrengthResult(1, False))
+    external_cache.put('second', StrengthResult(2, False))
+    assert external_cache.get('first') == StrengthResult(1, False)
+    external_cache.put('third', StrengthResult(3, False))
+    # second was the least recently used result
+    assert external_cache.get('second') is None
+    assert external_cache.get('third').score == 3
+    assert (external_cache.hits, external_cache.misses) == (2, 2)
+    assert len(external_cache) == 2
+
+def test_no_plaintext_keys():
+    external_cache = ExternalEvaluationCache()
+    external_cache.put('secret password', StrengthResult(4, False))
+    assert all([b'secret' not in key for key in external_cache._results])
+    # Salt differs between caches
+    assert external_cache.key('secret password') != ExternalEvaluationCache().key('secret password')
+
+def test_disabled_cache():
+    external_cache = ExternalEvaluationCache(max_size=0)
+    external_cache.put('first', StrengthResult(1, False))
+    assert external_cache.get('first') is None
@@ -0,0 +1,71 @@
+import pytest
+from src.config import Config
+from src.file_handler import FileHandler, PasswordFileWriter
+
+@pytest.fixture
+def file_handler():
+    return FileHandler()
+
+def test_save_to_file(file_handler, tmp_path):
+    file_path = str(tmp_path / 'passwords')
+    assert file_handler.save_to_file(file_path, 'first') == f'Password saved in {file_path}.txt'
+    file_handler.save_to_file(file_path, 'second')
+    assert (tmp_path / 'passwords.txt').read_text(encoding='utf-8') == 'first\nsecond'
+    with pytest.raises(ValueError):
+        file_handler.save_to_file('', 'password')
+    with pytest.raises(ValueError):
+        file_handler.save_to_file(file_path, '')
+
+def test_save_passwords(file_handler, tmp_path):
+    file_path = str(tmp_path / 'passwords.txt')
+    file_handler.save_to_file(file_path, 'first')
+    passwords = (f'password{i}' for i in range(25000))
+    assert file_handler.save_passwords(file_path, passwords) == f'25000 passwords saved in {file_path}'
+    lines = (tmp_path / 'passwords.txt').read_text(encoding='utf-8').split('\n')
+    assert lines[0] == 'first'
+    assert lines[1:] == [f'password{i}' for i in range(25000)]
+    with pytest.raises(ValueError):
+        file_handler.save_passwords('', ['password'])
+
+def test_password_file_writer(file_handler, tmp_path):
+    file_path = tmp_path / 'passwords.txt'
+    with file_handler.open_writer(str(tmp_path / 'passwords'), flush_every=2) as writer:
+        writer.write('first')
+        assert file_path.read_text(encoding='utf-8') == ''
+        writer.write('second')
+        # Flushed after every 2 records
+        assert file_path.read_text(encoding='utf-8') == 'first\nsecond'
+        assert writer.write_many(['third', 'fourth']) == 2
+        with pytest.raises(ValueError):
+            writer.write('')
+    assert writer.records == 4
+
+    with PasswordFileWriter(str(file_path), flush_interval=0, fsync=True) as writer:
+        writer.write('fifth')
+        assert file_path.read_text(encoding='utf-8') == 'first\nsecond\nthird\nfourth\nfifth'
+
+def test_write_many_empty_password(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'FILE_WRITE_CHUNK_SIZE', 2)
+    file_path = tmp_path / 'passwords.txt'
+    with PasswordFileWriter(str(file_path)) as writer:
+        with pytest.raises(ValueError):
+            writer.write_many(['a', 'b', 'c', '', 'd'])
+    # Everything before the empty password is saved, whatever the chunk size
+    assert file_path.read_text(encoding='utf-8') == 'a\nb\nc'
+    assert writer.records == 3
+
+def test_read_chunks(file_handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'AUDIT_READ_BLOCK_SIZE', 7)
+    file_path = tmp_path / 'passwords.txt'
+    file_path.write_bytes('first\nsecond\r\n\nthird\nfourth\nünïcode'.encode('utf-8'))
+    chunks = list(file_handler.read_chunks(str(file_path), chunk_size=2))
+    assert [lines for lines, _ in chunks] == [['first', 'second'], ['', 'third'], ['fourth', 'ünïcode']]
+    assert chunks[-1][1] == file_path.stat().st_size
+    # Reading continues at the end offset of any chunk
+    assert list(file_handler.read_chunks(str(file_path), chunk_size=3, offset=chunks[0][1])) == [(['', 'third', 'fourth'], chunks[1][1] + 7), (['ünïcode'], chunks[2][1])]
+    assert list(file_handler.read_chunks(str(file_path), offset=chunks[-1][1])) == []
+    # One block holding several chunks gives the same chunks
+    monkeypatch.setattr(Config, 'AUDIT_READ_BLOCK_SIZE', 1024)
+    assert list(file_handler.read_chunks(str(file_path), chunk_size=2)) == chunks
+    with pytest.raises(IOError):
+        list(file_handler.read_chunks(str(tmp_path / 'missing.txt')))
@@ -0,0 +1,51 @@
+import math
+import string
+import pytest
+from src.config import Config
+from src.generation_policy import GenerationPolicy, get_policy
+
+def test_charset():
+    policy = get_policy(include_digits=True, include_upper=True, include_lower=True, include_special_chars=True)
+    assert policy.charset == string.digits + string.ascii_uppercase + string.ascii_lowercase + string.punctuation
+    assert policy.class_mask == GenerationPolicy.DIGITS | GenerationPolicy.UPPER | GenerationPolicy.LOWER | GenerationPolicy.SPECIAL
+    assert policy.bits_per_character == math.log2(94)
+
+    policy = get_policy(include_digits=True, include_lower=False)
+    assert policy.charset == string.digits
+    assert policy.class_mask == GenerationPolicy.DIGITS
+    with pytest.raises(ValueError):
+        get_policy(include_lower=False)
+
+def test_policy_is_cached():
+    assert get_policy(True, False, True, False) is get_policy(True, False, True, False)
+    assert get_policy(True, False, True, False) is not get_policy(False, False, True, False)
+
+def test_rejection_table():
+    policy = get_policy(include_digits=True, include_lower=False)
+    assert policy.byte_limit == 250
+    assert policy.rejected_bytes == bytes(range(250, 256))
+    assert bytes(range(250)).translate(policy.byte_to_char, policy.rejected_bytes) == string.digits.encode() * 25
+
+def test_validation():
+    policy = get_policy()
+    assert policy.is_valid_length(Config.MIN_PASSWORD_LENGTH)
+    assert policy.is_valid_length(Config.MAX_PASSWORD_LENGTH)
+    assert not policy.is_valid_length(Config.MIN_PASSWORD_LENGTH - 1)
+    assert not policy.is_valid_length(Config.MAX_PASSWORD_LENGTH + 1)
+
+    policy = get_policy(include_digits=True, include_upper=True)
+    assert policy.has_required_types(b'aB1c')
+    assert not policy.has_required_types(b'aBcd')
+
+def test_immutable():
+    # Cached policies are shared, no caller can change them for the others
+    policy = get_policy(include_digits=True)
+    with pytest.raises(AttributeError):
+        policy.MAX_PASSWORD_LENGTH = 1000
+    with pytest.raises(AttributeError):
+        policy.charset = 'a'
+    with pytest.raises(AttributeError):
+        policy.extra = True
+    with pytest.raises(AttributeError):
+        del policy.flags
+    assert get_policy(include_digits=True).MAX_PASSWORD_LENGTH == Config.MAX_PASSWORD_LENGTH
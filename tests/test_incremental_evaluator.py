@@ -0,0 +1,97 @@
+import random
+import pytest
+from src.incremental_evaluator import IncrementalEvaluator
+from src.scoring_engine import ScoringEngine
+
+@pytest.fixture
+def incremental_evaluator():
+    return IncrementalEvaluator()
+
+def test_typing(incremental_evaluator):
+    scoring_engine = ScoringEngine()
+    for char in 'abcd12**CCCCaabb':
+        incremental_evaluator.append(char)
+        assert incremental_evaluator.evaluate() == scoring_engine.evaluate(incremental_evaluator.password)
+    assert incremental_evaluator.score() == 4
+    incremental_evaluator.delete(12)
+    assert incremental_evaluator.password == 'abcd'
+    assert incremental_evaluator.score() == 1
+    with pytest.raises(IndexError):
+        incremental_evaluator.delete(5)
+    incremental_evaluator.delete(4)
+    with pytest.raises(ValueError):
+        incremental_evaluator.score()
+
+def test_replace(incremental_evaluator):
+    incremental_evaluator.append('abxdef')
+    assert incremental_evaluator.evaluate() == (1, 4, 1, 2)
+    # Replacing the middle character joins both runs
+    incremental_evaluator.replace(2, 'c')
+    assert incremental_evaluator.evaluate() == (1, 4, 1, 1)
+    incremental_evaluator.replace(-1, 'ř')
+    assert incremental_evaluator.password == 'abcdeř'
+    assert incremental_evaluator.evaluate() == ScoringEngine().evaluate('abcdeř')
+
+def test_long_runs(incremental_evaluator):
+    # Consecutive code points form one run of any length, splitting and joining it keeps the bounds
+    scoring_engine = ScoringEngine()
+    password = ''.join(map(chr, range(0x4E00, 0x4E00 + 5000)))
+    incremental_evaluator.append(password)
+    assert incremental_evaluator._longest == 5000
+    incremental_evaluator.replace(2500, 'a')
+    assert incremental_evaluator._longest == 2500
+    assert incremental_evaluator.evaluate() == scoring_engine.evaluate(incremental_evaluator.password)
+    incremental_evaluator.replace(1000, 'b')
+    assert incremental_evaluator._longest == 2499
+    incremental_evaluator.replace(2500, password[2500])
+    assert incremental_evaluator._longest == 3999
+    incremental_evaluator.replace(1000, password[1000])
+    assert incremental_evaluator._longest == 5000
+    incremental_evaluator.delete(5000)
+    assert incremental_evaluator._longest == 0 and not incremental_evaluator._run_lengths
+
+def test_update(incremental_evaluator):
+    scoring_engine = ScoringEngine()
+    for password in ('qwer', 'qwerty12', 'qwerty', 'qWerty', 'qWXrty', 'q1Xrty', 'aaa', 'aaaaaa', 'xaaaaaa', 'xaabcaa', 'xaa', 'xyzaa', 'a'):
+        incremental_evaluator.update(password)
+        assert incremental_evaluator.password == password
+        assert incremental_evaluator.evaluate() == scoring_engine.evaluate(password)
+
+def test_random_edits(incremental_evaluator):
+    # Every state after random edits is scored like the whole password
+    scoring_engine = ScoringEngine()
+    rng = random.Random(7)
+    alphabet = 'abcdefxyzqwertyASDF0123!*č'
+    for _ in range(6000):
+        edit = rng.random()
+        if edit < 0.3 or not len(incremental_evaluator):
+            incremental_evaluator.append(rng.choice(alphabet))
+        elif edit < 0.4:
+            incremental_evaluator.delete()
+        elif edit < 0.6:
+            incremental_evaluator.insert(rng.randint(0, len(incremental_evaluator)), ''.join(rng.choices(alphabet, k=rng.randint(1, 3))))
+        elif edit < 0.8:
+            index = rng.randrange(len(incremental_evaluator))
+            incremental_evaluator.delete_at(index, rng.randint(0, min(3, len(incremental_evaluator) - index)))
+        else:
+            incremental_evaluator.replace(rng.randrange(len(incremental_evaluator)), rng.choice(alphabet))
+        if len(incremental_evaluator):
+            assert incremental_evaluator.evaluate() == scoring_engine.evaluate(incremental_evaluator.password)
+
+def test_insert_delete_at(incremental_evaluator):
+    incremental_evaluator.append('abxyz')
+    # Inserting in the middle of a run splits it, deleting the inserted characters joins it again
+    incremental_evaluator.insert(3, 'q1')
+    assert incremental_evaluator.password == 'abxq1yz'
+    assert incremental_evaluator._longest == 2
+    incremental_evaluator.insert(0, 'z')
+    incremental_evaluator.delete_at(4, 2)
+    assert incremental_evaluator.password == 'zabxyz'
+    assert incremental_evaluator._longest == 3
+    assert incremental_evaluator.evaluate() == ScoringEngine().evaluate('zabxyz')
+    with pytest.raises(IndexError):
+        incremental_evaluator.insert(7, 'a')
+    with pytest.raises(IndexError):
+        incremental_evaluator.delete_at(5, 2)
+    incremental_evaluator.delete_at(0, 6)
+    assert incremental_evaluator.password == '' and not incremental_evaluator._run_lengths
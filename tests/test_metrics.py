@@ -0,0 +1,72 @@
+import json
+import logging
+import pytest
+from src.metrics import JsonLogSink, MemorySink, Metrics, PrometheusSink, metrics
+from src.password_evaluator import PasswordEvaluator
+from src.password_generator import PasswordGenerator
+
+@pytest.fixture
+def enabled_metrics():
+    sink = metrics.enable(MemorySink())
+    yield sink
+    metrics.disable()
+
+def test_disabled_metrics_record_nothing():
+    sink = MemorySink()
+    disabled = Metrics(sink)
+    disabled.increment('calls')
+    disabled.observe('value', 1.5)
+    with disabled.timer('work'):
+        pass
+    assert disabled.timer('work') is disabled.timer('other')
+    assert sink.counters == {}
+    assert sink.summaries == {}
+
+def test_memory_sink():
+    sink = MemorySink()
+    enabled = Metrics(sink, enabled=True)
+    enabled.increment('calls', kind='a')
+    enabled.increment('calls', 2, kind='a')
+    enabled.observe('value', 3)
+    enabled.observe('value', 1)
+    with enabled.timer('work'):
+        pass
+    assert sink.get_counter('calls', kind='a') == 3
+    assert sink.get_counter('calls', kind='b') == 0
+    assert sink.get_summary('value') == {'count': 2, 'sum': 4, 'min': 1, 'max': 3}
+    assert sink.get_summary('work_seconds')['count'] == 1
+
+def test_prometheus_sink(tmp_path):
+    sink = PrometheusSink(prefix='app')
+    enabled = Metrics(sink, enabled=True)
+    enabled.increment('breach_cache', result='hit')
+    enabled.increment('breach_cache', result='miss')
+    enabled.observe('zxcvbn_seconds', 0.5)
+    text = sink.render()
+    assert text.count('# TYPE app_breach_cache_total counter') == 1
+    assert 'app_breach_cache_total{result="hit"} 1' in text
+    assert 'app_zxcvbn_seconds_count 1' in text
+    assert 'app_zxcvbn_seconds_sum 0.5' in text
+    path = tmp_path / 'metrics.prom'
+    sink.write(str(path))
+    assert path.read_text() == text
+
+def test_json_log_sink(caplog):
+    enabled = Metrics(JsonLogSink(logging.getLogger('test_metrics')), enabled=True)
+    with caplog.at_level(logging.INFO, logger='test_metrics'):
+        enabled.increment('passwords_written', 10)
+    assert json.loads(caplog.records[0].getMessage()) == {'type': 'counter', 'name': 'passwords_written', 'value': 10, 'labels': {}}
+
+def test_instrumented_hot_paths(enabled_metrics, capsys):
+    PasswordGenerator().generate_batch(5, 8)
+    password_evaluator = PasswordEvaluator()
+    password_evaluator.internal_password_evaluation('abcd12**CCCC', verbose=True)
+    password_evaluator.internal_password_evaluation_batch(['abcd', 'a1C*', 'a1C*zzz'])
+    assert enabled_metrics.get_counter('passwords_generated') == 5
+    assert enabled_metrics.get_summary('generation_seconds', method='batch')['count'] == 1
+    assert enabled_metrics.get_summary('internal_evaluation_seconds')['count'] == 1
+    assert enabled_metrics.get_summary('internal_evaluation_criterion_score', criterion='length')['sum'] == 18
+    assert enabled_metrics.get_summary('internal_evaluation_batch_seconds')['count'] == 1
+    assert enabled_metrics.get_counter('passwords_evaluated', method='internal_batch') == 3
+    # Criteria scores are no longer printed
+    assert capsys.readouterr().out == ''
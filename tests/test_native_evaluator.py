@@ -0,0 +1,58 @@
+import pytest
+from src.config import Config
+from src.dictionary_automaton import DictionaryAutomaton
+from src.native_evaluator import NativeEvaluator, guesses_to_score
+
+@pytest.fixture
+def native_evaluator(tmp_path):
+    # Small stand-in for the zxcvbn frequency lists
+    path = tmp_path / 'dictionaries.ac'
+    path.write_bytes(DictionaryAutomaton.compile({
+        'passwords': ['123456', 'password', '12345678', 'qwerty', '1234', 'aaaa', 'abc123', 'aaa123'],
+        'english_wikipedia': ['the', 'of', 'and', 'a', 'abc'],
+    }))
+    return NativeEvaluator(str(path))
+
+def test_score(native_evaluator):
+    assert native_evaluator.score('AAAA') == 0
+    assert native_evaluator.score('aaaa') == 0
+    assert native_evaluator.score('AAAA1234') == 1
+    assert native_evaluator.score('AaAa_1234') == 2
+    assert native_evaluator.score('abcAaA123###') == 3
+    assert native_evaluator.score('abcAaA123###-----asdsdas') == 4
+    assert native_evaluator.score('') == 0
+
+def test_zxcvbn_dictionaries(tmp_path, monkeypatch):
+    # Stand-in for the installed zxcvbn frequency lists
+    monkeypatch.setattr(Config, 'NATIVE_EVALUATION_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr('src.dictionary_automaton.native_dictionary_available', lambda: True)
+    monkeypatch.setattr('src.dictionary_automaton._import_frequency_lists', lambda: {'passwords': ['123456', 'password'], 'english_wikipedia': ['the']})
+    assert NativeEvaluator().score('password') == 0
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.ac']
+    # Built once, later evaluators map the cached automaton
+    monkeypatch.setattr('src.dictionary_automaton._import_frequency_lists', None)
+    assert NativeEvaluator().score('123456') == 0
+
+def test_no_dictionaries(monkeypatch):
+    # Common passwords are not scored as random characters without dictionaries
+    monkeypatch.setattr('src.dictionary_automaton.native_dictionary_available', lambda: False)
+    with pytest.raises(ValueError):
+        NativeEvaluator()
+
+def test_dictionary_variants(native_evaluator):
+    for password, token in (('Password', 'Password'), ('drowssap', 'drowssap'), ('P@ssw0rd', 'P@ssw0rd')):
+        result = native_evaluator.evaluate(password)
+        assert [(match['pattern'], match['token']) for match in result['sequence']] == [('dictionary', token)]
+        assert result['score'] == 0
+    # Rank 2, upper case first letter 2, two l33t substitutions 2 * 2, plus 1 for the sequence
+    assert native_evaluator.evaluate('P@ssw0rd')['guesses'] == 17
+
+def test_patterns(native_evaluator):
+    patterns = lambda password: [match['pattern'] for match in native_evaluator.evaluate(password)['sequence']]
+    assert patterns('qwertyuiop') == ['spatial']
+    assert patterns('13.05.1999') == ['date']
+    assert patterns('zyxwvu') == ['sequence']
+    assert patterns('xyzxyzxyz') == ['repeat']
+
+def test_guesses_to_score():
+    assert [guesses_to_score(guesses) for guesses in (1, 1004, 1005, 1e6 + 4, 1e8 + 5, 1e10 + 4, 1e10 + 5)] == [0, 0, 1, 1, 3, 3, 4]
@@ -0,0 +1,69 @@
+import string
+import pytest
+from src.config import Config
+from src.dictionary_automaton import DictionaryAutomaton
+from src.parallel_engine import ParallelEngine
+
+@pytest.fixture
+def parallel_engine():
+    return ParallelEngine(workers=2, chunk_size=100)
+
+def test_generate(parallel_engine):
+    chunks = list(parallel_engine.generate(250, length=6, include_digits=True, include_upper=True))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    for password in [password for chunk in chunks for password in chunk]:
+        assert len(password) == 6
+        assert any([c.isdigit() for c in password])
+        assert any([c.isupper() for c in password])
+        assert any([c.islower() for c in password])
+        assert all([c not in string.punctuation for c in password])
+    assert list(parallel_engine.generate(0)) == []
+
+def test_invalid_parameters(parallel_engine):
+    with pytest.raises(ValueError):
+        parallel_engine.generate(10, length=3)
+    with pytest.raises(ValueError):
+        parallel_engine.generate(10, evaluation='unknown')
+    with pytest.raises(ValueError):
+        parallel_engine.evaluate(['abcd'], evaluation='unknown')
+    with pytest.raises(ValueError):
+        ParallelEngine(workers=-1)
+    with pytest.raises(ValueError):
+        ParallelEngine(workers=0)
+    with pytest.raises(ValueError):
+        ParallelEngine(chunk_size=0)
+
+def test_evaluate(parallel_engine):
+    passwords = ['abcd', 'a1C*', 'a1C*zzz', 'abcd12**CCCCaabb'] * 60
+    chunks = list(parallel_engine.evaluate(iter(passwords)))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 40]
+    assert [result for chunk in chunks for result in chunk] == list(zip(passwords, [1, 2, 3, 4] * 60))
+
+def test_evaluate_native(parallel_engine, tmp_path, monkeypatch):
+    # Workers are forked with the stand-in dictionary configured
+    path = tmp_path / 'dictionaries.ac'
+    path.write_bytes(DictionaryAutomaton.compile({'passwords': ['123456', 'password', '1234']}))
+    monkeypatch.setattr(Config, 'NATIVE_EVALUATION_DICTIONARY_PATH', str(path))
+    chunks = list(parallel_engine.evaluate(['AAAA', 'AAAA1234', 'AaAa_1234'], evaluation='native'))
+    assert chunks == [[('AAAA', 0), ('AAAA1234', 1), ('AaAa_1234', 2)]]
+    monkeypatch.setattr(Config, 'NATIVE_EVALUATION_DICTIONARY_PATH', None)
+    monkeypatch.setattr('src.dictionary_automaton.native_dictionary_available', lambda: False)
+    with pytest.raises(ValueError):
+        parallel_engine.evaluate(['password'], evaluation='native')
+
+def test_generate_unique(parallel_engine):
+    chunks = list(parallel_engine.generate(1000, length=4, include_digits=True, include_lower=False, unique=True))
+    passwords = [password for chunk in chunks for password in chunk]
+    assert len(passwords) == len(set(passwords)) == 1000
+    with pytest.raises(ValueError):
+        parallel_engine.generate(10001, length=4, include_digits=True, include_lower=False, unique=True)
+
+def test_generate_seeded():
+    # Every chunk has its own substream, so the number of workers does not matter
+    first = list(ParallelEngine(workers=1, chunk_size=100, seed=5).generate(250, length=8))
+    assert list(ParallelEngine(workers=2, chunk_size=100, seed=5).generate(250, length=8)) == first
+    assert list(ParallelEngine(workers=2, chunk_size=100, seed=6).generate(250, length=8)) != first
+
+def test_evaluate_chunks(parallel_engine):
+    chunks = list(parallel_engine.evaluate_chunks([['abcd'], [], ['a1C*', 'a1C*zzz']]))
+    assert chunks == [[('abcd', 1)], [], [('a1C*', 2), ('a1C*zzz', 3)]]
@@ -0,0 +1,63 @@
+import math
+import re
+import pytest
+from src.config import Config
+from src.passphrase_generator import PassphraseGenerator, random_below
+from src.random_source import SeededRandomSource
+
+@pytest.fixture
+def passphrase_generator(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(f'{first}{second}' for first in 'abcdefgh' for second in 'abcdefgh'), encoding='ascii')
+    return PassphraseGenerator(str(path))
+
+def test_random_below():
+    values = random_below(3, 3000)
+    assert len(values) == 3000
+    assert set(values) == {0, 1, 2}
+    assert random_below(5, 0) == []
+    # Samples are little-endian on every platform, so seeded runs are portable
+    data = SeededRandomSource(3).token_bytes(20)
+    samples = [int.from_bytes(data[i:i + 4], 'little') for i in range(0, 20, 4)]
+    assert random_below(1000, 4, SeededRandomSource(3)) == [sample % 1000 for sample in samples[:4]]
+
+def test_generate_passphrase(passphrase_generator):
+    passphrase = passphrase_generator.generate_passphrase(5, '.')
+    assert re.fullmatch(r'[a-h]{2}(\.[a-h]{2}){4}', passphrase)
+    passphrase = passphrase_generator.generate_passphrase(4, ' ', 'first', 3)
+    assert re.fullmatch(r'([A-H][a-h]|\d{3})( ([A-H][a-h]|\d{3})){4}', passphrase)
+    assert len(re.findall(r'\d{3}', passphrase)) == 1
+
+def test_generate_batch(passphrase_generator):
+    passphrases = passphrase_generator.generate_batch(1000, 3, '', 'random')
+    assert len(passphrases) == 1000
+    assert all(len(passphrase) == 6 for passphrase in passphrases)
+    assert any(passphrase != passphrase.lower() for passphrase in passphrases)
+    assert passphrase_generator.generate_batch(0) == []
+    with pytest.raises(ValueError):
+        passphrase_generator.generate_batch(1, Config.MAX_PASSPHRASE_WORDS + 1)
+    with pytest.raises(ValueError):
+        passphrase_generator.generate_batch(1, 4, capitalization='all')
+
+def test_entropy(passphrase_generator):
+    # 64 words give 6 bits per word
+    assert passphrase_generator.entropy(4) == 24
+    assert passphrase_generator.entropy(4, 'first') == 24
+    assert passphrase_generator.entropy(4, 'random') == 28
+    assert passphrase_generator.entropy(4, 'none', 2) == pytest.approx(24 + 2 * math.log2(10) + math.log2(5))
+    # Zero words are invalid, not the default
+    with pytest.raises(ValueError):
+        passphrase_generator.entropy(0)
+    with pytest.raises(ValueError):
+        passphrase_generator.generate_batch(1, 0)
+
+def test_no_wordlist(monkeypatch):
+    monkeypatch.setattr(Config, 'PASSPHRASE_WORDLIST_PATH', None)
+    with pytest.raises(ValueError):
+        PassphraseGenerator()
+
+def test_seeded_generation(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(f'{first}{second}' for first in 'abcdefgh' for second in 'abcdefgh'), encoding='ascii')
+    first = PassphraseGenerator(str(path), SeededRandomSource(1)).generate_batch(50, 4, '-', 'random', 2)
+    assert PassphraseGenerator(str(path), SeededRandomSource(1)).generate_batch(50, 4, '-', 'random', 2) == first
@@ -1,11 +1,57 @@
+import hashlib
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from src.password_evaluator import PasswordEvaluator
+from src.breach_cache import BreachRangeCache
+from src.breach_index import BreachIndex
+from src.bloom_filter import BloomFilter
 from src.config import Config
+from src.dictionary_automaton import DictionaryAutomaton
+from src.metrics import MemorySink, metrics
 
 @pytest.fixture
 def password_evaluator():
     return PasswordEvaluator()
 
+@pytest.fixture
+def breach_api():
+    # Local stand-in for the Have I been pwned? range API
+    breached = [hashlib.sha1(password.encode()).hexdigest().upper() for password in ('admin', 'password', '123456')]
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            prefix = self.path.rsplit('/', 1)[-1]
+            server.requests.append((prefix, self.headers.get('If-None-Match')))
+            if server.failures:
+                server.failures -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+            etag = f'"{prefix}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = '\r\n'.join(f'{hash[5:]}:1' for hash in breached if hash.startswith(prefix)).encode()
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests = []
+    server.failures = 0
+    server.url = f'http://127.0.0.1:{server.server_port}/range/'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
 def test_external_evaluation(password_evaluator):
     assert password_evaluator.external_password_evaluation('AAAA') == 0
     assert password_evaluator.external_password_evaluation('aaaa') == 0
@@ -13,9 +59,48 @@ def test_external_evaluation(password_evaluator):
     assert password_evaluator.external_password_evaluation('AaAa_1234') == 2
     assert password_evaluator.external_password_evaluation('abcAaA123###') == 3
     assert password_evaluator.external_password_evaluation('abcAaA123###-----asdsdas') == 4
+    # Characters past 64 make the whole password a weaker pattern
+    assert password_evaluator.external_password_evaluation('a' * 57 + 'password') == 1
     with pytest.raises(ValueError):
         password_evaluator.external_password_evaluation('')
         
+def test_external_evaluation_cache(password_evaluator, monkeypatch):
+    evaluated = []
+    def zxcvbn(password):
+        evaluated.append(password)
+        return {'score': 3, 'guesses': 1e9}
+    monkeypatch.setattr('src.password_evaluator._import_zxcvbn', lambda: zxcvbn)
+    monkeypatch.setattr(Config, 'EXTERNAL_EVALUATION_MAX_LENGTH', 10)
+    assert password_evaluator.external_password_evaluation('abcAaA123###') == 3
+    assert password_evaluator.external_password_evaluation('abcAaA123###') == 3
+    assert password_evaluator.external_password_result('short') == (3, False)
+    # Long passwords are evaluated by both ends
+    assert evaluated == ['abcAaA123#', 'cAaA123###', 'short']
+
+def test_external_evaluation_truncated(password_evaluator, monkeypatch):
+    # Stand-in for zxcvbn which finds the dictionary word wherever it is
+    monkeypatch.setattr('src.password_evaluator._import_zxcvbn', lambda: lambda password: {'score': 1 if 'password' in password else 2})
+    password = 'a' * 57 + 'password'
+    assert password_evaluator.external_password_result(password) == (1, False)
+    # A capped evaluation keeps the weaker end, characters past the cut can lower the score
+    monkeypatch.setattr(Config, 'EXTERNAL_EVALUATION_MAX_LENGTH', 64)
+    password_evaluator.external_cache.clear()
+    assert password_evaluator.external_password_result(password) == (1, True)
+        
+def test_native_evaluation(password_evaluator, tmp_path, monkeypatch):
+    # Small stand-in for the zxcvbn frequency lists
+    path = tmp_path / 'dictionaries.ac'
+    path.write_bytes(DictionaryAutomaton.compile({'passwords': ['123456', 'password', '1234']}))
+    monkeypatch.setattr(Config, 'NATIVE_EVALUATION_DICTIONARY_PATH', str(path))
+    assert password_evaluator.native_password_evaluation('AAAA') == 0
+    assert password_evaluator.native_password_evaluation('AAAA1234') == 1
+    assert password_evaluator.native_password_evaluation('AaAa_1234') == 2
+    assert password_evaluator.native_password_evaluation('password') == 0
+    # Characters past the cap can lower the score, the weaker end counts
+    assert password_evaluator.native_password_evaluation('a' * 57 + 'password') == password_evaluator._native_evaluator.score('a' * 57 + 'password') == 1
+    with pytest.raises(ValueError):
+        password_evaluator.native_password_evaluation('')
+
 def test_internal_evaluation(password_evaluator):
     assert password_evaluator.internal_password_evaluation('abcd') == 1
     assert password_evaluator.internal_password_evaluation('a1C*') == 2
@@ -26,12 +111,90 @@ def test_internal_evaluation(password_evaluator):
     assert password_evaluator.internal_password_evaluation('ABCDEFGH') == 1
     assert password_evaluator.internal_password_evaluation('abcd') == 1
     
+def test_internal_evaluation_batch(password_evaluator):
+    passwords = ['abcd', 'a1C*', 'a1C*zzz', 'abcd12**CCCC', 'abcd12**CCCCaabb', 'abcdefghijk', 'ABCDEFGH']
+    expected = [password_evaluator.internal_password_evaluation(password, verbose=False) for password in passwords]
+    assert list(password_evaluator.internal_password_evaluation_batch(passwords)) == expected
+    assert list(password_evaluator.internal_password_evaluation_batch(passwords, workers=2)) == expected
+    with pytest.raises(ValueError):
+        password_evaluator.internal_password_evaluation_batch(['abcd', ''])
+    
 def test_is_breached(password_evaluator):
     assert password_evaluator.is_breached('admin') == True
     assert password_evaluator.is_breached('784defwefs221fdc5asd4as6d48496532666') == False
     with pytest.raises(ValueError):
         password_evaluator.is_breached('')
     
+def test_is_breached_offline(tmp_path):
+    dump_path = tmp_path / 'pwned.txt'
+    dump_path.write_text(hashlib.sha1(b'admin').hexdigest().upper() + ':1\n', encoding='ascii')
+    BreachIndex.build(str(dump_path), str(tmp_path / 'pwned.idx'))
+    password_evaluator = PasswordEvaluator(breach_index_path=str(tmp_path / 'pwned.idx'))
+    assert password_evaluator.is_breached('admin') == True
+    assert password_evaluator.is_breached('784defwefs221fdc5asd4as6d48496532666') == False
+    with pytest.raises(ValueError):
+        password_evaluator.is_breached('')
+    
+def test_is_breached_cached(breach_api):
+    password_evaluator = PasswordEvaluator(breach_cache=BreachRangeCache(ttl=60))
+    password_evaluator.PASSWORD_BREACH_CHECK_API = breach_api.url
+    assert password_evaluator.is_breached('admin') == True
+    assert password_evaluator.is_breached('admin') == True
+    assert breach_api.requests == [('D033E', None)]
+    # Expired range is revalidated by ETag
+    password_evaluator.breach_cache.ttl = -1
+    assert password_evaluator.is_breached('admin') == True
+    assert breach_api.requests == [('D033E', None), ('D033E', '"D033E"')]
+
+def test_is_breached_many(breach_api):
+    password_evaluator = PasswordEvaluator(breach_cache=BreachRangeCache())
+    password_evaluator.PASSWORD_BREACH_CHECK_API = breach_api.url
+    passwords = ['admin', 'password', '784defwefs221fdc5asd4as6d48496532666', 'admin']
+    assert password_evaluator.is_breached_many(passwords, concurrency=4) == [True, True, False, True]
+    # Every prefix is downloaded once
+    assert sorted(prefix for prefix, _ in breach_api.requests) == sorted(set(hashlib.sha1(password.encode()).hexdigest().upper()[0:5] for password in passwords))
+    assert password_evaluator.is_breached_many([]) == []
+    with pytest.raises(ValueError):
+        password_evaluator.is_breached_many(['admin', ''])
+
+def test_is_breached_retries(breach_api, monkeypatch):
+    monkeypatch.setattr(Config, 'BREACH_CHECK_BACKOFF', 0)
+    password_evaluator = PasswordEvaluator(breach_cache=BreachRangeCache())
+    password_evaluator.PASSWORD_BREACH_CHECK_API = breach_api.url
+    breach_api.failures = Config.BREACH_CHECK_RETRIES
+    assert password_evaluator.is_breached('admin') == True
+    breach_api.failures = Config.BREACH_CHECK_RETRIES + 1
+    with pytest.raises(ConnectionError):
+        password_evaluator.is_breached('password')
+    
+def test_is_breached_metrics(breach_api, monkeypatch):
+    monkeypatch.setattr(Config, 'BREACH_CHECK_BACKOFF', 0)
+    sink = metrics.enable(MemorySink())
+    try:
+        password_evaluator = PasswordEvaluator(breach_cache=BreachRangeCache())
+        password_evaluator.PASSWORD_BREACH_CHECK_API = breach_api.url
+        breach_api.failures = 1
+        password_evaluator.is_breached('admin')
+        password_evaluator.is_breached('admin')
+    finally:
+        metrics.disable()
+    assert sink.get_counter('breach_checks', source='api') == 2
+    assert sink.get_counter('breach_cache', result='miss') == 1
+    assert sink.get_counter('breach_cache', result='hit') == 1
+    assert sink.get_counter('breach_request_failures', reason='503') == 1
+    assert sink.get_summary('breach_request_seconds')['count'] == 2
+
+def test_is_breached_bloom_filter(breach_api, tmp_path):
+    dump_path = tmp_path / 'pwned.txt'
+    dump_path.write_text(hashlib.sha1(b'admin').hexdigest().upper() + ':1\n', encoding='ascii')
+    BloomFilter.build(str(dump_path), str(tmp_path / 'pwned.bloom'))
+    password_evaluator = PasswordEvaluator(breach_cache=BreachRangeCache(), bloom_filter_path=str(tmp_path / 'pwned.bloom'))
+    password_evaluator.PASSWORD_BREACH_CHECK_API = breach_api.url
+    assert password_evaluator.is_breached('784defwefs221fdc5asd4as6d48496532666') == False
+    assert password_evaluator.is_breached_many(['784defwefs221fdc5asd4as6d48496532666', 'admin']) == [False, True]
+    # Only the password passing the filter was looked up
+    assert breach_api.requests == [('D033E', None)]
+    
 def test_evaluate_sequence(password_evaluator):
     assert password_evaluator.evaluate_sequence('abcdefgh') == 1
     assert password_evaluator.evaluate_sequence('abaaabcdef') == 2
@@ -49,6 +212,8 @@ def test_evaluate_sequence(password_evaluator):
     assert password_evaluator.evaluate_sequence('FEDCBAAABA') == 2
     assert password_evaluator.evaluate_sequence('FFFFFDCBA') == 3
     assert password_evaluator.evaluate_sequence('TRRRTTTCBA') == 4
+    assert password_evaluator.evaluate_sequence('qwertyui') == 1
+    assert password_evaluator.evaluate_sequence('zxcvbnm123') == 2
     
 def test_evaluate_variety(password_evaluator):
     assert password_evaluator.evaluate_variety('aaaa') == 1
@@ -88,3 +253,8 @@ def test_evaluate_repetition(password_evaluator):
     assert password_evaluator.evaluate_repetition('aaaaabbbb') == 3
     assert password_evaluator.evaluate_repetition('aaaabbbbb') == 3
     assert password_evaluator.evaluate_repetition('aaabbbccc') == 4
+
+def test_lazy_imports():
+    # Heavy dependencies are loaded on first use, not when the application starts
+    check = 'import sys, src.password_evaluator; print("zxcvbn" in sys.modules, "requests" in sys.modules)'
+    assert subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, check=True).stdout.split() == ['False', 'False']
@@ -1,7 +1,9 @@
 import string
 import pytest
 from src.config import Config
+from src.generation_policy import get_policy
 from src.password_generator import PasswordGenerator
+from src.random_source import SeededRandomSource
 
 @pytest.fixture
 def password_generator():
@@ -49,4 +51,65 @@ def test_validate_parameters(password_generator):
     assert password_generator.validate_parameters(10, False, False, False, False) == False
     assert password_generator.validate_parameters(4, True, False, False, False) == True
     assert password_generator.validate_parameters(50, True, False, False, False) == True
-    assert password_generator.validate_parameters(3, True, True, True, True) == False
\ No newline at end of file
+    assert password_generator.validate_parameters(3, True, True, True, True) == False
+def test_generate_batch(password_generator):
+    passwords = password_generator.generate_batch(200, length=4, include_digits=True, include_lower=True, include_special_chars=True, include_upper=True)
+    assert len(passwords) == 200
+    for password in passwords:
+        assert len(password) == 4
+        assert any([c.isdigit() for c in password])
+        assert any([c.islower() for c in password])
+        assert any([c.isupper() for c in password])
+        assert any([c in string.punctuation for c in password])
+
+    passwords = password_generator.generate_batch(50, length=Config.MAX_PASSWORD_LENGTH, include_digits=True, include_lower=False)
+    assert all([len(password) == Config.MAX_PASSWORD_LENGTH and password.isdigit() for password in passwords])
+    assert password_generator.generate_batch(0) == []
+
+    with pytest.raises(ValueError):
+        password_generator.generate_batch(-1)
+    with pytest.raises(ValueError):
+        password_generator.generate_batch(10, length=Config.MAX_PASSWORD_LENGTH + 1)
+    with pytest.raises(ValueError):
+        password_generator.generate_batch(10, include_lower=False)
+
+def test_iter_passwords(password_generator):
+    policy = get_policy(include_digits=True, include_upper=True)
+    passwords = list(password_generator.iter_passwords(policy, count=Config.STREAM_BLOCK_SIZE + 5, length=6))
+    assert len(passwords) == Config.STREAM_BLOCK_SIZE + 5
+    assert all([len(password) == 6 for password in passwords])
+
+    endless = password_generator.iter_passwords(policy)
+    assert len([next(endless) for _ in range(Config.STREAM_BLOCK_SIZE * 2)]) == Config.STREAM_BLOCK_SIZE * 2
+    assert list(password_generator.iter_passwords(policy, count=0)) == []
+
+    with pytest.raises(ValueError):
+        password_generator.iter_passwords(policy, count=-1)
+    with pytest.raises(ValueError):
+        password_generator.iter_passwords(policy, length=Config.MAX_PASSWORD_LENGTH + 1)
+
+def test_generate_for_entropy(password_generator):
+    password = password_generator.generate_for_entropy(80, ('lower', 'digits'))
+    # 36 characters give 5.17 bits each, 16 characters are the first to reach 80 bits with both classes required
+    assert len(password) == 16
+    assert any(char.isdigit() for char in password) and any(char.islower() for char in password)
+    with pytest.raises(ValueError):
+        password_generator.generate_for_entropy(1000, ('lower',))
+
+def test_unique(password_generator):
+    policy = get_policy(True, False, False, False)
+    # Every 4 digit password exactly once
+    passwords = password_generator.generate_from_policy(policy, 10000, 4, unique=True)
+    assert len(set(passwords)) == 10000
+    assert len(set(password_generator.generate_batch(3000, 8, unique=True))) == 3000
+    streamed = list(password_generator.iter_passwords(policy, 2500, 4, unique=True))
+    assert len(set(streamed)) == 2500
+    with pytest.raises(ValueError):
+        password_generator.generate_from_policy(policy, 10001, 4, unique=True)
+    with pytest.raises(ValueError):
+        password_generator.iter_passwords(policy, None, 4, unique=True)
+
+def test_seeded_generation():
+    first = PasswordGenerator(SeededRandomSource(1)).generate_batch(100, 12, True, True, True, True)
+    assert PasswordGenerator(SeededRandomSource(1)).generate_batch(100, 12, True, True, True, True) == first
+    assert PasswordGenerator(SeededRandomSource(2)).generate_batch(100, 12, True, True, True, True) != first
@@ -0,0 +1,29 @@
+import pytest
+from src.config import Config
+from src.random_source import SeededRandomSource, SystemRandomSource, get_random_source, system_random_source
+
+def test_system_random_source():
+    random_source = SystemRandomSource(buffer_size=64)
+    assert [len(random_source.token_bytes(n)) for n in (0, 1, 63, 64, 200)] == [0, 1, 63, 64, 200]
+    assert random_source.token_bytes(32) != random_source.token_bytes(32)
+
+def test_seeded_random_source():
+    expected = SeededRandomSource(42, buffer_size=64).token_bytes(1000)
+    # Stream does not depend on the request sizes
+    random_source = SeededRandomSource(42, buffer_size=64)
+    assert b''.join(random_source.token_bytes(n) for n in (1, 0, 63, 100, 500, 336)) == expected
+    assert SeededRandomSource('42', buffer_size=64).token_bytes(1000) == expected
+    assert SeededRandomSource(43, buffer_size=64).token_bytes(1000) != expected
+
+def test_substream():
+    random_source = SeededRandomSource(42)
+    first = random_source.substream(0).token_bytes(100)
+    assert random_source.substream(0).token_bytes(100) == first
+    assert random_source.substream(1).token_bytes(100) != first
+    assert first != random_source.token_bytes(100)
+
+def test_get_random_source(monkeypatch):
+    assert get_random_source() is system_random_source
+    assert get_random_source(7).token_bytes(16) == SeededRandomSource(7).token_bytes(16)
+    monkeypatch.setattr(Config, 'RANDOM_SEED', 7)
+    assert get_random_source().token_bytes(16) == SeededRandomSource(7).token_bytes(16)
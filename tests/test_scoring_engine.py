@@ -0,0 +1,54 @@
+import random
+import string
+import pytest
+from src.config import Config
+from src.scoring_engine import ScoringEngine
+
+@pytest.fixture
+def scoring_engine():
+    return ScoringEngine()
+
+def test_score(scoring_engine):
+    # Same vectors as the internal evaluation of PasswordEvaluator
+    assert scoring_engine.score('abcd') == 1
+    assert scoring_engine.score('a1C*') == 2
+    assert scoring_engine.score('a1C*zzz') == 3
+    assert scoring_engine.score('abcd12**CCCC') == 3
+    assert scoring_engine.score('abcd12**CCCCaabb') == 4
+    assert scoring_engine.score('abcdefghijk') == 2
+    assert scoring_engine.score('ABCDEFGH') == 1
+    with pytest.raises(ValueError):
+        scoring_engine.score('')
+
+def test_evaluate(scoring_engine):
+    # length, repetition, variety, sequence
+    assert scoring_engine.evaluate('abcdefgh') == (2, 4, 1, 1)
+    assert scoring_engine.evaluate('fedcbaaaba') == (3, 4, 1, 2)
+    assert scoring_engine.evaluate('abctttrrrt') == (3, 4, 1, 4)
+    assert scoring_engine.evaluate('aaaabbbbb') == (2, 3, 1, 4)
+    assert scoring_engine.evaluate('aA*1') == (1, 4, 4, 4)
+    assert scoring_engine.evaluate('č€') == (1, 3, 0, 4)
+    # Keyboard rows are sequences too
+    assert scoring_engine.evaluate('qwertyui') == (2, 4, 1, 1)
+    assert scoring_engine.criteria_scores('aA*1') == {'length': 6, 'repetition': 4, 'variety': 8, 'sequence': 4}
+
+def test_total_score():
+    assert [ScoringEngine.total_score(weighted_sum) for weighted_sum in (10, 19, 20, 25, 26, 34, 35, 36, 40)] == [1, 1, 2, 2, 3, 3, 3, 4, 4]
+
+def test_score_many(scoring_engine):
+    passwords = ['abcd', 'a1C*', 'a1C*zzz', 'abcd12**CCCCaabb']
+    scores = scoring_engine.score_many(passwords)
+    assert scores.typecode == 'B'
+    assert list(scores) == [scoring_engine.score(password) for password in passwords] == [1, 2, 3, 4]
+    assert list(scoring_engine.score_many([])) == []
+    with pytest.raises(ValueError):
+        scoring_engine.score_many(['abcd', ''])
+
+def test_score_many_batches(scoring_engine, monkeypatch):
+    monkeypatch.setattr(Config, 'SCORE_BATCH_SIZE', 7)
+    rng = random.Random(0)
+    charset = string.ascii_letters + string.digits + string.punctuation + 'čé€'
+    passwords = [''.join(rng.choice(charset) for _ in range(rng.randint(1, 30))) for _ in range(500)]
+    passwords += [''.join(rng.choice('aab1') for _ in range(rng.randint(1, 40))) for _ in range(500)]
+    passwords += ['abcdefgh', 'qwertyui', 'hgfedcba', 'a', 'ab', 'aaaaaaaaaaaaaaab', 'aaabbbcccddd']
+    assert list(scoring_engine.score_many(iter(passwords))) == [scoring_engine.score(password) for password in passwords]
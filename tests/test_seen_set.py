@@ -0,0 +1,31 @@
+import pytest
+from src.generation_policy import get_policy
+from src.seen_set import BitmapSeenSet, FingerprintSeenSet, new_seen_set, seen_set_size
+
+def test_bitmap_seen_set():
+    seen = BitmapSeenSet(get_policy(True, False, False, False), 4)
+    # One bit for each of the 10 ** 4 digit passwords
+    assert seen.memory == 1250
+    assert seen.add('0000') and seen.add('9999') and seen.add('1234')
+    assert not seen.add('1234')
+    assert not seen.add('0000')
+    assert seen.add('4321')
+
+def test_fingerprint_seen_set():
+    seen = FingerprintSeenSet(1000)
+    assert seen.memory == seen.capacity * 8 and seen.capacity >= 2000
+    passwords = [f'password{index}' for index in range(1000)]
+    assert all(map(seen.add, passwords))
+    assert not any(map(seen.add, passwords))
+
+def test_seen_set_size():
+    digits = get_policy(True, False, False, False)
+    assert seen_set_size(digits, 4, 10000) == ('bitmap', 1250)
+    assert seen_set_size(get_policy(True, True, True, True), 16, 100) == ('fingerprint', 2048)
+    assert isinstance(new_seen_set(digits, 4, 5000), BitmapSeenSet)
+    assert isinstance(new_seen_set(digits, 4, 10), FingerprintSeenSet)
+    with pytest.raises(ValueError):
+        seen_set_size(digits, 4, 10001)
+    # Passwords with both digits and upper case letters are fewer than all strings over the charset
+    with pytest.raises(ValueError):
+        seen_set_size(get_policy(True, True, False, False), 4, 36 ** 4)
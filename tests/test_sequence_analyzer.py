@@ -0,0 +1,57 @@
+import pytest
+from src.sequence_analyzer import SequenceAnalyzer, SequenceRun
+
+@pytest.fixture
+def sequence_analyzer():
+    return SequenceAnalyzer(steps=(1,), keyboard_rows=('1234567890', 'qwertyuiop', 'asdfghjkl', 'zxcvbnm'), min_length=3)
+
+def test_longest(sequence_analyzer):
+    assert sequence_analyzer.longest('') == 0
+    assert sequence_analyzer.longest('a') == 0
+    assert sequence_analyzer.longest('ab') == 2
+    assert sequence_analyzer.longest('abaaabcdef') == 6
+    assert sequence_analyzer.longest('fedcbaaaba') == 6
+    assert sequence_analyzer.longest('qwerty') == 6
+    assert sequence_analyzer.longest('QwErTy') == 6
+    assert sequence_analyzer.longest('lkjhg') == 5
+    # Last key of a row is not next to the first key of the following row
+    assert sequence_analyzer.longest('opas') == 2
+    assert sequence_analyzer.longest('xĉĊ') == 2
+
+def test_analyze(sequence_analyzer):
+    analysis = sequence_analyzer.analyze('qwerty1234cba')
+    assert analysis.longest == 6
+    assert analysis.count == 3
+    assert analysis.runs == [
+        SequenceRun(0, 6, (('keyboard', 1),)),
+        SequenceRun(6, 4, (('codepoint', 1), ('keyboard', 1))),
+        SequenceRun(10, 3, (('codepoint', -1),)),
+    ]
+    # Digits follow both the code points and the keyboard row, the span is counted once
+    assert sequence_analyzer.analyze('1234') == (4, 1, [SequenceRun(0, 4, (('codepoint', 1), ('keyboard', 1)))])
+    assert sequence_analyzer.analyze('12345xyz').count == 2
+    assert sequence_analyzer.analyze('č4321').runs == [SequenceRun(1, 4, (('codepoint', -1), ('keyboard', -1)))]
+    # Runs shorter than min_length only count for the longest run
+    assert sequence_analyzer.analyze('abxyq') == (2, 0, [])
+
+def test_steps():
+    sequence_analyzer = SequenceAnalyzer(steps=(1, 2), keyboard_rows=())
+    assert sequence_analyzer.analyze('acegi') == (5, 1, [SequenceRun(0, 5, (('codepoint', 2),))])
+    assert sequence_analyzer.analyze('qwe') == (0, 0, [])
+    with pytest.raises(ValueError):
+        SequenceAnalyzer(steps=(0,))
+
+def test_non_ascii_matches_ascii(sequence_analyzer):
+    # Non-ASCII passwords take the generic path, the runs must be the same
+    for password in ('qwerty1234cbač', 'abcdefghč', 'č987zxcv'):
+        analysis = sequence_analyzer.analyze(password)
+        runs = []
+        assert sequence_analyzer._scan_positions(password, runs) == analysis.longest
+        assert sequence_analyzer._merge_runs(runs) == analysis.runs
+
+def test_longest_many(sequence_analyzer):
+    # Runs do not continue across neighbouring passwords
+    passwords = ['ab', 'cd', '', 'x', 'yz', 'qwe', 'čĎď', 'abcdef', 'fedcba', 'a1']
+    assert sequence_analyzer.longest_many(passwords) == [sequence_analyzer.longest(password) for password in passwords] == [2, 2, 0, 0, 2, 3, 3, 6, 6, 0]
+    assert sequence_analyzer.longest_many([]) == []
+    assert sequence_analyzer.longest_many(['a']) == [0]
@@ -0,0 +1,36 @@
+import pytest
+from src.wordlist import Wordlist
+
+@pytest.fixture
+def text_wordlist(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('11111\tabacus\n11112\tžluťoučký\n\n11113\tzebra\n11114\tabacus\n', encoding='utf-8')
+    return str(path)
+
+def test_text_wordlist(text_wordlist):
+    with Wordlist(text_wordlist) as wordlist:
+        # Diceware numbers are skipped, duplicates dropped
+        assert len(wordlist) == 3
+        assert [wordlist[index] for index in range(3)] == ['abacus', 'žluťoučký', 'zebra']
+        assert wordlist.words([2, 0, 2]) == ['zebra', 'abacus', 'zebra']
+        with pytest.raises(IndexError):
+            wordlist[3]
+
+def test_build(text_wordlist, tmp_path):
+    path = str(tmp_path / 'words.idx')
+    assert Wordlist.build(text_wordlist, path) == 3
+    with Wordlist(path) as wordlist:
+        assert wordlist.words([0, 1, 2]) == ['abacus', 'žluťoučký', 'zebra']
+
+def test_compiled_layout():
+    # Offsets are little-endian like the header, compiled files are portable across platforms
+    assert Wordlist.compile([b'ab', b'c', b'ab']) == Wordlist.MAGIC + bytes([2, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 3, 0, 0, 0]) + b'abc'
+
+def test_invalid_wordlist(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('word\nword\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        Wordlist(str(path))
+    path.write_bytes(Wordlist.MAGIC + b'\x05')
+    with pytest.raises(ValueError):
+        Wordlist(str(path))